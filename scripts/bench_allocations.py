@@ -0,0 +1,101 @@
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, Tuple
+import cv2
+import numpy as np
+
+from hand_tracker import RGBConverter
+
+
+def write_clip(path: str, frames: int, width: int, height: int):
+    rng = np.random.default_rng(0)
+    background = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 30, (width, height))
+    for i in range(frames):
+        writer.write(np.roll(background, i * 4, axis=1))
+    writer.release()
+
+
+def legacy_ingest() -> Callable:
+    def step(cap):
+        ret, frame = cap.read()
+        if not ret:
+            return False
+        frame = cv2.flip(frame, 1)
+        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        rgb.flags.writeable = False
+        return True
+    return step
+
+
+def copy_free_ingest(display: bool) -> Callable:
+    converter = RGBConverter()
+    state: Dict[str, np.ndarray] = {}
+
+    def step(cap):
+        ret, frame = cap.read(state.get("frame"))
+        if not ret:
+            return False
+        state["frame"] = frame
+        rgb = converter.convert(frame)
+        rgb.flags.writeable = False
+        if display:
+            buffer = state.get("display")
+            if buffer is None or buffer.shape != frame.shape:
+                buffer = state["display"] = np.empty_like(frame)
+            cv2.flip(frame, 1, dst=buffer)
+        return True
+    return step
+
+
+def measure(path: str, step: Callable, frames: int, traced: bool) -> Tuple[np.ndarray, np.ndarray]:
+    cap = cv2.VideoCapture(path)
+    step(cap)
+    timings = []
+    peaks = []
+    for _ in range(frames - 1):
+        if traced:
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        if not step(cap):
+            break
+        timings.append(time.perf_counter() - start)
+        if traced:
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+    cap.release()
+    return np.array(timings), np.array(peaks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-frame allocations of the flip-first and "
+                                                 "copy-free frame ingest paths.")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    args = parser.parse_args()
+
+    cv2.setNumThreads(1)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "clip.avi")
+        write_clip(path, args.frames, args.width, args.height)
+        frame_bytes = args.width * args.height * 3
+        print(f"{args.width}x{args.height} frames ({frame_bytes / 1024:.0f} KiB each), {args.frames} frames")
+        print(f"{'path':<22}{'peak KiB':>11}{'copies':>8}{'mean ms':>9}{'p95 ms':>8}")
+        for name, factory in (("flip first", legacy_ingest),
+                              ("copy-free (preview)", lambda: copy_free_ingest(True)),
+                              ("copy-free (headless)", lambda: copy_free_ingest(False))):
+            tracemalloc.start()
+            _, peaks = measure(path, factory(), args.frames, traced=True)
+            tracemalloc.stop()
+            timings, _ = measure(path, factory(), args.frames, traced=False)
+            print(f"{name:<22}{peaks.mean() / 1024:>11.1f}{peaks.mean() / frame_bytes:>8.2f}"
+                  f"{timings.mean() * 1000:>9.2f}{np.percentile(timings, 95) * 1000:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import argparse
+import time
+from collections import Counter, deque
+from typing import Callable, List, Optional, Tuple
+
+from gesture_recognition import GestureRecognizer
+from gesture_rules import TIME_EPSILON
+from hand_features import DEFAULT_FRAME_SIZE, extract_features
+from landmarks import HandLandmarks
+from synthetic_hands import random_hands
+from utils import calculate_distance
+
+
+# Recognizer as it was before HandFeatures: tuple landmarks, finger states recomputed per detector.
+# Thresholds, the volume anchor and the time-windowed swipe follow gestures.json, so both recognizers
+# emit the same gestures and the timings compare the same work.
+class LegacyGestureRecognizer:
+    def __init__(self, swipe_distance: float = 0.17, swipe_window: float = 0.3, swipe_min_duration: float = 0.12,
+                 pinch_threshold: float = 0.083, volume_distance: float = 0.05,
+                 frame_height: float = DEFAULT_FRAME_SIZE[1]):
+        self.swipe_threshold = swipe_distance * frame_height
+        self.swipe_window = swipe_window
+        self.swipe_min_duration = swipe_min_duration
+        self.pinch_threshold = pinch_threshold * frame_height
+        self.volume_y_threshold = volume_distance * frame_height
+        self.palm_center_history: deque = deque()
+        self.was_pinching = False
+        self.last_wrist_y: Optional[float] = None
+
+    def _get_finger_states(self, landmarks: List[Tuple[float, float, float]], handedness: str) -> List[int]:
+        if handedness == "Right":
+            states = [1 if landmarks[4][0] < landmarks[2][0] else 0]
+        else:
+            states = [1 if landmarks[4][0] > landmarks[2][0] else 0]
+        for tip, pip, mcp in ((8, 6, 5), (12, 10, 9), (16, 14, 13), (20, 18, 17)):
+            states.append(1 if landmarks[tip][1] < landmarks[pip][1] < landmarks[mcp][1] else 0)
+        return states
+
+    def recognize(self, landmarks: Optional[List[Tuple[float, float, float]]], handedness: str,
+                  timestamp: float = 0.0) -> str:
+        if landmarks is None:
+            self.palm_center_history.clear()
+            self.was_pinching = False
+            self.last_wrist_y = None
+            return "none"
+        fingers = self._get_finger_states(landmarks, handedness)
+        if fingers == [1, 1, 1, 0, 0]:
+            current_y = landmarks[0][1]
+            if self.last_wrist_y is None:
+                self.last_wrist_y = current_y
+            else:
+                delta_y = current_y - self.last_wrist_y
+                if delta_y < -self.volume_y_threshold:
+                    self.last_wrist_y -= self.volume_y_threshold
+                    return "volume_up"
+                elif delta_y > self.volume_y_threshold:
+                    self.last_wrist_y += self.volume_y_threshold
+                    return "volume_down"
+        else:
+            self.last_wrist_y = None
+        distance = calculate_distance(landmarks[4][:2], landmarks[8][:2])
+        is_pinching = distance < self.pinch_threshold
+        if is_pinching and not self.was_pinching:
+            self.was_pinching = True
+            return "pinch"
+        elif not is_pinching:
+            self.was_pinching = False
+        if sum(self._get_finger_states(landmarks, handedness)) == 0:
+            return "fist"
+        if sum(self._get_finger_states(landmarks, handedness)) == 5:
+            return "open_palm"
+        palm = [0, 5, 9, 13, 17]
+        history = self.palm_center_history
+        history.append((timestamp, sum(landmarks[i][0] for i in palm) / 5))
+        while timestamp - history[0][0] > self.swipe_window + TIME_EPSILON:
+            history.popleft()
+        if timestamp - history[0][0] >= self.swipe_min_duration - TIME_EPSILON:
+            delta_x = history[-1][1] - history[0][1]
+            if abs(delta_x) > self.swipe_threshold:
+                history.clear()
+                return "swipe_right" if delta_x > 0 else "swipe_left"
+        return "none"
+
+
+def bench(label: str, fn, frames, repeat: int,
+          reset: Optional[Callable[[], object]] = None) -> Tuple[float, List[str]]:
+    gestures = [fn(frame) for frame in frames]
+    start = time.perf_counter()
+    for _ in range(repeat):
+        if reset is not None:
+            reset()
+        for frame in frames:
+            fn(frame)
+    elapsed = time.perf_counter() - start
+    per_frame_us = elapsed / (repeat * len(frames)) * 1e6
+    print(f"{label:<28} {per_frame_us:8.2f} us/frame")
+    return per_frame_us, gestures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmark GestureRecognizer cost per frame.")
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    hands: List[HandLandmarks] = random_hands(args.frames)
+    tuple_frames = [([tuple(map(float, p)) for p in hand.landmarks], hand.handedness, hand.timestamp)
+                    for hand in hands]
+
+    legacy = LegacyGestureRecognizer()
+    current = GestureRecognizer()
+    before, legacy_gestures = bench("before (tuple lists)", lambda f: legacy.recognize(*f),
+                                    tuple_frames, args.repeat, lambda: legacy.recognize(None, "Right"))
+    bench("  feature extraction only", extract_features, hands, args.repeat)
+    after, gestures = bench("after (array + features)", current.recognize, hands, args.repeat,
+                            lambda: current.recognize(None))
+    mismatches = Counter((a, b) for a, b in zip(legacy_gestures, gestures) if a != b)
+    if not mismatches:
+        print(f"after / before: {after / before:.2f}x the cost per frame, same gestures on all {len(hands)} frames")
+        return
+    print(f"gestures differ on {sum(mismatches.values())}/{len(hands)} frames, so the timings are not comparable:")
+    for (a, b), count in mismatches.most_common():
+        print(f"  {a:>12} -> {b:<12} {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import argparse
+import time
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+from gesture_recognition import GestureRecognizer
+from landmarks import HandLandmarks
+from recognizer_bank import MIN_BATCH, RecognizerBank
+from synthetic_hands import GESTURE_DEMO, generate_session
+
+FRAME_SIZE = (1280, 480)
+SECOND_HAND_OFFSET = 640.0
+
+
+def simulate(hands: int, ticks: int, fps: float, seed: int = 0
+             ) -> Tuple[List[List[Tuple[int, int, Optional[HandLandmarks]]]], int]:
+    rng = np.random.default_rng(seed)
+    session = {
+        handedness: list(generate_session(GESTURE_DEMO, fps=fps, noise=1.5, handedness=handedness))
+        for handedness in ("Right", "Left")
+    }
+    streams = (hands + 1) // 2
+    phases = rng.integers(0, len(session["Right"]), hands)
+    frames = []
+    for tick in range(ticks):
+        timestamp = tick / fps
+        frame = []
+        for hand in range(hands):
+            handedness = "Right" if hand % 2 == 0 else "Left"
+            _, hand_data = session[handedness][(phases[hand] + tick) % len(session[handedness])]
+            if hand_data is not None:
+                landmarks = hand_data.landmarks
+                if handedness == "Left":
+                    landmarks = landmarks + np.array([SECOND_HAND_OFFSET, 0.0, 0.0], dtype=np.float32)
+                hand_data = HandLandmarks(landmarks, handedness, hand_data.confidence, timestamp)
+            frame.append((hand // 2, hand, hand_data))
+        frames.append(frame)
+    return frames, streams
+
+
+def run_separate(frames, hands: int) -> Tuple[float, List[List[str]]]:
+    recognizers = [GestureRecognizer(frame_size=FRAME_SIZE) for _ in range(hands)]
+    outputs = []
+    start = time.perf_counter()
+    for frame in frames:
+        outputs.append([recognizers[hand].recognize(hand_data) for _, hand, hand_data in frame])
+    return time.perf_counter() - start, outputs
+
+
+def run_bank(frames, streams: int, fps: float, min_batch: int = MIN_BATCH
+             ) -> Tuple[float, List[List[str]], Dict[str, int]]:
+    bank = RecognizerBank(frame_size=FRAME_SIZE, min_batch=min_batch)
+    stream_ids = range(streams)
+    outputs = []
+    owners: Dict[int, int] = {}
+    identity = {"ids": 0, "swaps": 0}
+    start = time.perf_counter()
+    for tick, frame in enumerate(frames):
+        present: Dict[int, List[HandLandmarks]] = {stream: [] for stream in stream_ids}
+        hands: Dict[int, List[int]] = {stream: [] for stream in stream_ids}
+        for stream, hand, hand_data in frame:
+            if hand_data is not None:
+                present[stream].append(hand_data)
+                hands[stream].append(hand)
+        gestures = [GestureRecognizer.NONE] * len(frame)
+        for stream, results in bank.recognize_frames(present, tick / fps).items():
+            for hand, (hand_id, gesture) in zip(hands[stream], results):
+                gestures[hand] = gesture
+                owner = owners.setdefault(hand_id, hand)
+                identity["swaps"] += owner != hand
+        outputs.append(gestures)
+    elapsed = time.perf_counter() - start
+    identity["ids"] = bank.next_id
+    return elapsed, outputs, identity
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare one GestureRecognizer per hand against the "
+                                                 "vectorized RecognizerBank as the number of hands grows.")
+    parser.add_argument("--hands", type=int, nargs="+", default=[1, 2, 8, 32, 128, 512])
+    parser.add_argument("--ticks", type=int, default=600)
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--min-batch", type=int, default=MIN_BATCH,
+                        help="Hands per tick from which the bank uses its vectorized pass (0 = always)")
+    args = parser.parse_args()
+
+    print(f"{args.ticks} ticks at {args.fps:g} fps, two hands per stream")
+    print(f"{'hands':>6}{'separate us/tick':>18}{'bank us/tick':>14}{'bank us/hand':>14}{'speedup':>9}"
+          f"{'mismatches':>12}{'ids':>6}{'swaps':>7}")
+    for hands in args.hands:
+        frames, streams = simulate(hands, args.ticks, args.fps)
+        separate, expected = run_separate(frames, hands)
+        bank, recognized, identity = run_bank(frames, streams, args.fps, args.min_batch)
+        mismatches = sum(a != b for tick_a, tick_b in zip(expected, recognized) for a, b in zip(tick_a, tick_b))
+        events = sum(g != GestureRecognizer.NONE for tick in expected for g in tick)
+        print(f"{hands:>6}{separate / args.ticks * 1e6:>18.1f}{bank / args.ticks * 1e6:>14.1f}"
+              f"{bank / args.ticks / hands * 1e6:>14.2f}{separate / bank:>8.1f}x"
+              f"{f'{mismatches}/{events}':>12}{identity['ids']:>6}{identity['swaps']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+import argparse
+import time
+from typing import Dict, Tuple
+import numpy as np
+
+from recording import LandmarkRecording
+from smoothing import SMOOTHERS, create_smoother
+from synthetic_hands import Segment, generate_session
+
+MAX_SHIFT = 12
+
+DEMO_SEGMENTS = [
+    Segment(0.5, "open_palm", (200, 320), (200, 320)),
+    Segment(0.3, "open_palm", (200, 320), (440, 320)),
+    Segment(0.6, "open_palm", (440, 320), (440, 320)),
+    Segment(0.5, "volume", (440, 320), (440, 220)),
+    Segment(0.4, "volume", (440, 220), (440, 220)),
+    Segment(0.5, "volume", (440, 220), (400, 340)),
+    Segment(0.3, "open_palm", (400, 340), (180, 300)),
+    Segment(0.6, "open_palm", (180, 300), (180, 300)),
+]
+
+
+def synthetic_trace(fps: float, noise: float, repeats: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    frames = list(generate_session(DEMO_SEGMENTS * repeats, fps=fps))
+    timestamps = np.array([t for t, _ in frames])
+    truth = np.stack([hand.landmarks[:, :2] for _, hand in frames]).astype(np.float32)
+    rng = np.random.default_rng(0)
+    raw = truth + rng.normal(0.0, noise, truth.shape).astype(np.float32)
+    return timestamps, raw, truth
+
+
+def load_trace(path: str, fps: float) -> Tuple[np.ndarray, np.ndarray]:
+    if path.endswith(".npy"):
+        points = np.load(path)[..., :2].astype(np.float32)
+        return np.arange(len(points)) / fps, points
+    recording = LandmarkRecording(path)
+    present = recording.present
+    return recording.timestamps[present], recording.landmarks[present][..., :2].astype(np.float32)
+
+
+def run_filter(name: str, timestamps: np.ndarray, raw: np.ndarray) -> Tuple[np.ndarray, float]:
+    smoother = create_smoother(name)
+    output = np.empty_like(raw)
+    start = time.perf_counter()
+    for i in range(len(raw)):
+        output[i] = smoother.update(raw[i], timestamps[i])
+    per_frame_us = (time.perf_counter() - start) / len(raw) * 1e6
+    return output, per_frame_us
+
+
+def estimate_lag(output: np.ndarray, reference: np.ndarray) -> float:
+    shifts = range(-MAX_SHIFT, MAX_SHIFT + 1)
+    n = len(reference)
+    errors = np.array([
+        np.mean((output[max(shift, 0):n + min(shift, 0)] - reference[max(-shift, 0):n - max(shift, 0)]) ** 2)
+        for shift in shifts
+    ])
+    best = int(np.argmin(errors))
+    if 0 < best < len(errors) - 1:
+        left, mid, right = errors[best - 1:best + 2]
+        curvature = left - 2 * mid + right
+        if curvature > 0:
+            return shifts[best] + 0.5 * (left - right) / curvature
+    return float(shifts[best])
+
+
+def stationary_mask(reference: np.ndarray, max_speed: float = 0.5) -> np.ndarray:
+    speed = np.abs(np.diff(reference, axis=0)).max(axis=(1, 2))
+    still = speed < max_speed
+    return still[1:] & still[:-1]
+
+
+def centered_average(points: np.ndarray, window: int = 9) -> np.ndarray:
+    kernel = np.ones(window) / window
+    padded = np.pad(points, ((window // 2, window // 2), (0, 0), (0, 0)), mode="edge")
+    return np.apply_along_axis(lambda series: np.convolve(series, kernel, mode="valid"), 0, padded)
+
+
+def jitter(output: np.ndarray, still: np.ndarray) -> float:
+    acceleration = np.diff(output, n=2, axis=0)[still]
+    return float(np.sqrt(np.mean(acceleration ** 2))) if len(acceleration) else float("nan")
+
+
+def evaluate(timestamps: np.ndarray, raw: np.ndarray, truth: np.ndarray = None) -> Dict[str, Dict[str, float]]:
+    reference = truth if truth is not None else raw
+    still = stationary_mask(truth if truth is not None else centered_average(raw))
+    results = {}
+    for name in SMOOTHERS:
+        output, cost = run_filter(name, timestamps, raw)
+        row = {
+            "lag_frames": estimate_lag(output, reference),
+            "jitter_px": jitter(output, still),
+            "us_per_frame": cost,
+        }
+        if truth is not None:
+            row["rmse_px"] = float(np.sqrt(np.mean((output - truth) ** 2)))
+        results[name] = row
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare landmark smoothers by lag and jitter.")
+    parser.add_argument("--trace", help="Landmark recording (record with --smoothing none) or .npy of shape "
+                                        "(frames, 21, 2+); synthetic if omitted")
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--noise", type=float, default=1.5, help="Synthetic landmark noise in pixels")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.trace:
+        timestamps, raw = load_trace(args.trace, args.fps)
+        truth = None
+        print(f"{args.trace}: {len(raw)} frames, lag measured against the raw trace, "
+              f"jitter on frames where a centred average is still")
+    else:
+        timestamps, raw, truth = synthetic_trace(args.fps, args.noise, args.repeats)
+        print(f"synthetic trace: {len(raw)} frames @ {args.fps:g} fps, noise {args.noise:g} px")
+
+    results = evaluate(timestamps, raw, truth)
+    header = f"{'filter':<16}{'lag (frames)':>14}{'jitter (px)':>13}{'us/frame':>10}"
+    if truth is not None:
+        header += f"{'rmse (px)':>11}"
+    print(header)
+    for name, row in results.items():
+        line = f"{name:<16}{row['lag_frames']:>14.2f}{row['jitter_px']:>13.3f}{row['us_per_frame']:>10.1f}"
+        if "rmse_px" in row:
+            line += f"{row['rmse_px']:>11.2f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import argparse
+import time
+from typing import List, Tuple
+import numpy as np
+
+from trajectory import TrajectoryMatcher, builtin_templates
+
+
+def random_curve(rng: np.random.Generator, points: int = 24, harmonics: int = 3) -> np.ndarray:
+    t = np.linspace(0.0, 1.0, points)
+    curve = np.zeros((points, 2))
+    for k in range(1, harmonics + 1):
+        amplitude = rng.normal(0.0, 1.0 / k, (2, 2))
+        curve += np.outer(np.sin(np.pi * k * t), amplitude[0]) + np.outer(np.cos(np.pi * k * t), amplitude[1])
+    return curve
+
+
+def template_library(count: int, seed: int = 0) -> List[Tuple[str, np.ndarray]]:
+    rng = np.random.default_rng(seed)
+    templates = builtin_templates()[:count]
+    while len(templates) < count:
+        templates.append((f"shape_{len(templates)}", random_curve(rng)))
+    return templates
+
+
+def make_queries(templates: List[Tuple[str, np.ndarray]], count: int, noise: float,
+                 seed: int = 1) -> List[Tuple[str, np.ndarray]]:
+    rng = np.random.default_rng(seed)
+    queries = []
+    for _ in range(count):
+        name, points = templates[rng.integers(len(templates))]
+        frames = int(rng.integers(12, 40))
+        t = np.sort(rng.uniform(0.0, 1.0, frames))
+        source = np.linspace(0.0, 1.0, len(points))
+        path = np.stack([np.interp(t, source, points[:, 0]), np.interp(t, source, points[:, 1])], axis=1)
+        angle = rng.normal(0.0, 0.1)
+        rotation = np.array([[np.cos(angle), np.sin(angle)], [-np.sin(angle), np.cos(angle)]])
+        path = path @ rotation * rng.uniform(100, 250) + rng.uniform(100, 400, 2)
+        queries.append((name, path + rng.normal(0.0, noise, path.shape)))
+    return queries
+
+
+def run(matcher: TrajectoryMatcher, queries: List[Tuple[str, np.ndarray]], max_distance: float,
+        pruning: bool) -> Tuple[np.ndarray, List[str]]:
+    timings = []
+    results = []
+    for _, path in queries:
+        start = time.perf_counter()
+        name, _ = matcher.match(path, max_distance, pruning=pruning)
+        timings.append(time.perf_counter() - start)
+        results.append(name)
+    return np.array(timings), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DTW trajectory matching as the template count grows.")
+    parser.add_argument("--templates", type=int, nargs="+", default=[8, 16, 32, 64, 128, 256])
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--noise", type=float, default=3.0, help="Query noise in pixels")
+    parser.add_argument("--max-distance", type=float, default=0.08)
+    args = parser.parse_args()
+
+    print(f"{'templates':>9}{'pruned us':>11}{'p95 us':>9}{'brute us':>10}{'lb pruned':>11}"
+          f"{'abandoned':>11}{'full dtw':>10}{'agree':>8}{'accuracy':>10}")
+    for count in args.templates:
+        templates = template_library(count)
+        queries = make_queries(templates, args.queries, args.noise)
+        pruned_matcher = TrajectoryMatcher(templates)
+        pruned, pruned_names = run(pruned_matcher, queries, args.max_distance, True)
+        brute, brute_names = run(TrajectoryMatcher(templates), queries, args.max_distance, False)
+        stats = pruned_matcher.get_stats()
+        agree = np.mean([a == b for a, b in zip(pruned_names, brute_names)])
+        accuracy = np.mean([name == expected for name, (expected, _) in zip(pruned_names, queries)])
+        print(f"{count:>9}{pruned.mean() * 1e6:>11.0f}{np.percentile(pruned, 95) * 1e6:>9.0f}"
+              f"{brute.mean() * 1e6:>10.0f}{stats['lb_pruned_rate']:>11.1%}{stats['abandoned_rate']:>11.1%}"
+              f"{stats['full_dtw_rate']:>10.1%}{agree:>8.1%}{accuracy:>10.1%}")
+
+
+if __name__ == "__main__":
+    main()
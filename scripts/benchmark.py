@@ -0,0 +1,134 @@
+import argparse
+import contextlib
+import json
+import platform
+import sys
+from typing import Any, Dict, List, Optional
+import cv2
+import numpy as np
+
+from frame_sources import PACINGS, SOURCE_HELP
+from main import GestureMediaPlayer, __version__
+from metrics import Metrics
+from smoothing import SMOOTHERS
+
+METRICS_WINDOW = 1 << 16
+
+
+def run_clip(spec: str, args: argparse.Namespace) -> Dict[str, Any]:
+    gestures: List[Dict[str, Any]] = []
+    metrics = Metrics(window=METRICS_WINDOW)
+
+    def record(gesture: str, timestamp: float, action: Optional[str]):
+        frame = app.source.frames_read - 1
+        gestures.append({"frame": frame, "time": round(frame / app.source.fps, 3), "gesture": gesture,
+                         "action": action})
+
+    app = GestureMediaPlayer(source=spec, pacing=args.pacing, max_frames=args.frames, media_backend="null",
+                             headless=args.headless, offscreen=True, smoothing=args.smoothing,
+                             roi_tracking=args.roi_tracking, inference_interval=args.inference_interval,
+                             gesture_config=args.gestures, metrics=metrics, on_gesture=record)
+    with contextlib.redirect_stdout(sys.stderr):
+        app.run()
+    source = app.source.get_stats()
+    return {
+        "clip": spec,
+        "source": app.source.describe(),
+        "frame_size": list(app.source.frame_size),
+        "frames": source["frames"],
+        "hand_frames": app.hand_tracker.frames_detected if app.hand_tracker is not None else 0,
+        "seconds": round(source["seconds"], 3),
+        "fps": round(source["fps"], 2),
+        "stages": {
+            name: {key: round(value, 3) if isinstance(value, float) else value for key, value in summary.items()}
+            for name, summary in metrics.snapshot().items()
+        },
+        "gestures": gestures,
+        "dispatcher": app.dispatcher.get_stats() if app.dispatcher is not None else None,
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], max_slowdown: float) -> List[str]:
+    if baseline.get("options") != results["options"]:
+        return [f"options differ from the baseline ({baseline.get('options')})"]
+    previous = {clip["clip"]: clip for clip in baseline["clips"]}
+    problems = []
+    for clip in results["clips"]:
+        old = previous.get(clip["clip"])
+        if old is None:
+            continue
+        if not clip["hand_frames"]:
+            problems.append(f"{clip['clip']}: no hand detected, so its gesture sequence checks nothing")
+        sequence = [(g["frame"], g["gesture"]) for g in clip["gestures"]]
+        if sequence != [(g["frame"], g["gesture"]) for g in old["gestures"]]:
+            problems.append(f"{clip['clip']}: gesture sequence changed "
+                            f"({len(old['gestures'])} gestures in baseline, {len(sequence)} now)")
+        if clip["fps"] < old["fps"] * (1.0 - max_slowdown):
+            problems.append(f"{clip['clip']}: {clip['fps']:.1f} fps, baseline {old['fps']:.1f} fps")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run fixed clips through the full gesture pipeline with a null "
+                                                 "media backend and report throughput, stage timings and "
+                                                 "the recognized gestures as JSON.")
+    parser.add_argument("clips", nargs="*", default=["synthetic"], help=f"Clips to run: {SOURCE_HELP}")
+    parser.add_argument("--pacing", choices=PACINGS, default="fast",
+                        help="Feed frames as fast as the pipeline runs (default) or at the clip frame rate")
+    parser.add_argument("--frames", type=int, help="Stop each clip after this many frames")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="Run each clip this many times and keep the fastest run (default: 1)")
+    parser.add_argument("--headless", action="store_true", help="Skip the flip and overlay drawing stages")
+    parser.add_argument("--smoothing", choices=sorted(SMOOTHERS), default="one_euro")
+    parser.add_argument("--roi-tracking", action="store_true")
+    parser.add_argument("--inference-interval", type=int, default=1, metavar="N")
+    parser.add_argument("--gestures", metavar="PATH", help="Gesture rule and binding config")
+    parser.add_argument("--output", metavar="PATH", help="Write the JSON results to PATH instead of stdout")
+    parser.add_argument("--baseline", metavar="PATH",
+                        help="Earlier results to compare against; exit with status 1 on a regression")
+    parser.add_argument("--max-slowdown", type=float, default=0.1,
+                        help="Allowed fps drop against the baseline, as a fraction (default: 0.1)")
+    args = parser.parse_args()
+
+    results = {
+        "version": __version__,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "opencv": cv2.__version__,
+        "machine": platform.machine(),
+        "options": {"pacing": args.pacing, "frames": args.frames, "repeat": args.repeat, "headless": args.headless,
+                    "smoothing": args.smoothing, "roi_tracking": args.roi_tracking,
+                    "inference_interval": args.inference_interval, "gestures": args.gestures},
+        "clips": [],
+    }
+    for spec in args.clips:
+        runs = [run_clip(spec, args) for _ in range(args.repeat)]
+        clip = max(runs, key=lambda run: run["fps"])
+        clip["fps_runs"] = [run["fps"] for run in runs]
+        clip["deterministic"] = all(run["gestures"] == runs[0]["gestures"] for run in runs)
+        results["clips"].append(clip)
+        print(f"{spec}: {clip['frames']} frames, {clip['fps']:.1f} fps, hand in {clip['hand_frames']} frames, "
+              f"{len(clip['gestures'])} gestures", file=sys.stderr)
+        if not clip["hand_frames"]:
+            print(f"Warning: no hand detected in {spec}", file=sys.stderr)
+    mediapipe = sys.modules.get("mediapipe")
+    results["mediapipe"] = getattr(mediapipe, "__version__", None)
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            problems = compare(results, json.load(f), args.max_slowdown)
+        for problem in problems:
+            print(f"Regression: {problem}", file=sys.stderr)
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional
+
+from media_controls import MediaController
+
+BATCHED_ACTIONS = {"volume_up", "volume_down", "next_track", "previous_track"}
+SELF_CANCELLING_TOGGLES = {"play_pause"}
+TOGGLE_GROUPS = {"mute": "mute", "unmute": "mute"}
+
+
+class DispatchRequest:
+    __slots__ = ("gesture", "action", "count", "submitted_at", "captured_at")
+
+    def __init__(self, gesture: str, action: str, submitted_at: float, captured_at: Optional[float] = None):
+        self.gesture = gesture
+        self.action = action
+        self.count = 1
+        self.submitted_at = submitted_at
+        self.captured_at = captured_at
+
+
+class ActionDispatcher:
+    def __init__(self, controller: MediaController, max_queue: int = 32,
+                 on_dispatch: Optional[Callable[[DispatchRequest, float], None]] = None):
+        self.controller = controller
+        self.max_queue = max_queue
+        self.on_dispatch = on_dispatch
+        self._queue: Deque[DispatchRequest] = deque()
+        self._condition = threading.Condition()
+        self._closed = False
+        self.submitted = 0
+        self.dispatched = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.errors = 0
+        self.latencies: Deque[float] = deque(maxlen=256)
+        self._worker = threading.Thread(target=self._run, name="dispatcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, gesture: str, captured_at: Optional[float] = None) -> bool:
+        action = self.controller.action_for(gesture)
+        if action is None:
+            return False
+        now = time.monotonic()
+        with self._condition:
+            self.submitted += 1
+            tail = self._queue[-1] if self._queue else None
+            if tail is not None and tail.action == action and action in BATCHED_ACTIONS:
+                tail.count += 1
+                self.coalesced += 1
+                return True
+            if action in SELF_CANCELLING_TOGGLES and tail is not None and tail.action == action:
+                self._queue.pop()
+                self.dropped += 2
+                return True
+            group = TOGGLE_GROUPS.get(action)
+            if group is not None:
+                superseded = [r for r in self._queue if TOGGLE_GROUPS.get(r.action) == group]
+                for request in superseded:
+                    self._queue.remove(request)
+                self.dropped += len(superseded)
+            if len(self._queue) >= self.max_queue:
+                self._queue.popleft()
+                self.dropped += 1
+            self._queue.append(DispatchRequest(gesture, action, now, captured_at))
+            self._condition.notify()
+        return True
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._queue or self._closed)
+                if not self._queue:
+                    return
+                request = self._queue.popleft()
+            try:
+                self.controller.execute_gesture(request.gesture, request.count)
+            except Exception as e:
+                self.errors += 1
+                print(f"[Dispatcher] {request.gesture} failed: {e}")
+            done = time.monotonic()
+            self.latencies.append(done - request.submitted_at)
+            self.dispatched += 1
+            if self.on_dispatch is not None:
+                self.on_dispatch(request, done)
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def get_stats(self) -> Dict[str, float]:
+        latencies: List[float] = list(self.latencies)
+        return {
+            "queue_depth": self.queue_depth,
+            "submitted": self.submitted,
+            "dispatched": self.dispatched,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "latency_avg_ms": 1000 * sum(latencies) / len(latencies) if latencies else 0.0,
+            "latency_max_ms": 1000 * max(latencies) if latencies else 0.0,
+        }
+
+    def close(self, timeout: float = 2.0):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._worker.join(timeout)
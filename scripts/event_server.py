@@ -0,0 +1,424 @@
+import argparse
+import asyncio
+import json
+import os
+import socket
+import stat
+import threading
+import time
+from collections import deque
+from typing import AsyncIterator, Deque, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+from landmarks import HandLandmarks
+
+PROTOCOL_VERSION = 1
+TOPICS = ("gesture", "landmarks")
+DEFAULT_TOPICS = ("gesture",)
+DROP_POLICIES = ("oldest", "newest")
+WRITE_BUFFER_LIMIT = 64 * 1024
+
+
+def _remove_stale_socket(path: str):
+    try:
+        mode = os.lstat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"{path} exists and is not a socket")
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        os.remove(path)
+        return
+    finally:
+        probe.close()
+    raise FileExistsError(f"Another server is already listening on {path}")
+
+
+class _Message:
+    __slots__ = ("seq", "topic", "published_at", "payload")
+
+    def __init__(self, seq: int, topic: str, published_at: float, payload: bytes):
+        self.seq = seq
+        self.topic = topic
+        self.published_at = published_at
+        self.payload = payload
+
+
+class ClientState:
+    def __init__(self, client_id: int, peer: str, queue_size: int, drop_policy: str):
+        self.client_id = client_id
+        self.peer = peer
+        self.queue_size = queue_size
+        self.drop_policy = drop_policy
+        self.topics: set = set()
+        self.gestures: Deque[_Message] = deque()
+        self.landmarks: Deque[_Message] = deque()
+        self.ready = asyncio.Event()
+        self.connected_at = time.monotonic()
+        self.sent = 0
+        self.dropped = 0
+        self.max_queued = 0
+        self.lag_max = 0.0
+        self.lags: Deque[float] = deque(maxlen=256)
+
+    @property
+    def queued(self) -> int:
+        return len(self.gestures) + len(self.landmarks)
+
+    def offer(self, message: _Message):
+        if message.topic not in self.topics:
+            return
+        if self.queued >= self.queue_size:
+            self.dropped += 1
+            if not self.landmarks and (message.topic == "landmarks" or self.drop_policy == "newest"):
+                return
+            if message.topic == "landmarks" and self.drop_policy == "newest":
+                return
+            (self.landmarks or self.gestures).popleft()
+        (self.gestures if message.topic == "gesture" else self.landmarks).append(message)
+        self.max_queued = max(self.max_queued, self.queued)
+        self.ready.set()
+
+    def pop(self) -> Optional[_Message]:
+        if self.gestures and (not self.landmarks or self.gestures[0].published_at <= self.landmarks[0].published_at):
+            return self.gestures.popleft()
+        if self.landmarks:
+            return self.landmarks.popleft()
+        self.ready.clear()
+        return None
+
+    def record_sent(self, message: _Message):
+        lag = time.monotonic() - message.published_at
+        self.sent += 1
+        self.lags.append(lag)
+        self.lag_max = max(self.lag_max, lag)
+
+    def get_stats(self) -> Dict[str, float]:
+        lags = np.array(self.lags) if self.lags else np.zeros(1)
+        return {
+            "client": self.client_id,
+            "peer": self.peer,
+            "topics": sorted(self.topics),
+            "connected_s": time.monotonic() - self.connected_at,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "lag_p50_ms": float(np.percentile(lags, 50)) * 1000,
+            "lag_p95_ms": float(np.percentile(lags, 95)) * 1000,
+            "lag_max_ms": self.lag_max * 1000,
+        }
+
+
+class EventServer:
+    def __init__(self, unix_path: Optional[str] = None, host: str = "127.0.0.1", port: Optional[int] = None,
+                 queue_size: int = 256, drop_policy: str = "oldest", landmark_fps: float = 15.0,
+                 verbose: bool = True):
+        if (unix_path is None) == (port is None):
+            raise ValueError("EventServer needs exactly one of unix_path or port")
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"Unknown drop policy '{drop_policy}', expected one of {DROP_POLICIES}")
+        self.unix_path = unix_path
+        self.host = host
+        self.port = port
+        self.queue_size = queue_size
+        self.drop_policy = drop_policy
+        self.landmark_interval = 1.0 / landmark_fps if landmark_fps > 0 else 0.0
+        self.verbose = verbose
+        self.clients: Dict[int, ClientState] = {}
+        self.finished: Deque[Dict[str, float]] = deque(maxlen=16)
+        self.clients_served = 0
+        self.published = 0
+        self._seq = dict.fromkeys(TOPICS, 0)
+        self._subscribers = dict.fromkeys(TOPICS, 0)
+        self._next_landmarks = -float("inf")
+        self._hand_visible = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server = None
+        self._stopped: Optional[asyncio.Event] = None
+        self._ready = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name="event-server", daemon=True)
+
+    @property
+    def address(self) -> str:
+        return self.unix_path if self.unix_path is not None else f"{self.host}:{self.port}"
+
+    def start(self) -> "EventServer":
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            raise self._error
+        if self.verbose:
+            print(f"Streaming gesture events on {self.address}")
+        return self
+
+    def publish_gesture(self, gesture: str, timestamp: float, action: Optional[str] = None,
+                        name: Optional[str] = None):
+        if not self._subscribers["gesture"]:
+            return
+        self._post("gesture", {"timestamp": timestamp, "gesture": gesture, "name": name or gesture,
+                               "action": action})
+
+    def publish_landmarks(self, hand_data: Optional[HandLandmarks], timestamp: float):
+        if not self._subscribers["landmarks"]:
+            return
+        visible = hand_data is not None
+        if visible == self._hand_visible and timestamp < self._next_landmarks:
+            return
+        self._hand_visible = visible
+        self._next_landmarks = timestamp + self.landmark_interval
+        self._post("landmarks", {"timestamp": timestamp, "hand": hand_data})
+
+    def _post(self, topic: str, body: dict):
+        loop = self._loop
+        if loop is None:
+            return
+        try:
+            loop.call_soon_threadsafe(self._broadcast, topic, body, time.monotonic())
+        except RuntimeError:
+            pass
+
+    def _broadcast(self, topic: str, body: dict, published_at: float):
+        self._seq[topic] += 1
+        self.published += 1
+        body["type"] = topic
+        hand_data = body.get("hand")
+        if hand_data is not None:
+            body["hand"] = {
+                "handedness": hand_data.handedness,
+                "confidence": round(hand_data.confidence, 3),
+                "landmarks": np.round(hand_data.landmarks, 1).tolist(),
+            }
+        body["seq"] = self._seq[topic]
+        message = _Message(self._seq[topic], topic, published_at, (json.dumps(body) + "\n").encode())
+        for client in self.clients.values():
+            client.offer(message)
+
+    def _run(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self._serve())
+        except BaseException as e:
+            self._error = e
+            self._ready.set()
+        finally:
+            loop.close()
+
+    async def _serve(self):
+        self._stopped = asyncio.Event()
+        if self.unix_path is not None:
+            _remove_stale_socket(self.unix_path)
+            self._server = await asyncio.start_unix_server(self._handle, path=self.unix_path)
+            socket_inode = os.stat(self.unix_path).st_ino
+        else:
+            self._server = await asyncio.start_server(self._handle, self.host, self.port)
+            if not self.port:
+                self.port = self._server.sockets[0].getsockname()[1]
+        self._loop = asyncio.get_running_loop()
+        self._ready.set()
+        async with self._server:
+            await self._stopped.wait()
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self.unix_path is not None:
+            try:
+                if os.lstat(self.unix_path).st_ino == socket_inode:
+                    os.remove(self.unix_path)
+            except FileNotFoundError:
+                pass
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        peer = writer.get_extra_info("peername") or "unix"
+        self.clients_served += 1
+        client = ClientState(self.clients_served, str(peer), self.queue_size, self.drop_policy)
+        writer.transport.set_write_buffer_limits(high=WRITE_BUFFER_LIMIT)
+        self._subscribe(client, set(DEFAULT_TOPICS))
+        landmark_fps = 1.0 / self.landmark_interval if self.landmark_interval else None
+        hello = {"type": "hello", "version": PROTOCOL_VERSION, "client": client.client_id,
+                 "topics": sorted(client.topics), "landmark_fps": landmark_fps}
+        writer.write((json.dumps(hello) + "\n").encode())
+        self.clients[client.client_id] = client
+        sender = asyncio.ensure_future(self._send(client, writer))
+        try:
+            async for line in reader:
+                try:
+                    request = json.loads(line)
+                    topics = set(request["subscribe"])
+                except (ValueError, KeyError, TypeError):
+                    continue
+                self._subscribe(client, topics & set(TOPICS))
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            sender.cancel()
+            del self.clients[client.client_id]
+            self.finished.append(client.get_stats())
+            self._subscribe(client, set())
+            writer.close()
+            await asyncio.gather(sender, return_exceptions=True)
+
+    def _subscribe(self, client: ClientState, topics: set):
+        for topic in client.topics - topics:
+            self._subscribers[topic] -= 1
+        for topic in topics - client.topics:
+            self._subscribers[topic] += 1
+        client.topics = topics
+
+    async def _send(self, client: ClientState, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                await client.ready.wait()
+                message = client.pop()
+                if message is None:
+                    continue
+                writer.write(message.payload)
+                await writer.drain()
+                client.record_sent(message)
+        except ConnectionError:
+            pass
+
+    def get_stats(self) -> Dict[str, object]:
+        return {
+            "published": self.published,
+            "clients_served": self.clients_served,
+            "clients": [client.get_stats() for client in list(self.clients.values())],
+            "finished": list(self.finished),
+        }
+
+    def report(self) -> str:
+        stats = self.get_stats()
+        lines = [f"Event server: {stats['published']} events published to {stats['clients_served']} clients"]
+        for client in stats["clients"] + stats["finished"]:
+            lines.append(f"  client {client['client']} ({'+'.join(client['topics'])}): {client['sent']} sent, "
+                         f"{client['dropped']} dropped, max queued {client['max_queued']}, "
+                         f"lag p50 {client['lag_p50_ms']:.1f} ms / p95 {client['lag_p95_ms']:.1f} ms / "
+                         f"max {client['lag_max_ms']:.1f} ms")
+        return "\n".join(lines)
+
+    def close(self, timeout: float = 2.0):
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(self._stopped.set)
+            except RuntimeError:
+                pass
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+
+
+async def stream_events(unix_path: Optional[str] = None, host: str = "127.0.0.1", port: Optional[int] = None,
+                        topics: Iterable[str] = DEFAULT_TOPICS) -> AsyncIterator[dict]:
+    if unix_path is not None:
+        reader, writer = await asyncio.open_unix_connection(unix_path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write((json.dumps({"subscribe": list(topics)}) + "\n").encode())
+        await writer.drain()
+        async for line in reader:
+            yield json.loads(line)
+    finally:
+        writer.close()
+
+
+def serve_demo(server: EventServer, loops: Optional[int] = None):
+    from gesture_recognition import GestureRecognizer
+    from synthetic_hands import GESTURE_DEMO, generate_session
+    from utils import GestureCooldown
+
+    cooldown = GestureCooldown()
+    frames: List[Tuple[float, Optional[HandLandmarks]]] = list(generate_session(GESTURE_DEMO, fps=30.0))
+    iteration = 0
+    while loops is None or iteration < loops:
+        recognizer = GestureRecognizer()
+        start = time.monotonic()
+        for offset, hand_data in frames:
+            delay = start + offset - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            timestamp = time.monotonic()
+            if hand_data is not None:
+                hand_data = HandLandmarks(hand_data.landmarks, hand_data.handedness, hand_data.confidence,
+                                          timestamp)
+            server.publish_landmarks(hand_data, timestamp)
+            gesture = recognizer.recognize(hand_data)
+            if gesture != GestureRecognizer.NONE and cooldown.can_trigger(gesture, now=timestamp):
+                cooldown.trigger(gesture, now=timestamp)
+                server.publish_gesture(gesture, timestamp, name=recognizer.get_gesture_name(gesture))
+        iteration += 1
+
+
+async def run_client(args: argparse.Namespace):
+    topics = ["gesture", "landmarks"] if args.landmarks else ["gesture"]
+    last_seq: Dict[str, int] = {}
+    received = gaps = 0
+    ages: List[float] = []
+    window_start = time.monotonic()
+    async for message in stream_events(args.unix, args.host, args.port, topics):
+        if message["type"] == "hello":
+            print(f"Connected as client {message['client']} (protocol {message['version']})")
+            continue
+        now = time.monotonic()
+        if message["type"] in last_seq:
+            gaps += message["seq"] - last_seq[message["type"]] - 1
+        last_seq[message["type"]] = message["seq"]
+        received += 1
+        ages.append(now - message["timestamp"])
+        if message["type"] == "gesture":
+            print(f"{message['timestamp']:.3f}  {message['name']}"
+                  + (f" -> {message['action']}" if message.get("action") else ""), flush=True)
+        if args.slow:
+            await asyncio.sleep(args.slow / 1000)
+        if args.landmarks and now - window_start >= 1.0:
+            print(f"  {received / (now - window_start):.1f} events/sec, {gaps} missed, "
+                  f"age p50 {np.median(ages) * 1000:.1f} ms / max {max(ages) * 1000:.1f} ms", flush=True)
+            window_start = now
+            received = gaps = 0
+            ages = []
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Subscribe to gesture events streamed by main.py, "
+                                                 "or serve a synthetic demo session.")
+    address = parser.add_mutually_exclusive_group(required=True)
+    address.add_argument("--unix", metavar="PATH", help="Unix socket path given to --event-socket")
+    address.add_argument("--port", type=int, help="Localhost TCP port given to --event-port")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--landmarks", action="store_true", help="Also subscribe to the landmark stream")
+    parser.add_argument("--slow", type=float, default=0.0, metavar="MS",
+                        help="Sleep this long per event to simulate a slow consumer")
+    parser.add_argument("--demo", action="store_true",
+                        help="Serve the synthetic gesture session on the address instead of subscribing")
+    parser.add_argument("--queue-size", type=int, default=256)
+    parser.add_argument("--drop-policy", choices=DROP_POLICIES, default="oldest")
+    parser.add_argument("--landmark-fps", type=float, default=15.0)
+    args = parser.parse_args()
+
+    if args.demo:
+        server = EventServer(args.unix, args.host, args.port, queue_size=args.queue_size,
+                             drop_policy=args.drop_policy, landmark_fps=args.landmark_fps).start()
+        try:
+            serve_demo(server)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.close()
+            print(server.report())
+        return
+    try:
+        asyncio.run(run_client(args))
+    except KeyboardInterrupt:
+        pass
+    except ConnectionError as e:
+        raise SystemExit(f"Could not connect to {args.unix or f'{args.host}:{args.port}'}: {e}")
+
+
+if __name__ == "__main__":
+    main()
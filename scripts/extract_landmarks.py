@@ -0,0 +1,184 @@
+import argparse
+import cv2
+import multiprocessing as mp
+import os
+import queue
+import sys
+import threading
+import time
+from typing import List, NamedTuple, Optional
+
+from hand_tracker import HandTracker
+from recording import LandmarkRecorder
+from smoothing import SMOOTHERS
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov", ".mkv", ".webm", ".m4v")
+PROGRESS_EVERY = 100
+
+
+class VideoJob(NamedTuple):
+    path: str
+    output: str
+    frame_count: int
+
+
+class VideoResult(NamedTuple):
+    path: str
+    output: str
+    frames: int
+    detected: int
+    elapsed: float
+    error: Optional[str] = None
+
+
+_tracker = None
+_progress = None
+
+
+def _init_worker(progress, smoothing: str, mirror: bool):
+    global _tracker, _progress
+    cv2.setNumThreads(1)
+    _tracker = HandTracker(max_hands=1, min_detection_confidence=0.7, min_tracking_confidence=0.6,
+                           smoothing=smoothing, mirror=mirror)
+    _progress = progress
+
+
+def extract_video(job: VideoJob) -> VideoResult:
+    start = time.perf_counter()
+    frames = detected = reported = 0
+    temp_path = job.output + ".part"
+    cap = cv2.VideoCapture(job.path)
+    try:
+        if not cap.isOpened():
+            raise IOError("could not open video")
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+        _tracker.reset()
+        os.makedirs(os.path.dirname(job.output) or ".", exist_ok=True)
+        frame = None
+        with LandmarkRecorder(temp_path, size) as recorder:
+            while True:
+                ret, frame = cap.read(frame)
+                if not ret:
+                    break
+                timestamp = frames / fps
+                hand_data = _tracker.process_frame(frame, timestamp)
+                recorder.write(hand_data, timestamp)
+                frames += 1
+                detected += hand_data is not None
+                if frames - reported >= PROGRESS_EVERY:
+                    _progress.put(frames - reported)
+                    reported = frames
+        os.replace(temp_path, job.output)
+        error = None
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    finally:
+        cap.release()
+        _progress.put(frames - reported)
+    return VideoResult(job.path, job.output, frames, detected, time.perf_counter() - start, error)
+
+
+def find_jobs(input_dir: str, output_dir: str, overwrite: bool = False) -> List[VideoJob]:
+    jobs = []
+    for root, _, files in os.walk(input_dir):
+        for name in sorted(files):
+            if not name.lower().endswith(VIDEO_EXTENSIONS):
+                continue
+            path = os.path.join(root, name)
+            relative = os.path.splitext(os.path.relpath(path, input_dir))[0]
+            output = os.path.join(output_dir, relative + ".lmk")
+            if os.path.exists(output) and not overwrite:
+                continue
+            cap = cv2.VideoCapture(path)
+            frame_count = max(int(cap.get(cv2.CAP_PROP_FRAME_COUNT)), 0)
+            cap.release()
+            jobs.append(VideoJob(path, output, frame_count))
+    jobs.sort(key=lambda job: -job.frame_count)
+    return jobs
+
+
+def _report_progress(progress, total_frames: int, stop: threading.Event, interval: float):
+    done = 0
+    start = last = time.monotonic()
+    while not stop.is_set():
+        try:
+            done += progress.get(timeout=0.2)
+        except queue.Empty:
+            pass
+        now = time.monotonic()
+        if now - last >= interval:
+            last = now
+            rate = done / (now - start)
+            eta = f", ETA {(total_frames - done) / rate:.0f}s" if rate > 0 and total_frames > done else ""
+            percent = f" ({done / total_frames:.0%})" if total_frames else ""
+            print(f"  {done}/{total_frames} frames{percent}, {rate:.0f} frames/sec{eta}", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract hand landmarks from a directory of videos in parallel.")
+    parser.add_argument("input_dir", help="Directory searched recursively for video files")
+    parser.add_argument("output_dir", help="Where per-video .lmk recordings are written (mirrors input layout)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes, one tracker each (default: all cores)")
+    parser.add_argument("--smoothing", choices=sorted(SMOOTHERS), default="none",
+                        help="Landmark smoother (default: none, raw landmarks)")
+    parser.add_argument("--no-mirror", action="store_true",
+                        help="Keep frames unflipped (the live app mirrors the webcam image)")
+    parser.add_argument("--overwrite", action="store_true", help="Re-extract videos that already have output")
+    parser.add_argument("--progress-interval", type=float, default=5.0)
+    args = parser.parse_args()
+
+    jobs = find_jobs(args.input_dir, args.output_dir, args.overwrite)
+    if not jobs:
+        print("Nothing to do: no unprocessed videos found")
+        return
+    total_frames = sum(job.frame_count for job in jobs)
+    workers = max(1, min(args.workers, len(jobs)))
+    print(f"Extracting {len(jobs)} videos (~{total_frames} frames) with {workers} workers")
+
+    context = mp.get_context("spawn")
+    progress = context.Queue()
+    stop = threading.Event()
+    reporter = threading.Thread(target=_report_progress, daemon=True,
+                                args=(progress, total_frames, stop, args.progress_interval))
+    reporter.start()
+    start = time.perf_counter()
+    results: List[VideoResult] = []
+    try:
+        with context.Pool(workers, initializer=_init_worker,
+                          initargs=(progress, args.smoothing, not args.no_mirror)) as pool:
+            for result in pool.imap_unordered(extract_video, jobs):
+                results.append(result)
+                prefix = f"[{len(results)}/{len(jobs)}] {os.path.relpath(result.path, args.input_dir)}"
+                if result.error:
+                    print(f"{prefix}: FAILED {result.error}", flush=True)
+                else:
+                    fps = result.frames / result.elapsed if result.elapsed > 0 else 0.0
+                    rate = result.detected / result.frames if result.frames else 0.0
+                    print(f"{prefix}: {result.frames} frames, {fps:.0f} frames/sec, hand in {rate:.0%}",
+                          flush=True)
+    except KeyboardInterrupt:
+        print("\nInterrupted; finished videos are kept and the rest will be resumed on the next run")
+    finally:
+        stop.set()
+        reporter.join()
+
+    elapsed = time.perf_counter() - start
+    done = [r for r in results if r.error is None]
+    failed = [r for r in results if r.error is not None]
+    frames = sum(r.frames for r in done)
+    busy = sum(r.elapsed for r in done)
+    print(f"Done: {len(done)} videos, {frames} frames in {elapsed:.1f}s "
+          f"({frames / elapsed if elapsed > 0 else 0:.0f} frames/sec overall, "
+          f"{frames / busy if busy > 0 else 0:.0f} frames/sec per worker, "
+          f"{busy / (elapsed * workers) if elapsed > 0 else 0:.0%} worker utilization)")
+    if failed:
+        print(f"{len(failed)} videos failed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+import argparse
+import sys
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import NamedTuple, Optional, Tuple
+import numpy as np
+
+from landmarks import HandLandmarks, NUM_LANDMARKS
+from recording import HANDEDNESS_CODES, HANDEDNESS_LABELS
+
+MAGIC = b"GFBS"
+VERSION = 1
+ALIGNMENT = 64
+
+HEADER_DTYPE = np.dtype([
+    ("magic", "S4"),
+    ("version", "<u4"),
+    ("width", "<u4"),
+    ("height", "<u4"),
+    ("channels", "<u4"),
+    ("slots", "<u4"),
+    ("mirrored", "u1"),
+    ("reserved", "V7"),
+    ("latest", "<i8"),
+])
+
+SLOT_DTYPE = np.dtype([
+    ("version", "<u8"),
+    ("frame_id", "<u8"),
+    ("timestamp", "<f8"),
+    ("confidence", "<f4"),
+    ("present", "u1"),
+    ("handedness", "u1"),
+    ("reserved", "V2"),
+    ("landmarks", "<f4", (NUM_LANDMARKS, 3)),
+])
+
+
+def _aligned(size: int) -> int:
+    return (size + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _layout(slots: int, frame_shape: Tuple[int, int, int]) -> Tuple[int, int, int]:
+    meta_offset = _aligned(HEADER_DTYPE.itemsize)
+    frames_offset = _aligned(meta_offset + slots * SLOT_DTYPE.itemsize)
+    return meta_offset, frames_offset, frames_offset + slots * int(np.prod(frame_shape))
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, track=False)
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name)
+    finally:
+        resource_tracker.register = register
+
+
+def _is_bus_header(shm: shared_memory.SharedMemory) -> bool:
+    header = np.ndarray((), dtype=HEADER_DTYPE, buffer=shm.buf).copy()
+    return header["magic"] == MAGIC and header["version"] == VERSION
+
+
+class BusFrame(NamedTuple):
+    sequence: int
+    frame_id: int
+    timestamp: float
+    frame: np.ndarray
+    hand_data: Optional[HandLandmarks]
+
+
+class _BusViews:
+    def _map(self, shm: shared_memory.SharedMemory, slots: int, frame_shape: Tuple[int, int, int]):
+        meta_offset, frames_offset, _ = _layout(slots, frame_shape)
+        self.header = np.ndarray((), dtype=HEADER_DTYPE, buffer=shm.buf)
+        self.meta = np.ndarray((slots,), dtype=SLOT_DTYPE, buffer=shm.buf, offset=meta_offset)
+        self.versions = self.meta["version"]
+        self.frames = np.ndarray((slots,) + frame_shape, dtype=np.uint8, buffer=shm.buf, offset=frames_offset)
+
+    def _unmap(self):
+        self.header = self.meta = self.versions = self.frames = None
+
+
+class FrameBusPublisher(_BusViews):
+    def __init__(self, name: str, frame_shape: Tuple[int, ...], slots: int = 4, mirrored: bool = False,
+                 reclaim: bool = False):
+        if len(frame_shape) == 2:
+            frame_shape = tuple(frame_shape) + (1,)
+        self.name = name
+        self.frame_shape = tuple(int(d) for d in frame_shape)
+        self.slots = slots
+        size = _layout(slots, self.frame_shape)[2]
+        try:
+            self.shm = shared_memory.SharedMemory(name, create=True, size=size)
+        except FileExistsError:
+            existing = _attach(name)
+            try:
+                is_bus = existing.size >= HEADER_DTYPE.itemsize and _is_bus_header(existing)
+                if not reclaim:
+                    what = f"Frame bus '{name}' is already in use" if is_bus else \
+                        f"Shared memory '{name}' already exists and is not a version {VERSION} frame bus"
+                    raise FileExistsError(f"{what}; use another name, or reclaim it (main.py --reclaim-bus) "
+                                          f"if its publisher is gone")
+                existing.unlink()
+            finally:
+                existing.close()
+            self.shm = shared_memory.SharedMemory(name, create=True, size=size)
+        self._map(self.shm, slots, self.frame_shape)
+        self.meta[...] = np.zeros((), dtype=SLOT_DTYPE)
+        height, width, channels = self.frame_shape
+        self.header[()] = (MAGIC, VERSION, width, height, channels, slots, mirrored, b"", -1)
+        self.sequence = -1
+
+    def publish(self, frame: np.ndarray, hand_data: Optional[HandLandmarks], timestamp: float,
+                frame_id: Optional[int] = None):
+        sequence = self.sequence + 1
+        index = sequence % self.slots
+        slot = self.meta[index]
+        self.versions[index] = 2 * sequence + 1
+        self.frames[index].reshape(frame.shape)[...] = frame
+        slot["frame_id"] = sequence if frame_id is None else frame_id
+        slot["timestamp"] = timestamp
+        if hand_data is None:
+            slot["present"] = 0
+        else:
+            slot["present"] = 1
+            slot["landmarks"] = hand_data.landmarks
+            slot["confidence"] = hand_data.confidence
+            slot["handedness"] = HANDEDNESS_CODES.get(hand_data.handedness, 0)
+        self.versions[index] = 2 * sequence + 2
+        self.header["latest"] = sequence
+        self.sequence = sequence
+
+    def close(self):
+        self._unmap()
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self) -> "FrameBusPublisher":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class FrameBusReader(_BusViews):
+    def __init__(self, name: str):
+        self.shm = _attach(name)
+        header = np.ndarray((), dtype=HEADER_DTYPE, buffer=self.shm.buf).copy()
+        if header["magic"] != MAGIC or header["version"] != VERSION:
+            self.shm.close()
+            raise ValueError(f"Shared memory '{name}' is not a version {VERSION} frame bus")
+        self.name = name
+        self.slots = int(header["slots"])
+        self.frame_shape = (int(header["height"]), int(header["width"]), int(header["channels"]))
+        self.frame_size = (self.frame_shape[1], self.frame_shape[0])
+        self.mirrored = bool(header["mirrored"])
+        self._map(self.shm, self.slots, self.frame_shape)
+
+    @property
+    def latest_sequence(self) -> int:
+        return int(self.header["latest"])
+
+    def read(self, sequence: int, copy: bool = False) -> Optional[BusFrame]:
+        index = sequence % self.slots
+        version = 2 * sequence + 2
+        if self.versions[index] != version:
+            return None
+        slot = self.meta[index].copy()
+        frame = self.frames[index].copy() if copy else self.frames[index]
+        if self.versions[index] != version:
+            return None
+        hand_data = None
+        if slot["present"]:
+            hand_data = HandLandmarks(
+                landmarks=slot["landmarks"],
+                handedness=HANDEDNESS_LABELS.get(int(slot["handedness"]), "Unknown"),
+                confidence=float(slot["confidence"]),
+                timestamp=float(slot["timestamp"]),
+            )
+        return BusFrame(sequence, int(slot["frame_id"]), float(slot["timestamp"]), frame, hand_data)
+
+    def latest(self, copy: bool = False) -> Optional[BusFrame]:
+        while True:
+            sequence = self.latest_sequence
+            if sequence < 0:
+                return None
+            bus_frame = self.read(sequence, copy)
+            if bus_frame is not None:
+                return bus_frame
+
+    def wait_next(self, after: int, timeout: Optional[float] = None, poll_interval: float = 0.001,
+                  copy: bool = False) -> Optional[BusFrame]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.latest_sequence <= after:
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            time.sleep(poll_interval)
+        return self.latest(copy)
+
+    def valid(self, bus_frame: BusFrame) -> bool:
+        return self.versions[bus_frame.sequence % self.slots] == 2 * bus_frame.sequence + 2
+
+    def close(self):
+        self._unmap()
+        try:
+            self.shm.close()
+        except BufferError:
+            pass
+
+    def __enter__(self) -> "FrameBusReader":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Read frames and landmarks published by main.py --publish-bus.")
+    parser.add_argument("name", help="Shared memory name given to --publish-bus")
+    parser.add_argument("--show", action="store_true", help="Display the frames with the landmark overlay")
+    parser.add_argument("--record", metavar="PATH", help="Record the landmarks to PATH for offline replay")
+    parser.add_argument("--duration", type=float, help="Stop after this many seconds")
+    parser.add_argument("--stats-interval", type=float, default=1.0)
+    args = parser.parse_args()
+
+    import cv2
+    from recording import LandmarkRecorder
+    from renderer import draw_hand_skeleton
+
+    reader = FrameBusReader(args.name)
+    print(f"Attached to '{args.name}': {reader.frame_size[0]}x{reader.frame_size[1]}, {reader.slots} slots")
+    recorder = LandmarkRecorder(args.record, reader.frame_size) if args.record else None
+    display = np.empty(reader.frame_shape, dtype=np.uint8) if args.show else None
+    last = reader.latest_sequence
+    start = window_start = time.monotonic()
+    received = dropped = torn = detected = 0
+    ages = []
+    try:
+        while args.duration is None or time.monotonic() - start < args.duration:
+            bus_frame = reader.wait_next(last, timeout=0.5)
+            if bus_frame is None:
+                continue
+            if last >= 0:
+                dropped += bus_frame.sequence - last - 1
+            last = bus_frame.sequence
+            received += 1
+            detected += bus_frame.hand_data is not None
+            ages.append(time.monotonic() - bus_frame.timestamp)
+            if recorder is not None:
+                recorder.write(bus_frame.hand_data, bus_frame.timestamp)
+            if display is not None:
+                if reader.mirrored:
+                    cv2.flip(bus_frame.frame, 1, dst=display)
+                else:
+                    display[...] = bus_frame.frame
+                torn += not reader.valid(bus_frame)
+                if bus_frame.hand_data is not None:
+                    draw_hand_skeleton(display, bus_frame.hand_data.landmarks)
+                cv2.imshow(f"frame bus: {args.name}", display)
+                if cv2.waitKey(1) & 0xFF in (ord('q'), ord('Q')):
+                    break
+            now = time.monotonic()
+            if now - window_start >= args.stats_interval:
+                print(f"{received / (now - window_start):5.1f} frames/sec, {dropped} skipped, "
+                      f"age p50 {np.median(ages) * 1000:.1f} ms / max {max(ages) * 1000:.1f} ms, "
+                      f"hand in {detected / received:.0%}" + (f", {torn} overwritten mid-read" if torn else ""),
+                      flush=True)
+                window_start = now
+                received = dropped = torn = detected = 0
+                ages = []
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if recorder is not None:
+            recorder.close()
+            print(f"Recorded {recorder.frames_written} frames to {args.record}")
+        if args.show:
+            cv2.destroyAllWindows()
+        reader.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+import argparse
+import os
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+import cv2
+import numpy as np
+
+from hand_features import DEFAULT_FRAME_SIZE
+from landmarks import MIDDLE_MCP, PALM_POINTS, THUMB_CMC, THUMB_MCP, WRIST
+from synthetic_hands import GESTURE_DEMO, Segment, generate_session
+from utils import configure_camera
+
+PACINGS = ("realtime", "fast")
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".webp")
+SOURCE_HELP = "a webcam index, a video file, a directory of images, or 'synthetic'"
+SYNTHETIC_PALM = np.append([THUMB_CMC, THUMB_MCP], PALM_POINTS[1:])
+SYNTHETIC_FINGERS = [np.arange(1, 5)] + [np.arange(mcp, mcp + 4) for mcp in PALM_POINTS[1:]]
+SYNTHETIC_FINGER_WIDTHS = (12.0, 10.0, 10.0, 9.0, 8.0)
+SYNTHETIC_FINGER_TAPER = 0.12
+SYNTHETIC_WRIST_WIDTH = 26.0
+SYNTHETIC_FOREARM = 25.0
+SYNTHETIC_BACKGROUND = (70, 60, 50)
+SYNTHETIC_SKIN = (140, 170, 215)
+
+
+class FrameSource:
+    live = False
+
+    def __init__(self, fps: float = 30.0, pacing: str = "realtime", max_frames: Optional[int] = None):
+        if pacing not in PACINGS:
+            raise ValueError(f"Unknown pacing '{pacing}', expected one of {', '.join(PACINGS)}")
+        self.fps = fps
+        self.pacing = pacing
+        self.max_frames = max_frames
+        self.frame_size = (0, 0)
+        self.frames_read = 0
+        self.timestamp = 0.0
+        self.finished = False
+        self._origin: Optional[float] = None
+        self._started_at: Optional[float] = None
+        self._ended_at: Optional[float] = None
+
+    @property
+    def realtime(self) -> bool:
+        return self.live or self.pacing == "realtime"
+
+    def is_open(self) -> bool:
+        return True
+
+    def describe(self) -> str:
+        raise NotImplementedError
+
+    def _grab(self, buffer: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        raise NotImplementedError
+
+    def read(self, buffer: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        if self.finished or (self.max_frames is not None and self.frames_read >= self.max_frames):
+            return self._finish()
+        now = time.monotonic()
+        if self._origin is None:
+            self._origin = now
+            self._started_at = time.perf_counter()
+        elif not self.live and self.pacing == "realtime":
+            delay = self._origin + self.frames_read / self.fps - now
+            if delay > 0:
+                time.sleep(delay)
+        frame = self._grab(buffer)
+        if frame is None:
+            return self._finish()
+        self.timestamp = time.monotonic() if self.realtime else self._origin + self.frames_read / self.fps
+        self.frames_read += 1
+        return True, frame
+
+    def _finish(self) -> Tuple[bool, None]:
+        if not self.finished:
+            self.finished = True
+            self._ended_at = time.perf_counter()
+        return False, None
+
+    def release(self):
+        if self._started_at is not None and self._ended_at is None:
+            self._ended_at = time.perf_counter()
+
+    def get_stats(self) -> Dict[str, float]:
+        if self._started_at is None:
+            return {"frames": 0, "seconds": 0.0, "fps": 0.0}
+        elapsed = (self._ended_at or time.perf_counter()) - self._started_at
+        return {
+            "frames": self.frames_read,
+            "seconds": elapsed,
+            "fps": self.frames_read / elapsed if elapsed > 0 else 0.0,
+        }
+
+
+class CameraSource(FrameSource):
+    live = True
+
+    def __init__(self, camera_id: int = 0, width: int = 640, height: int = 480, fps: float = 30.0):
+        super().__init__(fps)
+        self.camera_id = camera_id
+        self.cap = cv2.VideoCapture(camera_id)
+        if self.cap.isOpened():
+            configure_camera(self.cap, width, height, int(fps))
+            self.frame_size = (int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                               int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+            self.fps = self.cap.get(cv2.CAP_PROP_FPS) or fps
+
+    def is_open(self) -> bool:
+        return self.cap.isOpened()
+
+    def describe(self) -> str:
+        return f"webcam {self.camera_id}"
+
+    def _grab(self, buffer: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        ret, frame = self.cap.read(buffer)
+        return frame if ret else None
+
+    def release(self):
+        self.cap.release()
+        super().release()
+
+
+class VideoSource(FrameSource):
+    def __init__(self, path: str, pacing: str = "realtime", max_frames: Optional[int] = None, loop: bool = False,
+                 fps: Optional[float] = None):
+        self.cap = cv2.VideoCapture(path)
+        super().__init__(fps or self.cap.get(cv2.CAP_PROP_FPS) or 30.0, pacing, max_frames)
+        self.path = path
+        self.loop = loop
+        self.frame_size = (int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+
+    def is_open(self) -> bool:
+        return self.cap.isOpened()
+
+    def describe(self) -> str:
+        return f"video {self.path}"
+
+    def _grab(self, buffer: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        ret, frame = self.cap.read(buffer)
+        if not ret and self.loop and self.frames_read:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read(buffer)
+        return frame if ret else None
+
+    def release(self):
+        self.cap.release()
+        super().release()
+
+
+class ImageDirectorySource(FrameSource):
+    def __init__(self, path: str, fps: float = 30.0, pacing: str = "realtime", max_frames: Optional[int] = None,
+                 loop: bool = False):
+        super().__init__(fps, pacing, max_frames)
+        self.path = path
+        self.loop = loop
+        self.paths: List[str] = sorted(
+            os.path.join(path, name) for name in os.listdir(path) if name.lower().endswith(IMAGE_EXTENSIONS))
+        self._index = 0
+        first = cv2.imread(self.paths[0]) if self.paths else None
+        if first is not None:
+            self.frame_size = (first.shape[1], first.shape[0])
+
+    def is_open(self) -> bool:
+        return self.frame_size[1] > 0
+
+    def describe(self) -> str:
+        return f"{len(self.paths)} images in {self.path}"
+
+    def _grab(self, buffer: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        if self._index >= len(self.paths):
+            if not self.loop:
+                return None
+            self._index = 0
+        frame = cv2.imread(self.paths[self._index])
+        self._index += 1
+        if frame is None:
+            raise IOError(f"Could not read image {self.paths[self._index - 1]}")
+        if (frame.shape[1], frame.shape[0]) != self.frame_size:
+            frame = cv2.resize(frame, self.frame_size, interpolation=cv2.INTER_AREA)
+        return frame
+
+
+class SyntheticSource(FrameSource):
+    def __init__(self, segments: Sequence[Segment] = GESTURE_DEMO, fps: float = 30.0, pacing: str = "realtime",
+                 max_frames: Optional[int] = None, loop: bool = False,
+                 frame_size: Tuple[int, int] = DEFAULT_FRAME_SIZE, noise: float = 1.5, seed: int = 0,
+                 mirror: bool = True):
+        super().__init__(fps, pacing, max_frames)
+        self.loop = loop
+        self.frame_size = frame_size
+        self.mirror = mirror
+        self.session = list(generate_session(segments, fps=fps, noise=noise, seed=seed))
+        scale = frame_size[1] / DEFAULT_FRAME_SIZE[1]
+        self._scale = np.array([scale, scale], dtype=np.float32)
+        self._offset = np.array([(frame_size[0] - DEFAULT_FRAME_SIZE[0] * scale) / 2, 0.0], dtype=np.float32)
+        self._margin = int(np.ceil((SYNTHETIC_FOREARM + 2 * max(SYNTHETIC_FINGER_WIDTHS)) * scale)) + 2
+        self._skin = np.array(SYNTHETIC_SKIN, dtype=np.float32)
+        self._background = np.empty((frame_size[1], frame_size[0], 3), dtype=np.uint8)
+        self._background[...] = np.clip(
+            np.random.default_rng(seed).normal(SYNTHETIC_BACKGROUND, 4.0, self._background.shape), 0, 255)
+        self._index = 0
+
+    def describe(self) -> str:
+        return f"synthetic gesture session ({len(self.session) / self.fps:.1f}s)"
+
+    def _grab(self, buffer: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        if self._index >= len(self.session):
+            if not self.loop:
+                return None
+            self._index = 0
+        if buffer is not None and buffer.shape == self._background.shape:
+            frame = buffer
+            np.copyto(frame, self._background)
+        else:
+            frame = self._background.copy()
+        _, hand_data = self.session[self._index]
+        self._index += 1
+        if hand_data is not None:
+            points = hand_data.landmarks[:, :2] * self._scale + self._offset
+            if self.mirror:
+                points[:, 0] = self.frame_size[0] - points[:, 0]
+            self._draw_hand(frame, points)
+        return frame
+
+    def _draw_hand(self, frame: np.ndarray, points: np.ndarray):
+        # Palm and fingers are shaded separately so the hand model sees rounded, overlapping parts
+        # instead of one flat silhouette; all work stays inside the hand's bounding box.
+        scale = float(self._scale[1])
+        left, top = np.maximum(np.floor(points.min(axis=0)).astype(int) - self._margin, 0)
+        right, bottom = np.ceil(points.max(axis=0)).astype(int) + self._margin
+        roi = frame[top:bottom, left:right]
+        points = points - (left, top)
+        axis = points[MIDDLE_MCP] - points[WRIST]
+        axis /= max(float(np.hypot(*axis)), 1e-6)
+        side = np.array([-axis[1], axis[0]]) * SYNTHETIC_WRIST_WIDTH * scale
+        forearm = axis * SYNTHETIC_FOREARM * scale
+        wrist = points[WRIST]
+        palm = np.vstack([wrist + side, wrist - side, wrist + side - forearm, wrist - side - forearm,
+                          points[SYNTHETIC_PALM]])
+        masks = [np.zeros(roi.shape[:2], dtype=np.uint8) for _ in range(len(SYNTHETIC_FINGERS) + 1)]
+        cv2.fillConvexPoly(masks[0], cv2.convexHull(np.rint(palm).astype(np.int32)), 255, cv2.LINE_AA)
+        for mask, chain, width in zip(masks[1:], SYNTHETIC_FINGERS, SYNTHETIC_FINGER_WIDTHS):
+            joints = np.rint(points[chain]).astype(np.int32)
+            for bone, (start, end) in enumerate(zip(joints[:-1], joints[1:])):
+                thickness = max(int(round(2 * width * scale * (1.0 - SYNTHETIC_FINGER_TAPER * bone))), 1)
+                cv2.line(mask, tuple(map(int, start)), tuple(map(int, end)), 255, thickness, cv2.LINE_AA)
+        image = roi.astype(np.float32)
+        for mask in masks:
+            depth = cv2.distanceTransform((mask > 127).astype(np.uint8), cv2.DIST_L2, 5)
+            shade = 0.55 + 0.45 * np.sqrt(depth / max(float(depth.max()), 1e-6))
+            alpha = mask.astype(np.float32)[..., None] / 255.0
+            image += alpha * (self._skin * shade[..., None] - image)
+        roi[...] = image
+
+
+def open_source(spec: str, pacing: str = "realtime", max_frames: Optional[int] = None, loop: bool = False,
+                fps: Optional[float] = None) -> FrameSource:
+    if spec.isdigit():
+        return CameraSource(int(spec), fps=fps or 30.0)
+    if spec == "synthetic":
+        return SyntheticSource(fps=fps or 30.0, pacing=pacing, max_frames=max_frames, loop=loop)
+    if os.path.isdir(spec):
+        return ImageDirectorySource(spec, fps or 30.0, pacing, max_frames, loop)
+    return VideoSource(spec, pacing, max_frames, loop, fps)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Read a frame source and report its frame rate.")
+    parser.add_argument("source", help=f"Frame source: {SOURCE_HELP}")
+    parser.add_argument("--pacing", choices=PACINGS, default="fast")
+    parser.add_argument("--frames", type=int, help="Stop after this many frames")
+    parser.add_argument("--show", action="store_true", help="Display the frames")
+    args = parser.parse_args()
+
+    source = open_source(args.source, args.pacing, args.frames)
+    if not source.is_open():
+        raise SystemExit(f"Could not open {args.source}")
+    print(f"{source.describe()}: {source.frame_size[0]}x{source.frame_size[1]} at {source.fps:g} fps, "
+          f"{args.pacing} pacing")
+    frame = None
+    try:
+        while True:
+            ret, frame = source.read(frame)
+            if not ret:
+                break
+            if args.show:
+                cv2.imshow("frame source", frame)
+                if cv2.waitKey(1) & 0xFF in (ord('q'), ord('Q')):
+                    break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        source.release()
+        if args.show:
+            cv2.destroyAllWindows()
+    stats = source.get_stats()
+    print(f"Read {stats['frames']} frames in {stats['seconds']:.2f}s ({stats['fps']:.1f} fps)")
+
+
+if __name__ == "__main__":
+    main()
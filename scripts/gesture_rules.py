@@ -0,0 +1,346 @@
+import json
+import math
+import os
+import time
+import warnings
+from collections import deque
+from typing import Any, Deque, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from hand_features import HandFeatures
+from trajectory import DEFAULT_BAND, DEFAULT_LENGTH, TrajectoryMatcher, builtin_templates
+
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gestures.json")
+NUM_MASKS = 32
+ALL_MASKS = tuple(range(NUM_MASKS))
+TIME_EPSILON = 1e-6
+MAX_HISTORY = 512
+
+
+def parse_mask(value: Any) -> int:
+    mask = int(value, 0) if isinstance(value, str) else int(value)
+    if not 0 <= mask < NUM_MASKS:
+        raise ValueError(f"Finger mask {value!r} is outside 0..{NUM_MASKS - 1}")
+    return mask
+
+
+class GestureBinding(NamedTuple):
+    action: Optional[str]
+    cooldown: Optional[float]
+    label: str
+
+
+class GestureConfig(NamedTuple):
+    rules: List[Dict[str, Any]]
+    bindings: Dict[str, GestureBinding]
+    default_cooldown: float
+    base_dir: str = ""
+
+
+class GestureRule:
+    terminal = False
+    confidence = 1.0
+
+    def __init__(self, priority: int = 0, masks: Optional[Sequence[Any]] = None):
+        self.priority = priority
+        self.masks = ALL_MASKS if masks is None else tuple(parse_mask(m) for m in masks)
+
+    def gestures(self) -> Tuple[str, ...]:
+        raise NotImplementedError
+
+    def evaluate(self, features: HandFeatures) -> Optional[str]:
+        raise NotImplementedError
+
+    def reset(self):
+        pass
+
+    def _append_sample(self, history: Deque[Tuple[float, ...]], sample: Tuple[float, ...]) -> bool:
+        if history and sample[0] <= history[-1][0]:
+            warnings.warn(f"{type(self).__name__} dropped a sample whose timestamp does not increase; "
+                          "set HandLandmarks.timestamp on every frame", RuntimeWarning, stacklevel=3)
+            return False
+        history.append(sample)
+        return True
+
+
+class PoseRule(GestureRule):
+    terminal = True
+
+    def __init__(self, gesture: str, masks: Sequence[Any], priority: int = 0):
+        super().__init__(priority, masks)
+        self.gesture = gesture
+
+    def gestures(self) -> Tuple[str, ...]:
+        return (self.gesture,)
+
+    def evaluate(self, features: HandFeatures) -> Optional[str]:
+        return self.gesture
+
+
+class PinchRule(GestureRule):
+    def __init__(self, gesture: str, threshold: float = 0.083, priority: int = 0,
+                 masks: Optional[Sequence[Any]] = None):
+        super().__init__(priority, masks)
+        self.gesture = gesture
+        self.threshold = threshold
+        self.was_pinching = False
+
+    def gestures(self) -> Tuple[str, ...]:
+        return (self.gesture,)
+
+    def evaluate(self, features: HandFeatures) -> Optional[str]:
+        is_pinching = features.pinch_distance < self.threshold
+        if is_pinching and not self.was_pinching:
+            self.was_pinching = True
+            return self.gesture
+        elif not is_pinching:
+            self.was_pinching = False
+        return None
+
+    def reset(self):
+        self.was_pinching = False
+
+
+class VerticalMotionRule(GestureRule):
+    def __init__(self, up: str, down: str, distance: float = 0.05, priority: int = 0,
+                 masks: Optional[Sequence[Any]] = None):
+        super().__init__(priority, masks)
+        self.up = up
+        self.down = down
+        self.distance = distance
+        self.anchor_y: Optional[float] = None
+
+    def gestures(self) -> Tuple[str, ...]:
+        return (self.up, self.down)
+
+    def evaluate(self, features: HandFeatures) -> Optional[str]:
+        current_y = features.wrist[1]
+        if self.anchor_y is None:
+            self.anchor_y = current_y
+            return None
+        delta_y = current_y - self.anchor_y
+        if delta_y < -self.distance:
+            self.anchor_y -= self.distance
+            return self.up
+        elif delta_y > self.distance:
+            self.anchor_y += self.distance
+            return self.down
+        return None
+
+    def reset(self):
+        self.anchor_y = None
+
+
+class SwipeRule(GestureRule):
+    def __init__(self, right: str, left: str, distance: float = 0.17, window: float = 0.3,
+                 min_duration: float = 0.12, priority: int = 0, masks: Optional[Sequence[Any]] = None):
+        super().__init__(priority, masks)
+        self.right = right
+        self.left = left
+        self.distance = distance
+        self.window = window
+        self.min_duration = min_duration
+        self.history: Deque[Tuple[float, float]] = deque(maxlen=MAX_HISTORY)
+
+    def gestures(self) -> Tuple[str, ...]:
+        return (self.right, self.left)
+
+    def evaluate(self, features: HandFeatures) -> Optional[str]:
+        now = features.timestamp
+        history = self.history
+        if not self._append_sample(history, (now, features.palm_center[0])):
+            return None
+        while now - history[0][0] > self.window + TIME_EPSILON:
+            history.popleft()
+        if now - history[0][0] < self.min_duration - TIME_EPSILON:
+            return None
+        delta_x = history[-1][1] - history[0][1]
+        if abs(delta_x) > self.distance:
+            history.clear()
+            return self.right if delta_x > 0 else self.left
+        return None
+
+    def reset(self):
+        self.history.clear()
+
+
+class ClassifierRule(GestureRule):
+    def __init__(self, model: str, min_confidence: float = 0.7, budget_ms: float = 1.0,
+                 priority: int = 0, masks: Optional[Sequence[Any]] = None):
+        super().__init__(priority, masks)
+        from pose_classifier import NO_POSE, load_pose_classifier
+        self.classifier = load_pose_classifier(model)
+        self.no_pose = NO_POSE
+        self.min_confidence = min_confidence
+        self.budget = budget_ms / 1000.0
+        self.cost = 0.0
+        self.stride = 1
+        self.frames = 0
+        self.label: Optional[str] = None
+        self.confidence = 0.0
+
+    def gestures(self) -> Tuple[str, ...]:
+        return tuple(label for label in self.classifier.labels if label != self.no_pose)
+
+    def evaluate(self, features: HandFeatures) -> Optional[str]:
+        if self.frames % self.stride == 0:
+            start = time.perf_counter()
+            labels, confidences = self.classifier.predict(features.hand.landmarks,
+                                                          features.hand.handedness == "Left")
+            elapsed = time.perf_counter() - start
+            self.cost = 0.9 * self.cost + 0.1 * elapsed if self.cost else elapsed
+            self.stride = max(1, math.ceil(self.cost / self.budget))
+            self.label, self.confidence = labels[0], float(confidences[0])
+        self.frames += 1
+        if self.label == self.no_pose or self.confidence < self.min_confidence:
+            return None
+        return self.label
+
+    def reset(self):
+        self.frames = 0
+        self.label = None
+        self.confidence = 0.0
+
+
+class TrajectoryRule(GestureRule):
+    SOURCES = ("palm", "index_tip")
+
+    def __init__(self, templates: Dict[str, str], library: Optional[str] = None, source: str = "palm",
+                 window: float = 2.0, min_duration: float = 0.2, min_extent: float = 0.17,
+                 max_distance: float = 0.08, settle_speed: Optional[float] = 0.25,
+                 length: int = DEFAULT_LENGTH, band: int = DEFAULT_BAND,
+                 priority: int = 0, masks: Optional[Sequence[Any]] = None):
+        super().__init__(priority, masks)
+        if source not in self.SOURCES:
+            raise ValueError(f"Unknown trajectory source '{source}', expected one of {', '.join(self.SOURCES)}")
+        available = builtin_templates(length)
+        if library is not None:
+            with np.load(library) as arrays:
+                available.extend((name.split(":")[0], arrays[name]) for name in arrays.files)
+        missing = set(templates) - {name for name, _ in available}
+        if missing:
+            raise ValueError(f"Unknown trajectory templates: {', '.join(sorted(missing))}")
+        self.matcher = TrajectoryMatcher([(name, points) for name, points in available if name in templates],
+                                         length, band)
+        self.template_gestures = dict(templates)
+        self.source = source
+        self.window = window
+        self.min_duration = min_duration
+        self.min_extent = min_extent
+        self.max_distance = max_distance
+        self.settle_speed = settle_speed
+        self.history: Deque[Tuple[float, float, float]] = deque(maxlen=MAX_HISTORY)
+
+    def gestures(self) -> Tuple[str, ...]:
+        return tuple(dict.fromkeys(self.template_gestures.values()))
+
+    def evaluate(self, features: HandFeatures) -> Optional[str]:
+        now = features.timestamp
+        x1, y1 = features.palm_center if self.source == "palm" else features.index_tip
+        history = self.history
+        if not self._append_sample(history, (now, x1, y1)):
+            return None
+        while now - history[0][0] > self.window + TIME_EPSILON:
+            history.popleft()
+        if len(history) < 2 or now - history[0][0] < self.min_duration - TIME_EPSILON:
+            return None
+        if self.settle_speed is not None:
+            t0, x0, y0 = history[-2]
+            if math.hypot(x1 - x0, y1 - y0) > self.settle_speed * (now - t0):
+                return None
+        path = np.array(history)[:, 1:]
+        if self.settle_speed is not None:
+            history.clear()
+            history.append((now, x1, y1))
+        if np.ptp(path, axis=0).max() < self.min_extent:
+            return None
+        name, _ = self.matcher.match(path, self.max_distance)
+        if name is None:
+            return None
+        self.history.clear()
+        return self.template_gestures[name]
+
+    def reset(self):
+        self.history.clear()
+
+
+RULE_TYPES = {
+    "pose": PoseRule,
+    "pinch": PinchRule,
+    "vertical_motion": VerticalMotionRule,
+    "swipe": SwipeRule,
+    "classifier": ClassifierRule,
+    "trajectory": TrajectoryRule,
+}
+
+
+class GestureRuleSet:
+    def __init__(self, rules: Sequence[GestureRule]):
+        self.rules = sorted(rules, key=lambda rule: rule.priority)
+        self.plans: List[Tuple[GestureRule, ...]] = []
+        self.resets: List[Tuple[GestureRule, ...]] = []
+        self.last_rule: Optional[GestureRule] = None
+        for mask in range(NUM_MASKS):
+            plan = []
+            for rule in self.rules:
+                if mask in rule.masks:
+                    plan.append(rule)
+                    if rule.terminal:
+                        break
+            self.plans.append(tuple(plan))
+            self.resets.append(tuple(
+                rule for rule in self.rules if mask not in rule.masks and not rule.terminal
+            ))
+
+    def gestures(self) -> List[str]:
+        return [gesture for rule in self.rules for gesture in rule.gestures()]
+
+    def evaluate(self, features: HandFeatures) -> Optional[str]:
+        mask = features.finger_mask
+        for rule in self.resets[mask]:
+            rule.reset()
+        for rule in self.plans[mask]:
+            gesture = rule.evaluate(features)
+            if gesture is not None:
+                self.last_rule = rule
+                return gesture
+        self.last_rule = None
+        return None
+
+    def reset(self):
+        for rule in self.rules:
+            rule.reset()
+
+
+def load_gesture_config(path: Optional[str] = None) -> GestureConfig:
+    path = path or DEFAULT_CONFIG_PATH
+    with open(path) as f:
+        data = json.load(f)
+    bindings = {
+        name: GestureBinding(spec.get("action"), spec.get("cooldown"), spec.get("label", name))
+        for name, spec in data["gestures"].items()
+    }
+    return GestureConfig(data["rules"], bindings, data.get("default_cooldown", 0.8),
+                         os.path.dirname(os.path.abspath(path)))
+
+
+def build_rules(config: GestureConfig,
+                overrides: Optional[Dict[str, Dict[str, Any]]] = None) -> GestureRuleSet:
+    rules = []
+    for spec in config.rules:
+        params = dict(spec)
+        rule_type = params.pop("type")
+        if rule_type not in RULE_TYPES:
+            raise ValueError(f"Unknown gesture rule type '{rule_type}', expected one of {', '.join(RULE_TYPES)}")
+        if overrides and rule_type in overrides:
+            params.update(overrides[rule_type])
+        for key in ("model", "library"):
+            if params.get(key) is not None:
+                params[key] = os.path.join(config.base_dir, params[key])
+        rule = RULE_TYPES[rule_type](**params)
+        unbound = [gesture for gesture in rule.gestures() if gesture not in config.bindings]
+        if unbound:
+            raise ValueError(f"Gesture rule '{rule_type}' emits undeclared gestures: {', '.join(unbound)}")
+        rules.append(rule)
+    return GestureRuleSet(rules)
@@ -0,0 +1,67 @@
+import math
+from typing import NamedTuple, Tuple
+
+from landmarks import (HandLandmarks, PALM_POINTS, THUMB_MCP, THUMB_TIP, WRIST, INDEX_TIP,
+                       FINGER_MCPS, FINGER_PIPS, FINGERTIPS)
+
+DEFAULT_FRAME_SIZE = (640, 480)
+
+FINGER_JOINTS = tuple((int(tip), int(pip), int(mcp))
+                      for tip, pip, mcp in zip(FINGERTIPS[1:], FINGER_PIPS, FINGER_MCPS))
+PALM_JOINTS = tuple(int(index) for index in PALM_POINTS)
+FINGER_BITS = (2, 4, 8, 16)
+MASK_STATES = tuple(tuple(bool(mask >> bit & 1) for bit in range(5)) for mask in range(32))
+MASK_COUNTS = tuple(sum(states) for states in MASK_STATES)
+
+
+class HandFeatures(NamedTuple):
+    finger_states: Tuple[bool, bool, bool, bool, bool]
+    finger_mask: int
+    extended_count: int
+    palm_center: Tuple[float, float]
+    tip_distances: Tuple[float, float, float, float]
+    wrist: Tuple[float, float]
+    index_tip: Tuple[float, float]
+    hand: HandLandmarks
+
+    @property
+    def pinch_distance(self) -> float:
+        return self.tip_distances[0]
+
+    @property
+    def timestamp(self) -> float:
+        return self.hand.timestamp
+
+
+def extract_features(hand_data: HandLandmarks, frame_height: float = DEFAULT_FRAME_SIZE[1]) -> HandFeatures:
+    # NumPy calls on a 21-point array cost more than the arithmetic they replace, so a single hand is
+    # read as plain floats; recognizer_bank.extract_batch_features is the vectorized path for many hands.
+    points = hand_data.landmarks.tolist()
+    unit = 1.0 / frame_height
+    thumb_x, thumb_y, _ = points[THUMB_TIP]
+    thumb_dx = thumb_x - points[THUMB_MCP][0]
+    mask = int(thumb_dx < 0 if hand_data.handedness == "Right" else thumb_dx > 0)
+    tip_distances = []
+    for bit, (tip, pip, mcp) in zip(FINGER_BITS, FINGER_JOINTS):
+        tip_x, tip_y, _ = points[tip]
+        if tip_y < points[pip][1] < points[mcp][1]:
+            mask |= bit
+        tip_distances.append(math.hypot(tip_x - thumb_x, tip_y - thumb_y) * unit)
+    palm_x = palm_y = 0.0
+    for index in PALM_JOINTS:
+        x, y, _ = points[index]
+        palm_x += x
+        palm_y += y
+    palm_unit = unit / len(PALM_JOINTS)
+    wrist_x, wrist_y, _ = points[WRIST]
+    index_x, index_y, _ = points[INDEX_TIP]
+    return HandFeatures(
+        finger_states=MASK_STATES[mask],
+        finger_mask=mask,
+        extended_count=MASK_COUNTS[mask],
+        palm_center=(palm_x * palm_unit, palm_y * palm_unit),
+        tip_distances=tuple(tip_distances),
+        wrist=(wrist_x * unit, wrist_y * unit),
+        index_tip=(index_x * unit, index_y * unit),
+        hand=hand_data,
+    )
@@ -1,13 +1,28 @@
 import cv2
-import mediapipe as mp
-from typing import Optional, List, Tuple, NamedTuple
-from utils import MovingAverageFilter
+import numpy as np
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from landmarks import HandLandmarks
+from metrics import Metrics, NULL_METRICS
+from prediction import FlowRefiner, LandmarkPredictor
+from renderer import draw_hand_skeleton
+from smoothing import create_smoother
 
+MIRRORED_HANDEDNESS = {"Left": "Right", "Right": "Left"}
 
-class HandLandmarks(NamedTuple):
-    landmarks: List[Tuple[float, float, float]]
-    handedness: str
-    confidence: float
+
+class RGBConverter:
+    def __init__(self):
+        self._buffer = np.empty(0, dtype=np.uint8)
+    
+    def convert(self, frame) -> np.ndarray:
+        h, w = frame.shape[:2]
+        size = h * w * 3
+        if self._buffer.size < size:
+            self._buffer = np.empty(size, dtype=np.uint8)
+        rgb = self._buffer[:size].reshape(h, w, 3)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb)
+        return rgb
 
 
 class HandTracker:
@@ -37,56 +52,242 @@ class HandTracker:
                  max_hands: int = 1,
                  min_detection_confidence: float = 0.7,
                  min_tracking_confidence: float = 0.6,
-                 smoothing_window: int = 5):
+                 model_complexity: int = 1,
+                 smoothing: str = "one_euro",
+                 smoothing_window: int = 5,
+                 smoothing_params: Optional[Dict[str, Any]] = None,
+                 inference_scale: float = 1.0,
+                 roi_tracking: bool = False,
+                 roi_padding: float = 0.35,
+                 roi_min_size: int = 128,
+                 roi_edge_margin: float = 0.04,
+                 mirror: bool = False,
+                 inference_interval: int = 1,
+                 optical_flow: bool = False,
+                 metrics: Optional[Metrics] = None):
+        import mediapipe as mp
         self.mp_hands = mp.solutions.hands
         self.mp_drawing = mp.solutions.drawing_utils
         self.mp_drawing_styles = mp.solutions.drawing_styles
-        self.hands = self.mp_hands.Hands(
+        self.max_hands = max_hands
+        self.min_detection_confidence = min_detection_confidence
+        self.min_tracking_confidence = min_tracking_confidence
+        self.model_complexity = model_complexity
+        self.hands = self._create_hands()
+        self.smoothing = smoothing
+        self.smoothing_params = dict(smoothing_params or {})
+        self.smoothing_window = smoothing_window
+        self.smoother = self._create_smoother()
+        self.inference_scale = inference_scale
+        self._scaled_buffer: Optional[np.ndarray] = None
+        self.prev_landmarks: Optional[np.ndarray] = None
+        self.metrics = metrics if metrics is not None else NULL_METRICS
+        self.mirror = mirror
+        self.rgb_converter = RGBConverter()
+        self.roi_tracking = roi_tracking
+        self.roi_padding = roi_padding
+        self.roi_min_size = roi_min_size
+        self.roi_edge_margin = roi_edge_margin
+        self.roi_hands = self._create_hands() if roi_tracking else None
+        self._roi_anchor: Optional[np.ndarray] = None
+        self._roi_edge_hit = False
+        self.predictor = LandmarkPredictor(inference_interval) if inference_interval > 1 else None
+        self.flow = FlowRefiner() if optical_flow and self.predictor is not None else None
+        self._last_detection: Tuple[str, float] = ("Unknown", 0.0)
+        self.frames_processed = 0
+        self.frames_detected = 0
+        self.roi_frames = 0
+        self.roi_fallbacks = 0
+        self.pixels_processed = 0
+        self.full_frame_pixels = 0
+    
+    def _create_hands(self):
+        return self.mp_hands.Hands(
             static_image_mode=False,
-            max_num_hands=max_hands,
-            min_detection_confidence=min_detection_confidence,
-            min_tracking_confidence=min_tracking_confidence
+            max_num_hands=self.max_hands,
+            model_complexity=self.model_complexity,
+            min_detection_confidence=self.min_detection_confidence,
+            min_tracking_confidence=self.min_tracking_confidence
         )
-        self.smoothers = [MovingAverageFilter(smoothing_window) for _ in range(21)]
-        self.prev_landmarks: Optional[List[Tuple[float, float, float]]] = None
     
-    def process_frame(self, frame) -> Optional[HandLandmarks]:
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    def _create_smoother(self):
+        params = dict(self.smoothing_params)
+        if self.smoothing == "moving_average":
+            params.setdefault("window", self.smoothing_window)
+        return create_smoother(self.smoothing, **params)
+    
+    def configure(self, model_complexity: Optional[int] = None, inference_scale: Optional[float] = None,
+                  smoothing_window: Optional[int] = None, min_detection_confidence: Optional[float] = None,
+                  min_tracking_confidence: Optional[float] = None):
+        rebuild = False
+        if model_complexity is not None and model_complexity != self.model_complexity:
+            self.model_complexity = model_complexity
+            rebuild = True
+        if min_detection_confidence is not None and min_detection_confidence != self.min_detection_confidence:
+            self.min_detection_confidence = min_detection_confidence
+            rebuild = True
+        if min_tracking_confidence is not None and min_tracking_confidence != self.min_tracking_confidence:
+            self.min_tracking_confidence = min_tracking_confidence
+            rebuild = True
+        if rebuild:
+            self.hands.close()
+            self.hands = self._create_hands()
+            if self.roi_hands is not None:
+                self.roi_hands.close()
+                self.roi_hands = self._create_hands()
+            self._roi_anchor = None
+        if inference_scale is not None:
+            self.inference_scale = inference_scale
+        if smoothing_window is not None and smoothing_window != self.smoothing_window:
+            self.smoothing_window = smoothing_window
+            if self.smoothing == "moving_average":
+                self.smoother = self._create_smoother()
+    
+    def _scaled(self, image):
+        h, w = image.shape[:2]
+        size = (max(int(w * self.inference_scale), 1), max(int(h * self.inference_scale), 1))
+        if self._scaled_buffer is None or self._scaled_buffer.shape[:2] != (size[1], size[0]):
+            self._scaled_buffer = np.empty((size[1], size[0], 3), dtype=np.uint8)
+        cv2.resize(image, size, dst=self._scaled_buffer, interpolation=cv2.INTER_AREA)
+        return self._scaled_buffer
+    
+    def _tracking_roi(self, width: int, height: int) -> Optional[Tuple[int, int, int, int]]:
+        if not self.roi_tracking or self._roi_anchor is None or self._roi_edge_hit:
+            return None
+        x_min, y_min = self._roi_anchor.min(axis=0)
+        x_max, y_max = self._roi_anchor.max(axis=0)
+        side = max(x_max - x_min, y_max - y_min) * (1.0 + 2.0 * self.roi_padding)
+        side = int(min(max(side, self.roi_min_size), width, height))
+        cx, cy = (x_min + x_max) / 2.0, (y_min + y_max) / 2.0
+        x0 = int(min(max(cx - side / 2.0, 0), width - side))
+        y0 = int(min(max(cy - side / 2.0, 0), height - side))
+        if side * side >= width * height:
+            return None
+        return x0, y0, x0 + side, y0 + side
+    
+    def _detect(self, frame, roi: Tuple[int, int, int, int], hands):
+        x0, y0, x1, y1 = roi
+        h, w = frame.shape[:2]
+        crop_w, crop_h = x1 - x0, y1 - y0
+        with self.metrics.stage("color_convert"):
+            crop = frame[y0:y1, x0:x1]
+            if self.inference_scale < 1.0:
+                crop = self._scaled(crop)
+            rgb_frame = self.rgb_converter.convert(crop)
         rgb_frame.flags.writeable = False
-        results = self.hands.process(rgb_frame)
+        with self.metrics.stage("inference"):
+            results = hands.process(rgb_frame)
+        self.pixels_processed += rgb_frame.shape[0] * rgb_frame.shape[1]
         if not results.multi_hand_landmarks:
-            self.prev_landmarks = None
             return None
         hand_landmarks = results.multi_hand_landmarks[0]
         handedness = results.multi_handedness[0].classification[0]
-        h, w, _ = frame.shape
-        landmarks = []
-        for i, lm in enumerate(hand_landmarks.landmark):
-            px, py = int(lm.x * w), int(lm.y * h)
-            smoothed_x, smoothed_y = self.smoothers[i].update(px, py)
-            landmarks.append((smoothed_x, smoothed_y, lm.z))
+        landmarks = np.array([(lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark], dtype=np.float32)
+        if crop_w != w or crop_h != h:
+            margin = self.roi_edge_margin
+            self._roi_edge_hit = bool((landmarks[:, :2] < margin).any() or (landmarks[:, :2] > 1.0 - margin).any())
+        else:
+            self._roi_edge_hit = False
+        landmarks[:, 0] = landmarks[:, 0] * crop_w + x0
+        landmarks[:, 1] = landmarks[:, 1] * crop_h + y0
+        landmarks[:, 2] *= crop_w / w
+        return landmarks, handedness
+    
+    def process_frame(self, frame, timestamp: Optional[float] = None) -> Optional[HandLandmarks]:
+        if timestamp is None:
+            timestamp = time.monotonic()
+        h, w = frame.shape[:2]
+        self.frames_processed += 1
+        self.full_frame_pixels += w * h
+        landmarks = self._predict(frame, timestamp, h)
+        if landmarks is not None:
+            label, confidence = self._last_detection
+        else:
+            detection = None
+            roi = self._tracking_roi(w, h)
+            if roi is not None:
+                self.roi_frames += 1
+                detection = self._detect(frame, roi, self.roi_hands)
+                if detection is None:
+                    self.roi_fallbacks += 1
+            if detection is None:
+                detection = self._detect(frame, (0, 0, w, h), self.hands)
+            if detection is None:
+                self.prev_landmarks = None
+                self._roi_anchor = None
+                self.smoother.reset()
+                if self.predictor is not None:
+                    self.predictor.reset()
+                if self.flow is not None:
+                    self.flow.reset()
+                return None
+            landmarks, handedness = detection
+            label, confidence = handedness.label, handedness.score
+            if self.predictor is not None:
+                self.predictor.update(landmarks, timestamp)
+                self._last_detection = (label, confidence)
+        self._roi_anchor = landmarks[:, :2].copy()
+        if self.flow is not None:
+            self.flow.remember(frame, landmarks)
+        if self.mirror:
+            landmarks[:, 0] = w - landmarks[:, 0]
+            label = MIRRORED_HANDEDNESS.get(label, label)
+        with self.metrics.stage("smoothing"):
+            landmarks[:, :2] = self.smoother.update(landmarks[:, :2], timestamp)
         self.prev_landmarks = landmarks
+        self.frames_detected += 1
         return HandLandmarks(
             landmarks=landmarks,
-            handedness=handedness.label,
-            confidence=handedness.score
+            handedness=label,
+            confidence=confidence,
+            timestamp=timestamp
         )
     
+    def process_frame_multi(self, frame, timestamp: Optional[float] = None) -> List[HandLandmarks]:
+        if timestamp is None:
+            timestamp = time.monotonic()
+        h, w = frame.shape[:2]
+        self.frames_processed += 1
+        self.full_frame_pixels += w * h
+        with self.metrics.stage("color_convert"):
+            rgb_frame = self.rgb_converter.convert(self._scaled(frame) if self.inference_scale < 1.0 else frame)
+        rgb_frame.flags.writeable = False
+        with self.metrics.stage("inference"):
+            results = self.hands.process(rgb_frame)
+        self.pixels_processed += rgb_frame.shape[0] * rgb_frame.shape[1]
+        if not results.multi_hand_landmarks:
+            return []
+        self.frames_detected += 1
+        hands = []
+        for hand_landmarks, handedness in zip(results.multi_hand_landmarks, results.multi_handedness):
+            classification = handedness.classification[0]
+            landmarks = np.array([(lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark], dtype=np.float32)
+            landmarks[:, 0] *= w
+            landmarks[:, 1] *= h
+            label = classification.label
+            if self.mirror:
+                landmarks[:, 0] = w - landmarks[:, 0]
+                label = MIRRORED_HANDEDNESS.get(label, label)
+            hands.append(HandLandmarks(landmarks, label, classification.score, timestamp))
+        return hands
+    
+    def _predict(self, frame, timestamp: float, height: int) -> Optional[np.ndarray]:
+        if self.predictor is None:
+            return None
+        self.predictor.frame_height = height
+        if self.predictor.should_infer(timestamp):
+            return None
+        with self.metrics.stage("prediction"):
+            landmarks = self.predictor.predict(timestamp)
+            if self.flow is not None:
+                self.flow.refine(frame, landmarks)
+        return landmarks
+    
     def draw_landmarks(self, frame, hand_data: Optional[HandLandmarks], 
                        color: Tuple[int, int, int] = (0, 255, 0)) -> None:
         if hand_data is None:
             return
-        landmarks = hand_data.landmarks
-        connections = self.mp_hands.HAND_CONNECTIONS
-        for connection in connections:
-            start_idx, end_idx = connection
-            start_point = (int(landmarks[start_idx][0]), int(landmarks[start_idx][1]))
-            end_point = (int(landmarks[end_idx][0]), int(landmarks[end_idx][1]))
-            cv2.line(frame, start_point, end_point, color, 2)
-        for i, (x, y, z) in enumerate(landmarks):
-            radius = 8 if i in [4, 8, 12, 16, 20] else 5
-            cv2.circle(frame, (int(x), int(y)), radius, color, -1)
-            cv2.circle(frame, (int(x), int(y)), radius, (255, 255, 255), 1)
+        draw_hand_skeleton(frame, hand_data.landmarks, color)
     
     def get_fingertip_positions(self, hand_data: HandLandmarks) -> dict:
         landmarks = hand_data.landmarks
@@ -99,5 +300,41 @@ class HandTracker:
             "wrist": landmarks[self.WRIST]
         }
     
+    def get_roi_stats(self) -> Dict[str, float]:
+        return {
+            "frames": self.frames_processed,
+            "roi_frames": self.roi_frames,
+            "roi_fallbacks": self.roi_fallbacks,
+            "pixel_ratio": self.pixels_processed / self.full_frame_pixels if self.full_frame_pixels else 0.0,
+        }
+    
+    def get_prediction_stats(self) -> Dict[str, float]:
+        stats = self.predictor.get_stats() if self.predictor is not None else {}
+        if self.flow is not None:
+            points = self.flow.tracked + self.flow.lost
+            stats["flow_tracked"] = self.flow.tracked / points if points else 0.0
+        return stats
+    
+    def warm_up(self, width: int = 640, height: int = 480):
+        blank = np.zeros((height, width, 3), dtype=np.uint8)
+        self.hands.process(blank)
+        if self.roi_hands is not None:
+            self.roi_hands.process(blank)
+        self.reset()
+    
+    def reset(self):
+        self.hands.reset()
+        if self.roi_hands is not None:
+            self.roi_hands.reset()
+        self.smoother.reset()
+        self.prev_landmarks = None
+        self._roi_anchor = None
+        if self.predictor is not None:
+            self.predictor.reset()
+        if self.flow is not None:
+            self.flow.reset()
+    
     def release(self):
         self.hands.close()
+        if self.roi_hands is not None:
+            self.roi_hands.close()
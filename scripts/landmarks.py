@@ -0,0 +1,44 @@
+from typing import NamedTuple
+import numpy as np
+
+NUM_LANDMARKS = 21
+
+WRIST = 0
+THUMB_CMC = 1
+THUMB_MCP = 2
+THUMB_IP = 3
+THUMB_TIP = 4
+INDEX_MCP = 5
+INDEX_PIP = 6
+INDEX_DIP = 7
+INDEX_TIP = 8
+MIDDLE_MCP = 9
+MIDDLE_PIP = 10
+MIDDLE_DIP = 11
+MIDDLE_TIP = 12
+RING_MCP = 13
+RING_PIP = 14
+RING_DIP = 15
+RING_TIP = 16
+PINKY_MCP = 17
+PINKY_PIP = 18
+PINKY_DIP = 19
+PINKY_TIP = 20
+
+FINGERTIPS = np.array([THUMB_TIP, INDEX_TIP, MIDDLE_TIP, RING_TIP, PINKY_TIP])
+FINGER_PIPS = np.array([INDEX_PIP, MIDDLE_PIP, RING_PIP, PINKY_PIP])
+FINGER_MCPS = np.array([INDEX_MCP, MIDDLE_MCP, RING_MCP, PINKY_MCP])
+PALM_POINTS = np.array([WRIST, INDEX_MCP, MIDDLE_MCP, RING_MCP, PINKY_MCP])
+
+
+class HandLandmarks(NamedTuple):
+    landmarks: np.ndarray
+    handedness: str
+    confidence: float
+    timestamp: float = 0.0
+
+
+def landmarks_from_points(points, handedness: str = "Right", confidence: float = 1.0,
+                          timestamp: float = 0.0) -> HandLandmarks:
+    array = np.ascontiguousarray(points, dtype=np.float32).reshape(NUM_LANDMARKS, 3)
+    return HandLandmarks(landmarks=array, handedness=handedness, confidence=confidence, timestamp=timestamp)
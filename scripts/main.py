@@ -1,33 +1,107 @@
+import time
+STARTED_AT = time.perf_counter()
+
+import argparse
 import cv2
+import importlib
+import numpy as np
 import sys
-import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, List, NamedTuple, Optional, Sequence, Tuple
 
-from hand_tracker import HandTracker
+from hand_tracker import HandTracker, HandLandmarks
 from gesture_recognition import GestureRecognizer
-from media_controls import MediaController
+from gesture_rules import load_gesture_config
+from media_controls import BACKENDS, MediaController, create_backend
+from dispatcher import ActionDispatcher, DispatchRequest
+from event_server import EventServer
+from frame_bus import FrameBusPublisher
+from frame_sources import PACINGS, SOURCE_HELP, FrameSource, open_source
+from metrics import Metrics, MetricsExporter, StartupProfile
+from motion_gate import IdleGate
+from quality import QualityController
+from pipeline import FramePacket, FramePipeline
+from renderer import OverlayRenderer
+from recording import LandmarkRecorder
+from smoothing import SMOOTHERS
 from utils import GestureCooldown, FPSCounter
 
 __author__ = "Rachit"
 __version__ = "1.0.0"
 
 
+class FrameResult(NamedTuple):
+    packet: FramePacket
+    hand_data: Optional[HandLandmarks]
+    gesture: str
+    fps: float
+
+
 class GestureMediaPlayer:
-    def __init__(self, camera_id: int = 0, window_name: str = "Gesture Media Controller"):
+    def __init__(self, camera_id: int = 0, window_name: str = "Gesture Media Controller",
+                 pipelined: bool = False, smoothing: str = "one_euro",
+                 record_path: Optional[str] = None, roi_tracking: bool = False,
+                 idle_gating: bool = False, idle_fps: float = 2.0,
+                 media_backend: str = "pyautogui", headless: bool = False,
+                 metrics_path: Optional[str] = None, metrics_format: str = "json",
+                 metrics_interval: float = 5.0, show_timings: bool = False,
+                 gesture_config: Optional[str] = None, startup_profile: Optional[StartupProfile] = None,
+                 publish_bus: Optional[str] = None, reclaim_bus: bool = False, event_socket: Optional[str] = None,
+                 event_port: Optional[int] = None, event_landmark_fps: float = 15.0,
+                 latency_budget_ms: Optional[float] = None, inference_interval: int = 1,
+                 optical_flow: bool = False, source: Optional[str] = None, pacing: str = "realtime",
+                 max_frames: Optional[int] = None, offscreen: bool = False, metrics: Optional[Metrics] = None,
+                 on_gesture: Optional[Callable[[str, float, Optional[str]], None]] = None):
+        self.print_startup_profile = startup_profile is not None
+        self.startup = startup_profile if startup_profile is not None else StartupProfile()
         self.window_name = window_name
         self.camera_id = camera_id
-        self.hand_tracker = HandTracker(
+        self.source_spec = source if source is not None else str(camera_id)
+        self.pacing = pacing
+        self.max_frames = max_frames
+        self.source: Optional[FrameSource] = None
+        self.media_clock = False
+        self.pipelined = pipelined
+        self.headless = headless
+        self.show_window = not headless and not offscreen
+        self.record_path = record_path
+        self.show_timings = show_timings and not headless
+        self.metrics = metrics if metrics is not None else Metrics(enabled=bool(metrics_path or show_timings))
+        self.on_gesture = on_gesture
+        self.metrics_exporter = MetricsExporter(
+            self.metrics, metrics_path, metrics_format, metrics_interval) if metrics_path else None
+        self.timing_lines: List[str] = []
+        self.timing_refresh_time = 0.0
+        self.idle_gate = IdleGate(idle_inference_fps=idle_fps) if idle_gating else None
+        self.quality = QualityController(latency_budget_ms) if latency_budget_ms else None
+        self.recorder: Optional[LandmarkRecorder] = None
+        self.publish_bus = publish_bus
+        self.reclaim_bus = reclaim_bus
+        self.bus: Optional[FrameBusPublisher] = None
+        self.event_server: Optional[EventServer] = None
+        if event_socket is not None or event_port is not None:
+            self.event_server = EventServer(event_socket, port=event_port, landmark_fps=event_landmark_fps)
+        self.tracker_options = dict(
             max_hands=1,
             min_detection_confidence=0.7,
             min_tracking_confidence=0.6,
-            smoothing_window=5
+            smoothing=smoothing,
+            smoothing_window=5,
+            roi_tracking=roi_tracking,
+            mirror=True,
+            inference_interval=inference_interval,
+            optical_flow=optical_flow,
+            metrics=self.metrics
         )
-        self.gesture_recognizer = GestureRecognizer(
-            swipe_threshold=80,
-            pinch_threshold=40,
-            volume_y_threshold=0.03
-        )
-        self.media_controller = MediaController(verbose=True)
-        self.cooldown = GestureCooldown()
+        self.media_backend = media_backend
+        self.display_buffer: Optional[np.ndarray] = None
+        self.hand_tracker: Optional[HandTracker] = None
+        self.media_controller: Optional[MediaController] = None
+        self.dispatcher: Optional[ActionDispatcher] = None
+        with self.startup.phase("gesture config"):
+            self.gesture_config = load_gesture_config(gesture_config)
+            self.gesture_recognizer = GestureRecognizer(config=self.gesture_config)
+        self.cooldown = GestureCooldown(config=self.gesture_config)
         self.fps_counter = FPSCounter()
         self.current_gesture = "none"
         self.last_action = ""
@@ -42,14 +116,79 @@ class GestureMediaPlayer:
             "success": (0, 255, 0),
             "warning": (0, 255, 255),
         }
+        self.renderer = OverlayRenderer(self.colors, "Gesture Media Controller", "Press 'Q' to quit")
+    
+    def _load_tracker(self) -> HandTracker:
+        with self.startup.phase("import mediapipe"):
+            importlib.import_module("mediapipe")
+        with self.startup.phase("hand model"):
+            tracker = HandTracker(**self.tracker_options)
+        with self.startup.phase("model warm-up"):
+            tracker.warm_up()
+        return tracker
+    
+    def _load_controller(self) -> MediaController:
+        with self.startup.phase("media backend"):
+            backend = create_backend(self.media_backend)
+        return MediaController(verbose=True, backend=backend, config=self.gesture_config)
+    
+    def _draw_warming_up(self, frame, pending: Sequence[str]):
+        h, w = frame.shape[:2]
+        self.renderer.draw_top_band(frame)
+        dots = "." * (int(time.monotonic() * 3) % 4)
+        text = f"Warming up{dots}"
+        text_size = cv2.getTextSize("Warming up...", cv2.FONT_HERSHEY_SIMPLEX, 1.2, 3)[0]
+        cv2.putText(frame, text, ((w - text_size[0]) // 2, h // 2),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1.2, self.colors["warning"], 3)
+        if pending:
+            detail = f"Loading {', '.join(pending)}"
+            detail_size = cv2.getTextSize(detail, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 1)[0]
+            cv2.putText(frame, detail, ((w - detail_size[0]) // 2, h // 2 + 40),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, self.colors["text"], 1)
+        self.renderer.draw_footer(frame)
+    
+    def _warm_up(self, source: FrameSource, loading: Sequence[Tuple[str, Future]]) -> bool:
+        first_frame = True
+        while True:
+            pending = [name for name, future in loading if not future.done()]
+            if not pending:
+                break
+            ret, frame = source.read() if source.live else (False, None)
+            if ret and first_frame:
+                self.startup.mark("first camera frame")
+                first_frame = False
+            if not self.show_window or not ret:
+                if not ret:
+                    wait([future for _, future in loading], timeout=0.1)
+                if not self.show_window:
+                    continue
+                frame = np.zeros((480, 640, 3), dtype=np.uint8)
+            else:
+                frame = self._mirrored(frame)
+            self._draw_warming_up(frame, pending)
+            cv2.imshow(self.window_name, frame)
+            key = cv2.waitKey(1) & 0xFF
+            if key == ord('q') or key == ord('Q'):
+                return False
+        self.hand_tracker = loading[0][1].result()
+        self.media_controller = loading[1][1].result()
+        self.dispatcher = ActionDispatcher(self.media_controller, on_dispatch=self._on_dispatch)
+        self.startup.mark("ready")
+        return True
+    
+    def _abandon_loading(self, loading: Sequence[Tuple[str, Future]]):
+        # Quitting before warm-up finished leaves the loaders running; let them finish so the tracker
+        # they build is released instead of leaking its graph.
+        for _, future in loading:
+            future.cancel()
+        wait([future for _, future in loading])
+        tracker = loading[0][1]
+        if not tracker.cancelled() and tracker.exception() is None:
+            tracker.result().release()
     
     def _draw_ui(self, frame, fps: float, hand_detected: bool):
         h, w = frame.shape[:2]
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (0, 0), (w, 70), self.colors["background"], -1)
-        cv2.addWeighted(overlay, 0.7, frame, 0.3, 0, frame)
-        cv2.putText(frame, "Gesture Media Controller", (10, 30),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.8, self.colors["text"], 2)
+        self.renderer.draw_top_band(frame)
         fps_color = self.colors["success"] if fps >= 20 else self.colors["warning"]
         cv2.putText(frame, f"FPS: {fps:.1f}", (w - 120, 30),
                     cv2.FONT_HERSHEY_SIMPLEX, 0.7, fps_color, 2)
@@ -57,16 +196,23 @@ class GestureMediaPlayer:
         status_color = self.colors["success"] if hand_detected else self.colors["warning"]
         cv2.putText(frame, status_text, (10, 55),
                     cv2.FONT_HERSHEY_SIMPLEX, 0.6, status_color, 2)
+        if self.idle_gate is not None:
+            cpu_load = self.idle_gate.update_cpu_load()
+            if self.idle_gate.state == IdleGate.IDLE:
+                idle_text = f"Idle -{self.idle_gate.estimated_savings:.0%} | CPU {cpu_load:.0%}"
+            else:
+                idle_text = f"Active | CPU {cpu_load:.0%}"
+            cv2.putText(frame, idle_text, (170, 55),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, self.colors["secondary"], 1)
         media_status = self.media_controller.get_status()
         cv2.putText(frame, media_status, (w - 200, 55),
                     cv2.FONT_HERSHEY_SIMPLEX, 0.6, self.colors["secondary"], 2)
         if self.current_gesture != "none":
             gesture_name = self.gesture_recognizer.get_gesture_name(self.current_gesture)
-            cv2.rectangle(overlay, (0, h - 60), (w, h), self.colors["background"], -1)
-            cv2.addWeighted(overlay, 0.7, frame, 0.3, 0, frame)
+            self.renderer.draw_bottom_band(frame)
             cv2.putText(frame, f"Gesture: {gesture_name}", (10, h - 25),
                         cv2.FONT_HERSHEY_SIMPLEX, 0.8, self.colors["accent"], 2)
-        current_time = time.time()
+        current_time = time.monotonic()
         if self.last_action and (current_time - self.action_display_time) < self.action_display_duration:
             elapsed = current_time - self.action_display_time
             alpha = 1.0 - (elapsed / self.action_display_duration)
@@ -81,71 +227,365 @@ class GestureMediaPlayer:
             color = tuple(int(c * alpha) for c in self.colors["primary"])
             cv2.putText(frame, self.last_action, (text_x, text_y),
                         cv2.FONT_HERSHEY_SIMPLEX, 1.2, color, 3)
-        cv2.putText(frame, "Press 'Q' to quit", (w - 180, h - 10),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, self.colors["text"], 1)
+        if self.show_timings:
+            self._draw_timings(frame)
+        self.renderer.draw_footer(frame)
+    
+    def _draw_timings(self, frame):
+        now = time.monotonic()
+        if now - self.timing_refresh_time >= 0.5:
+            self.timing_refresh_time = now
+            self.timing_lines = [
+                f"{name:<14}{summary['p50_ms']:6.1f}{summary['p95_ms']:6.1f}{summary['p99_ms']:6.1f}"
+                for name, summary in self.metrics.snapshot().items()
+            ]
+        y = 95
+        cv2.putText(frame, "stage          p50   p95   p99 (ms)", (10, y),
+                    cv2.FONT_HERSHEY_PLAIN, 1.0, self.colors["text"], 1)
+        for line in self.timing_lines:
+            y += 16
+            cv2.putText(frame, line, (10, y), cv2.FONT_HERSHEY_PLAIN, 1.0, self.colors["secondary"], 1)
+    
+    def _on_dispatch(self, request: DispatchRequest, done: float):
+        self.metrics.observe("dispatch_queue", done - request.submitted_at)
+        if request.captured_at is not None:
+            self.metrics.observe("end_to_end", done - request.captured_at)
+    
+    def _print_timings(self):
+        if self.metrics_exporter is not None:
+            self.metrics_exporter.export()
+        print("Stage timings (ms):    p50     p95     p99   count")
+        for name, summary in self.metrics.snapshot().items():
+            print(f"  {name:<16}{summary['p50_ms']:8.2f}{summary['p95_ms']:8.2f}{summary['p99_ms']:8.2f}"
+                  f"{summary['count']:8d}")
     
     def _show_action(self, action: str):
         self.last_action = action
-        self.action_display_time = time.time()
+        self.action_display_time = time.monotonic()
+    
+    def _process_frame(self, frame, captured_at: Optional[float] = None) -> Tuple[Optional[HandLandmarks], str]:
+        timestamp = time.monotonic() if captured_at is None else captured_at
+        if self.idle_gate is not None and not self.idle_gate.should_infer(frame, timestamp):
+            hand_data = None
+        else:
+            start = time.perf_counter()
+            hand_data = self.hand_tracker.process_frame(frame, timestamp)
+            elapsed = time.perf_counter() - start
+            if self.idle_gate is not None:
+                self.idle_gate.report(hand_data is not None, timestamp, elapsed)
+            if self.quality is not None:
+                level = self.quality.observe(elapsed, timestamp)
+                if level is not None:
+                    self.hand_tracker.configure(
+                        model_complexity=level.model_complexity,
+                        inference_scale=level.inference_scale,
+                        smoothing_window=level.smoothing_window,
+                        min_detection_confidence=level.min_detection_confidence,
+                        min_tracking_confidence=level.min_tracking_confidence
+                    )
+                    print(f"[Quality] switched to {level.describe()}")
+        if self.recorder is not None:
+            self.recorder.write(hand_data, timestamp)
+        if self.publish_bus is not None:
+            with self.metrics.stage("publish"):
+                if self.bus is None:
+                    self.bus = FrameBusPublisher(self.publish_bus, frame.shape, mirrored=True,
+                                                 reclaim=self.reclaim_bus)
+                self.bus.publish(frame, hand_data, timestamp)
+        if self.event_server is not None:
+            self.event_server.publish_landmarks(hand_data, timestamp)
+        with self.metrics.stage("recognition"):
+            gesture = self.gesture_recognizer.recognize(hand_data)
+        self.current_gesture = gesture
+        if gesture != GestureRecognizer.NONE:
+            if self.cooldown.can_trigger(gesture, now=timestamp):
+                with self.metrics.stage("dispatch"):
+                    submitted = self.dispatcher.submit(gesture, captured_at=None if self.media_clock else timestamp)
+                notify = self.event_server is not None or self.on_gesture is not None
+                if submitted or notify:
+                    self.cooldown.trigger(gesture, now=timestamp)
+                    action_name = self.gesture_recognizer.get_gesture_name(gesture)
+                    if submitted:
+                        self._show_action(action_name)
+                    if notify:
+                        action = self.media_controller.action_for(gesture) if submitted else None
+                        if self.event_server is not None:
+                            self.event_server.publish_gesture(gesture, timestamp, action, action_name)
+                        if self.on_gesture is not None:
+                            self.on_gesture(gesture, timestamp, action)
+        return hand_data, gesture
+    
+    def _mirrored(self, frame):
+        if self.display_buffer is None or self.display_buffer.shape != frame.shape:
+            self.display_buffer = np.empty_like(frame)
+        cv2.flip(frame, 1, dst=self.display_buffer)
+        return self.display_buffer
+    
+    def _render_frame(self, frame, fps: float, hand_data: Optional[HandLandmarks]):
+        if self.headless:
+            return
+        with self.metrics.stage("flip"):
+            frame = self._mirrored(frame)
+        with self.metrics.stage("draw"):
+            if hand_data:
+                self.hand_tracker.draw_landmarks(frame, hand_data, self.colors["primary"])
+            self._draw_ui(frame, fps, hand_data is not None)
+        if self.show_window:
+            with self.metrics.stage("display"):
+                cv2.imshow(self.window_name, frame)
+    
+    def _quit_requested(self) -> bool:
+        if self.metrics_exporter is not None:
+            self.metrics_exporter.maybe_export()
+        if not self.show_window:
+            return False
+        with self.metrics.stage("wait_key"):
+            key = cv2.waitKey(1) & 0xFF
+        return key == ord('q') or key == ord('Q')
+    
+    def _read_frame(self, source: FrameSource, buffer=None):
+        with self.metrics.stage("capture"):
+            ret, frame = source.read(buffer)
+        if not ret:
+            if source.live:
+                print("Error: Failed to capture frame")
+            else:
+                print(f"\nEnd of {source.describe()}")
+            return None
+        return frame
+    
+    def _run_serial(self, source: FrameSource):
+        frame = None
+        while True:
+            frame = self._read_frame(source, frame)
+            if frame is None:
+                break
+            started = time.monotonic()
+            fps = self.fps_counter.update()
+            hand_data, _ = self._process_frame(frame, source.timestamp)
+            self._render_frame(frame, fps, hand_data)
+            self.metrics.observe("frame", time.monotonic() - started)
+            if self._quit_requested():
+                print("\nExiting...")
+                break
+    
+    def _run_pipelined(self, source: FrameSource):
+        def capture():
+            return self._read_frame(source)
+        
+        def infer(packet: FramePacket) -> FrameResult:
+            fps = self.fps_counter.update()
+            hand_data, gesture = self._process_frame(packet.frame, packet.timestamp)
+            return FrameResult(packet, hand_data, gesture, fps)
+        
+        pipeline = FramePipeline(capture, infer)
+        pipeline.start()
+        try:
+            while True:
+                # Read the closed flag first: a result published just before the buffer closes is still drained.
+                finished = not pipeline.running
+                result = pipeline.get_result(timeout=0.1)
+                if result is not None:
+                    self._render_frame(result.packet.frame, result.fps, result.hand_data)
+                    self.metrics.observe("frame", time.monotonic() - result.packet.timestamp)
+                elif finished:
+                    break
+                if self._quit_requested():
+                    print("\nExiting...")
+                    break
+        finally:
+            pipeline.stop()
+            stats = pipeline.get_stats()
+            print(f"Pipeline: captured {stats['captured']}, inferred {stats['inferred']}, "
+                  f"displayed {stats['displayed']}")
+            print(f"Dropped frames: inference {stats['inference_dropped']}, "
+                  f"display {stats['display_dropped']}")
+        if pipeline.error is not None:
+            raise pipeline.error
     
     def run(self):
         print("\n" + "="*50)
         print("  Gesture Media Controller")
         print(f"  Developed by {__author__}")
         print("="*50)
-        print("\nInitializing webcam...")
-        cap = cv2.VideoCapture(self.camera_id)
-        if not cap.isOpened():
-            print("Error: Could not open webcam")
-            print("Please check if your webcam is connected and not in use by another application.")
+        loader = ThreadPoolExecutor(max_workers=2, thread_name_prefix="startup")
+        loading = [("hand model", loader.submit(self._load_tracker)),
+                   ("media keys", loader.submit(self._load_controller))]
+        loader.shutdown(wait=False)
+        if self.show_window:
+            with self.startup.phase("preview window"):
+                placeholder = np.zeros((480, 640, 3), dtype=np.uint8)
+                self._draw_warming_up(placeholder, [name for name, _ in loading])
+                cv2.imshow(self.window_name, placeholder)
+                cv2.waitKey(1)
+        print("\nInitializing webcam..." if self.source_spec.isdigit() else f"\nOpening {self.source_spec}...")
+        with self.startup.phase("source open"):
+            source = open_source(self.source_spec, self.pacing, self.max_frames)
+        if not source.is_open():
+            if source.live:
+                print("Error: Could not open webcam")
+                print("Please check if your webcam is connected and not in use by another application.")
+            else:
+                print(f"Error: Could not open {self.source_spec}")
+            self._abandon_loading(loading)
             sys.exit(1)
-        cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-        cap.set(cv2.CAP_PROP_FPS, 30)
-        print("Webcam initialized successfully!")
+        self.source = source
+        self.media_clock = not self.pipelined and not source.realtime
+        frame_size = source.frame_size
+        if source.live:
+            print("Webcam initialized successfully!")
+        else:
+            print(f"Reading {source.describe()} ({frame_size[0]}x{frame_size[1]}, {self.pacing} pacing)")
+        if frame_size[1] > 0:
+            self.gesture_recognizer.set_frame_size(frame_size)
+        if self.record_path:
+            self.recorder = LandmarkRecorder(self.record_path, frame_size)
+            print(f"Recording landmarks to {self.record_path}")
+        if self.event_server is not None:
+            self.event_server.start()
         print("\nGesture Controls:")
-        print("  - Pinch (Thumb + Index) -> Play/Pause")
-        print("  - Swipe Right -> Next Track")
-        print("  - Swipe Left -> Previous Track")
-        print("  - 3 Fingers (Thumb+Index+Middle) + Move Up -> Volume Up")
-        print("  - 3 Fingers (Thumb+Index+Middle) + Move Down -> Volume Down")
-        print("  - Fist -> Mute")
-        print("  - Open Palm -> Resume/Unmute")
-        print("\nPress 'Q' to quit\n")
+        for gesture in self.gesture_recognizer.rules.gestures():
+            print(f"  - {self.gesture_recognizer.get_gesture_name(gesture)}")
+        print("\nPress Ctrl+C to quit\n" if self.headless else "\nPress 'Q' to quit\n")
         try:
-            while True:
-                ret, frame = cap.read()
-                if not ret:
-                    print("Error: Failed to capture frame")
-                    break
-                frame = cv2.flip(frame, 1)
-                fps = self.fps_counter.update()
-                hand_data = self.hand_tracker.process_frame(frame)
-                if hand_data:
-                    self.hand_tracker.draw_landmarks(frame, hand_data, self.colors["primary"])
-                gesture = self.gesture_recognizer.recognize(hand_data)
-                self.current_gesture = gesture
-                if gesture != GestureRecognizer.NONE:
-                    if self.cooldown.can_trigger(gesture):
-                        if self.media_controller.execute_gesture(gesture):
-                            self.cooldown.trigger(gesture)
-                            action_name = self.gesture_recognizer.get_gesture_name(gesture)
-                            self._show_action(action_name)
-                self._draw_ui(frame, fps, hand_data is not None)
-                cv2.imshow(self.window_name, frame)
-                key = cv2.waitKey(1) & 0xFF
-                if key == ord('q') or key == ord('Q'):
-                    print("\nExiting...")
-                    break
+            if not self._warm_up(source, loading):
+                print("\nExiting...")
+                return
+            if self.print_startup_profile:
+                print(self.startup.report())
+            if self.pipelined:
+                self._run_pipelined(source)
+            else:
+                self._run_serial(source)
+        except KeyboardInterrupt:
+            print("\nExiting...")
         finally:
-            cap.release()
-            cv2.destroyAllWindows()
-            self.hand_tracker.release()
+            source.release()
+            if not source.live:
+                stats = source.get_stats()
+                print(f"Read {stats['frames']} frames in {stats['seconds']:.2f}s ({stats['fps']:.1f} fps)")
+            if self.show_window:
+                cv2.destroyAllWindows()
+            if self.idle_gate is not None:
+                stats = self.idle_gate.get_stats()
+                print(f"Idle gating: skipped {stats['skipped']}/{stats['frames']} inferences "
+                      f"(~{stats['inference_saved']:.0%} of inference time saved)")
+            if self.hand_tracker is not None:
+                if self.hand_tracker.roi_tracking:
+                    stats = self.hand_tracker.get_roi_stats()
+                    print(f"ROI tracking: {stats['roi_frames']}/{stats['frames']} frames cropped, "
+                          f"{stats['roi_fallbacks']} fallbacks, {stats['pixel_ratio']:.0%} of full-frame pixels")
+                if self.hand_tracker.predictor is not None:
+                    stats = self.hand_tracker.get_prediction_stats()
+                    flow = stats.get("flow_tracked")
+                    print(f"Inference decimation: model ran on {stats['inferences']}/{stats['frames']} tracked "
+                          f"frames ({stats['forced']} forced early), prediction error mean {stats['error_mean']:.2%} "
+                          f"/ p95 {stats['error_p95']:.2%} of frame height"
+                          + (f", optical flow kept {flow:.0%} of points" if flow is not None else ""))
+                self.hand_tracker.release()
+            else:
+                self._abandon_loading(loading)
+            if self.dispatcher is not None:
+                self.dispatcher.close()
+                stats = self.dispatcher.get_stats()
+                print(f"Dispatcher: {stats['dispatched']} actions for {stats['submitted']} gestures "
+                      f"({stats['coalesced']} coalesced, {stats['dropped']} dropped), "
+                      f"latency avg {stats['latency_avg_ms']:.1f} ms / max {stats['latency_max_ms']:.1f} ms")
+            if self.metrics.enabled:
+                self._print_timings()
+            if self.quality is not None:
+                print(self.quality.report())
+            if self.recorder is not None:
+                self.recorder.close()
+                print(f"Recorded {self.recorder.frames_written} frames to {self.record_path}")
+            if self.bus is not None:
+                print(f"Published {self.bus.sequence + 1} frames to frame bus '{self.publish_bus}'")
+                self.bus.close()
+            if self.event_server is not None:
+                self.event_server.close()
+                print(self.event_server.report())
             print("Goodbye!")
 
 
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Control media playback with hand gestures.")
+    parser.add_argument("--camera", type=int, default=0, help="Webcam index (default: 0)")
+    parser.add_argument("--source", metavar="SPEC",
+                        help=f"Frame source instead of the webcam: {SOURCE_HELP}")
+    parser.add_argument("--pacing", choices=PACINGS, default="realtime",
+                        help="Play file and synthetic sources at their frame rate (realtime, default) "
+                             "or as fast as the pipeline runs (fast)")
+    parser.add_argument("--pipelined", action="store_true",
+                        help="Run capture, inference and display on separate threads")
+    parser.add_argument("--smoothing", choices=sorted(SMOOTHERS), default="one_euro",
+                        help="Landmark smoothing filter (default: one_euro)")
+    parser.add_argument("--roi-tracking", action="store_true",
+                        help="Run inference on a crop around the tracked hand instead of the full frame")
+    parser.add_argument("--idle-gating", action="store_true",
+                        help="Skip hand inference while the scene is static and no hand is visible")
+    parser.add_argument("--idle-fps", type=float, default=2.0,
+                        help="Inference rate while idle (default: 2)")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="pyautogui",
+                        help="Media key backend (default: pyautogui)")
+    parser.add_argument("--headless", action="store_true",
+                        help="Skip all rendering and the preview window (quit with Ctrl+C)")
+    parser.add_argument("--metrics-file", metavar="PATH",
+                        help="Periodically export per-stage latency percentiles to PATH")
+    parser.add_argument("--metrics-format", choices=MetricsExporter.FORMATS, default="json",
+                        help="Metrics export format (default: json)")
+    parser.add_argument("--metrics-interval", type=float, default=5.0,
+                        help="Seconds between metrics exports (default: 5)")
+    parser.add_argument("--show-timings", action="store_true",
+                        help="Show the per-stage latency breakdown in the overlay")
+    parser.add_argument("--record", metavar="PATH",
+                        help="Record per-frame hand landmarks to PATH for offline replay")
+    parser.add_argument("--gestures", metavar="PATH",
+                        help="Gesture rule and binding config (default: gestures.json next to this script)")
+    parser.add_argument("--inference-interval", type=int, default=1, metavar="N",
+                        help="While a hand is tracked, run the hand model every Nth frame and predict "
+                             "landmarks in between (default: 1, every frame)")
+    parser.add_argument("--optical-flow", action="store_true",
+                        help="Refine predicted landmarks with sparse optical flow on the wrist and fingertips")
+    parser.add_argument("--latency-budget", type=float, metavar="MS",
+                        help="Adapt model complexity, inference resolution, smoothing and confidence "
+                             "thresholds to keep hand tracking under MS per frame")
+    parser.add_argument("--publish-bus", metavar="NAME",
+                        help="Publish frames and landmarks to the shared-memory frame bus NAME")
+    parser.add_argument("--reclaim-bus", action="store_true",
+                        help="Take over an existing --publish-bus segment left behind by a publisher that died")
+    events = parser.add_mutually_exclusive_group()
+    events.add_argument("--event-socket", metavar="PATH",
+                        help="Stream gesture events and landmarks to subscribers on the Unix socket PATH")
+    events.add_argument("--event-port", type=int, metavar="PORT",
+                        help="Stream gesture events and landmarks to subscribers on localhost:PORT")
+    parser.add_argument("--event-landmark-fps", type=float, default=15.0,
+                        help="Maximum landmark update rate sent to subscribers (default: 15)")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="Print a timing breakdown of startup once the app is ready")
+    return parser.parse_args(argv)
+
+
 def main():
-    app = GestureMediaPlayer(camera_id=0)
+    imported_at = time.perf_counter()
+    args = parse_args()
+    startup = None
+    if args.startup_profile:
+        startup = StartupProfile(origin=STARTED_AT)
+        startup.record("imports", STARTED_AT, imported_at)
+    app = GestureMediaPlayer(camera_id=args.camera, source=args.source, pacing=args.pacing,
+                             pipelined=args.pipelined,
+                             smoothing=args.smoothing, record_path=args.record,
+                             roi_tracking=args.roi_tracking, idle_gating=args.idle_gating,
+                             idle_fps=args.idle_fps, media_backend=args.backend,
+                             headless=args.headless, metrics_path=args.metrics_file,
+                             metrics_format=args.metrics_format, metrics_interval=args.metrics_interval,
+                             show_timings=args.show_timings, gesture_config=args.gestures,
+                             startup_profile=startup, publish_bus=args.publish_bus,
+                             reclaim_bus=args.reclaim_bus,
+                             event_socket=args.event_socket, event_port=args.event_port,
+                             event_landmark_fps=args.event_landmark_fps,
+                             latency_budget_ms=args.latency_budget,
+                             inference_interval=args.inference_interval, optical_flow=args.optical_flow)
     app.run()
 
 
@@ -1,72 +1,153 @@
 import os
-if os.getenv("DISPLAY"):
-    import pyautogui
-else:
-    pyautogui = None
+import time
+from typing import Callable, Dict, List, Optional, Tuple
 
-from typing import Callable, Dict
+from gesture_rules import GestureConfig, load_gesture_config
+
+
+class KeyBackend:
+    def press(self, key: str, presses: int = 1):
+        raise NotImplementedError
+
+
+class PyAutoGUIBackend(KeyBackend):
+    def __init__(self, pause: float = 0.05, interval: float = 0.0):
+        if not os.getenv("DISPLAY"):
+            raise RuntimeError("pyautogui is unavailable (no display found)")
+        import pyautogui
+        pyautogui.FAILSAFE = True
+        pyautogui.PAUSE = pause
+        self.pyautogui = pyautogui
+        self.interval = interval
+    
+    def press(self, key: str, presses: int = 1):
+        self.pyautogui.press(key, presses=presses, interval=self.interval)
+
+
+class NullBackend(KeyBackend):
+    def press(self, key: str, presses: int = 1):
+        pass
+
+
+class RecordingBackend(KeyBackend):
+    def __init__(self):
+        self.presses: List[Tuple[float, str, int]] = []
+    
+    def press(self, key: str, presses: int = 1):
+        self.presses.append((time.monotonic(), key, presses))
+
+
+class FakeMediaBackend(KeyBackend):
+    def __init__(self, volume: int = 50, latency: float = 0.0):
+        self.volume = volume
+        self.muted = False
+        self.playing = True
+        self.track = 0
+        self.latency = latency
+    
+    def press(self, key: str, presses: int = 1):
+        if self.latency:
+            time.sleep(self.latency * presses)
+        for _ in range(presses):
+            if key == 'playpause':
+                self.playing = not self.playing
+            elif key == 'nexttrack':
+                self.track += 1
+            elif key == 'prevtrack':
+                self.track -= 1
+            elif key == 'volumeup':
+                self.volume = min(100, self.volume + 1)
+            elif key == 'volumedown':
+                self.volume = max(0, self.volume - 1)
+            elif key == 'volumemute':
+                self.muted = not self.muted
+
+
+BACKENDS: Dict[str, Callable[[], KeyBackend]] = {
+    "pyautogui": PyAutoGUIBackend,
+    "fake": FakeMediaBackend,
+    "record": RecordingBackend,
+    "null": NullBackend,
+}
+
+
+def create_backend(name: str) -> KeyBackend:
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown media backend '{name}', expected one of {', '.join(BACKENDS)}")
+    return BACKENDS[name]()
 
 
 class MediaController:
-    def __init__(self, verbose: bool = True):
+    ACTIONS = ("play_pause", "next_track", "previous_track", "volume_up", "volume_down", "mute", "unmute")
+    
+    def __init__(self, verbose: bool = True, backend: Optional[KeyBackend] = None,
+                 config: Optional[GestureConfig] = None):
         self.verbose = verbose
         self.is_muted = False
         self.is_playing = True
-        pyautogui.FAILSAFE = True
-        pyautogui.PAUSE = 0.05
+        self.backend = backend if backend is not None else PyAutoGUIBackend()
+        config = config or load_gesture_config()
+        self.gesture_bindings: Dict[str, str] = {}
+        for gesture, binding in config.bindings.items():
+            if binding.action is None:
+                continue
+            if binding.action not in self.ACTIONS:
+                raise ValueError(f"Unknown media action '{binding.action}' for gesture '{gesture}', "
+                                 f"expected one of {', '.join(self.ACTIONS)}")
+            self.gesture_bindings[gesture] = binding.action
         self.gesture_actions: Dict[str, Callable] = {
-            "swipe_right": self.next_track,
-            "swipe_left": self.previous_track,
-            "pinch": self.play_pause,
-            "volume_up": self.volume_up,
-            "volume_down": self.volume_down,
-            "fist": self.mute,
-            "open_palm": self.unmute,
+            gesture: getattr(self, action) for gesture, action in self.gesture_bindings.items()
         }
     
     def _log(self, message: str):
         if self.verbose:
             print(f"[Media Control] {message}")
     
-    def play_pause(self):
-        pyautogui.press('playpause')
+    def play_pause(self, count: int = 1):
+        if count % 2 == 0:
+            return
+        self.backend.press('playpause')
         self.is_playing = not self.is_playing
         status = "Playing" if self.is_playing else "Paused"
         self._log(f"Play/Pause toggled - {status}")
     
-    def next_track(self):
-        pyautogui.press('nexttrack')
-        self._log("Next track")
+    def next_track(self, count: int = 1):
+        self.backend.press('nexttrack', presses=count)
+        self._log("Next track" if count == 1 else f"Next track (x{count})")
     
-    def previous_track(self):
-        pyautogui.press('prevtrack')
-        self._log("Previous track")
+    def previous_track(self, count: int = 1):
+        self.backend.press('prevtrack', presses=count)
+        self._log("Previous track" if count == 1 else f"Previous track (x{count})")
     
-    def volume_up(self, steps: int = 2):
-        for _ in range(steps):
-            pyautogui.press('volumeup')
-        self._log(f"Volume up (+{steps})")
+    def volume_up(self, count: int = 1, steps: int = 2):
+        self.backend.press('volumeup', presses=steps * count)
+        self._log(f"Volume up (+{steps * count})")
     
-    def volume_down(self, steps: int = 2):
-        for _ in range(steps):
-            pyautogui.press('volumedown')
-        self._log(f"Volume down (-{steps})")
+    def volume_down(self, count: int = 1, steps: int = 2):
+        self.backend.press('volumedown', presses=steps * count)
+        self._log(f"Volume down (-{steps * count})")
     
-    def mute(self):
+    def mute(self, count: int = 1):
         if not self.is_muted:
-            pyautogui.press('volumemute')
+            self.backend.press('volumemute')
             self.is_muted = True
             self._log("Muted")
     
-    def unmute(self):
+    def unmute(self, count: int = 1):
         if self.is_muted:
-            pyautogui.press('volumemute')
+            self.backend.press('volumemute')
             self.is_muted = False
             self._log("Unmuted")
     
-    def execute_gesture(self, gesture: str) -> bool:
+    def supports(self, gesture: str) -> bool:
+        return gesture in self.gesture_actions
+    
+    def action_for(self, gesture: str) -> Optional[str]:
+        return self.gesture_bindings.get(gesture)
+    
+    def execute_gesture(self, gesture: str, count: int = 1) -> bool:
         if gesture in self.gesture_actions:
-            self.gesture_actions[gesture]()
+            self.gesture_actions[gesture](count)
             return True
         return False
     
@@ -0,0 +1,188 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, NamedTuple, Optional
+import numpy as np
+
+PERCENTILES = (50, 95, 99)
+
+
+class LatencyHistogram:
+    def __init__(self, window: int = 1024):
+        self._samples = np.zeros(window, dtype=np.float64)
+        self._index = 0
+        self._filled = 0
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float):
+        self._samples[self._index] = seconds
+        self._index = (self._index + 1) % len(self._samples)
+        if self._filled < len(self._samples):
+            self._filled += 1
+        self.count += 1
+        self.total += seconds
+
+    def percentiles(self, percentiles: Iterable[float] = PERCENTILES) -> Dict[str, float]:
+        percentiles = list(percentiles)
+        if not self._filled:
+            return {f"p{p:g}": 0.0 for p in percentiles}
+        values = np.percentile(self._samples[:self._filled], percentiles)
+        return {f"p{p:g}": float(v) for p, v in zip(percentiles, values)}
+
+    def summary(self) -> Dict[str, float]:
+        window = self._samples[:self._filled]
+        summary = {
+            "count": self.count,
+            "mean_ms": float(window.mean() * 1000) if self._filled else 0.0,
+        }
+        for name, value in self.percentiles().items():
+            summary[f"{name}_ms"] = value * 1000
+        return summary
+
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class _StageTimer:
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram: LatencyHistogram):
+        self.histogram = histogram
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.start)
+        return False
+
+
+NULL_TIMER = _NullTimer()
+
+
+class Metrics:
+    def __init__(self, enabled: bool = True, window: int = 1024):
+        self.enabled = enabled
+        self.window = window
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self._timers: Dict[str, _StageTimer] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(name, LatencyHistogram(self.window))
+        return histogram
+
+    def stage(self, name: str):
+        if not self.enabled:
+            return NULL_TIMER
+        timer = self._timers.get(name)
+        if timer is None:
+            timer = self._timers.setdefault(name, _StageTimer(self.histogram(name)))
+        return timer
+
+    def observe(self, name: str, seconds: float):
+        if self.enabled:
+            self.histogram(name).observe(seconds)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        return {name: histogram.summary() for name, histogram in list(self.histograms.items())}
+
+    def to_prometheus(self, prefix: str = "gesture_stage_latency_seconds") -> str:
+        lines = [f"# TYPE {prefix} summary"]
+        for name, histogram in list(self.histograms.items()):
+            for label, value in histogram.percentiles().items():
+                quantile = int(label[1:]) / 100
+                lines.append(f'{prefix}{{stage="{name}",quantile="{quantile:g}"}} {value:.6f}')
+            lines.append(f'{prefix}_sum{{stage="{name}"}} {histogram.total:.6f}')
+            lines.append(f'{prefix}_count{{stage="{name}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+
+NULL_METRICS = Metrics(enabled=False)
+
+
+class MetricsExporter:
+    FORMATS = ("json", "prometheus")
+
+    def __init__(self, metrics: Metrics, path: str, format: str = "json", interval: float = 5.0):
+        if format not in self.FORMATS:
+            raise ValueError(f"Unknown metrics format '{format}', expected one of {', '.join(self.FORMATS)}")
+        self.metrics = metrics
+        self.path = path
+        self.format = format
+        self.interval = interval
+        self._last_export = time.monotonic()
+
+    def export(self):
+        if self.format == "json":
+            content = json.dumps({"timestamp": time.time(), "stages": self.metrics.snapshot()}, indent=2)
+        else:
+            content = self.metrics.to_prometheus()
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as f:
+            f.write(content)
+        os.replace(temp_path, self.path)
+
+    def maybe_export(self, now: Optional[float] = None):
+        now = time.monotonic() if now is None else now
+        if now - self._last_export >= self.interval:
+            self._last_export = now
+            self.export()
+
+
+class StartupPhase(NamedTuple):
+    name: str
+    thread: str
+    start: float
+    end: float
+
+
+class StartupProfile:
+    def __init__(self, origin: Optional[float] = None):
+        self.origin = time.perf_counter() if origin is None else origin
+        self.phases: List[StartupPhase] = []
+        self._lock = threading.Lock()
+
+    def record(self, name: str, start: float, end: Optional[float] = None):
+        end = time.perf_counter() if end is None else end
+        phase = StartupPhase(name, threading.current_thread().name, start - self.origin, end - self.origin)
+        with self._lock:
+            self.phases.append(phase)
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start)
+
+    def mark(self, name: str):
+        now = time.perf_counter()
+        self.record(name, now, now)
+
+    def report(self) -> str:
+        phases = sorted(self.phases, key=lambda phase: phase.start)
+        lines = ["Startup profile (ms):       start    took  thread"]
+        for phase in phases:
+            took = f"{(phase.end - phase.start) * 1000:8.1f}" if phase.end > phase.start else f"{'-':>8}"
+            lines.append(f"  {phase.name:<24}{phase.start * 1000:8.1f}{took}  {phase.thread}")
+        ready = max((phase.end for phase in phases), default=0.0)
+        work = sum(phase.end - phase.start for phase in phases)
+        if ready > 0:
+            lines.append(f"  ready after {ready * 1000:.0f} ms, {work * 1000:.0f} ms of work "
+                         f"({work / ready:.1f}x parallelism)")
+        return "\n".join(lines)
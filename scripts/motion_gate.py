@@ -0,0 +1,92 @@
+import time
+from typing import Dict, Optional, Tuple
+import cv2
+import numpy as np
+
+
+class IdleGate:
+    ACTIVE = "active"
+    IDLE = "idle"
+
+    def __init__(self,
+                 idle_timeout: float = 3.0,
+                 idle_inference_fps: float = 2.0,
+                 motion_threshold: int = 12,
+                 motion_fraction: float = 0.01,
+                 downsample_size: Tuple[int, int] = (80, 60)):
+        self.idle_timeout = idle_timeout
+        self.idle_interval = 1.0 / idle_inference_fps if idle_inference_fps > 0 else float("inf")
+        self.motion_threshold = motion_threshold
+        self.motion_fraction = motion_fraction
+        self.downsample_size = downsample_size
+        self.state = self.ACTIVE
+        self._previous: Optional[np.ndarray] = None
+        self._gray: Optional[np.ndarray] = None
+        self._last_activity: Optional[float] = None
+        self._last_inference = float("-inf")
+        self.frames_seen = 0
+        self.frames_skipped = 0
+        self.inference_time = 0.0
+        self.inference_count = 0
+        self._cpu_mark = (time.process_time(), time.perf_counter())
+        self.cpu_load = 0.0
+
+    def _detect_motion(self, frame) -> bool:
+        small = cv2.resize(frame, self.downsample_size, interpolation=cv2.INTER_AREA)
+        if self._gray is None:
+            self._gray = np.empty(small.shape[:2], dtype=np.uint8)
+            self._previous = np.empty_like(self._gray)
+            cv2.cvtColor(small, cv2.COLOR_BGR2GRAY, dst=self._previous)
+            return True
+        cv2.cvtColor(small, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        diff = cv2.absdiff(self._gray, self._previous)
+        self._previous, self._gray = self._gray, self._previous
+        changed = cv2.countNonZero(cv2.threshold(diff, self.motion_threshold, 255, cv2.THRESH_BINARY)[1])
+        return changed > self.motion_fraction * diff.size
+
+    def should_infer(self, frame, now: float) -> bool:
+        self.frames_seen += 1
+        if self._last_activity is None:
+            self._last_activity = now
+        motion = self._detect_motion(frame)
+        if motion:
+            self._last_activity = now
+            self.state = self.ACTIVE
+        if self.state == self.ACTIVE or now - self._last_inference >= self.idle_interval:
+            self._last_inference = now
+            return True
+        self.frames_skipped += 1
+        return False
+
+    def report(self, hand_detected: bool, now: float, inference_time: float):
+        self.inference_time += inference_time
+        self.inference_count += 1
+        if hand_detected:
+            self._last_activity = now
+            self.state = self.ACTIVE
+        elif self.state == self.ACTIVE and now - self._last_activity >= self.idle_timeout:
+            self.state = self.IDLE
+
+    def update_cpu_load(self, min_interval: float = 1.0) -> float:
+        cpu, wall = time.process_time(), time.perf_counter()
+        last_cpu, last_wall = self._cpu_mark
+        if wall - last_wall >= min_interval:
+            self.cpu_load = (cpu - last_cpu) / (wall - last_wall)
+            self._cpu_mark = (cpu, wall)
+        return self.cpu_load
+
+    @property
+    def estimated_savings(self) -> float:
+        if not self.inference_count:
+            return 0.0
+        saved = self.frames_skipped * self.inference_time / self.inference_count
+        return saved / (saved + self.inference_time)
+
+    def get_stats(self) -> Dict[str, float]:
+        return {
+            "state": self.state,
+            "frames": self.frames_seen,
+            "skipped": self.frames_skipped,
+            "inference_saved": self.estimated_savings,
+            "cpu_load": self.cpu_load,
+        }
@@ -0,0 +1,125 @@
+import threading
+import time
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+
+class FramePacket(NamedTuple):
+    frame_id: int
+    timestamp: float
+    frame: Any
+
+
+class LatestFrameBuffer:
+    def __init__(self, name: str):
+        self.name = name
+        self._condition = threading.Condition()
+        self._item: Optional[Any] = None
+        self._closed = False
+        self.published = 0
+        self.consumed = 0
+        self.dropped = 0
+
+    def put(self, item: Any):
+        with self._condition:
+            if self._item is not None:
+                self.dropped += 1
+            self._item = item
+            self.published += 1
+            self._condition.notify()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        with self._condition:
+            self._condition.wait_for(lambda: self._item is not None or self._closed, timeout)
+            item = self._item
+            self._item = None
+            if item is not None:
+                self.consumed += 1
+            return item
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+
+class FramePipeline:
+    def __init__(self,
+                 capture_fn: Callable[[], Optional[Any]],
+                 inference_fn: Callable[[FramePacket], Any],
+                 poll_interval: float = 0.1,
+                 timestamp_fn: Callable[[], float] = time.monotonic):
+        self.capture_fn = capture_fn
+        self.inference_fn = inference_fn
+        self.timestamp_fn = timestamp_fn
+        self.poll_interval = poll_interval
+        self.capture_buffer = LatestFrameBuffer("capture")
+        self.result_buffer = LatestFrameBuffer("inference")
+        self.stop_event = threading.Event()
+        self.error: Optional[BaseException] = None
+        self.frames_captured = 0
+        self.frames_inferred = 0
+        self._threads = [
+            threading.Thread(target=self._capture_loop, name="capture", daemon=True),
+            threading.Thread(target=self._inference_loop, name="inference", daemon=True),
+        ]
+
+    def _capture_loop(self):
+        try:
+            while not self.stop_event.is_set():
+                frame = self.capture_fn()
+                if frame is None:
+                    break
+                self.capture_buffer.put(FramePacket(self.frames_captured, self.timestamp_fn(), frame))
+                self.frames_captured += 1
+        except BaseException as e:
+            self.error = e
+        finally:
+            self.stop_event.set()
+            self.capture_buffer.close()
+
+    def _inference_loop(self):
+        try:
+            while True:
+                closed = self.capture_buffer.closed
+                packet = self.capture_buffer.get(self.poll_interval)
+                if packet is None:
+                    if closed:
+                        break
+                    continue
+                self.result_buffer.put(self.inference_fn(packet))
+                self.frames_inferred += 1
+        except BaseException as e:
+            self.error = e
+            self.stop_event.set()
+        finally:
+            self.result_buffer.close()
+
+    def start(self):
+        for thread in self._threads:
+            thread.start()
+
+    def get_result(self, timeout: Optional[float] = None) -> Optional[Any]:
+        return self.result_buffer.get(timeout)
+
+    @property
+    def running(self) -> bool:
+        return not self.result_buffer.closed
+
+    def stop(self, timeout: float = 2.0):
+        self.stop_event.set()
+        self.capture_buffer.close()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "captured": self.frames_captured,
+            "inferred": self.frames_inferred,
+            "displayed": self.result_buffer.consumed,
+            "inference_dropped": self.capture_buffer.dropped,
+            "display_dropped": self.result_buffer.dropped,
+        }
@@ -0,0 +1,270 @@
+import argparse
+import glob
+import math
+import os
+import time
+from typing import List, Sequence, Tuple, Union
+import numpy as np
+
+from landmarks import MIDDLE_MCP, WRIST
+from recording import HANDEDNESS_CODES, LandmarkRecording
+
+NO_POSE = "none"
+FEATURE_SIZE = 42
+
+
+def normalize_landmarks(landmarks: np.ndarray, left: Union[bool, np.ndarray] = False) -> np.ndarray:
+    points = np.asarray(landmarks, dtype=np.float32)[..., :2]
+    points = points - points[..., WRIST:WRIST + 1, :]
+    axis = points[..., MIDDLE_MCP, :]
+    scale = np.maximum(np.linalg.norm(axis, axis=-1, keepdims=True), 1e-6)
+    ux, uy = np.moveaxis(axis / scale, -1, 0)
+    x = (points[..., 0] * -uy[..., None] + points[..., 1] * ux[..., None]) / scale
+    y = -(points[..., 0] * ux[..., None] + points[..., 1] * uy[..., None]) / scale
+    x = np.where(np.asarray(left)[..., None], -x, x)
+    return np.stack([x, y], axis=-1).reshape(points.shape[:-2] + (FEATURE_SIZE,))
+
+
+def load_samples(directory: str, stride: int = 1) -> Tuple[np.ndarray, List[str]]:
+    features = []
+    labels: List[str] = []
+    for label in sorted(os.listdir(directory)):
+        paths = sorted(glob.glob(os.path.join(directory, label, "*.lmk")))
+        for path in paths:
+            records = LandmarkRecording(path).records[::stride]
+            records = records[records["present"].astype(bool)]
+            if not len(records):
+                continue
+            left = records["handedness"] == HANDEDNESS_CODES["Left"]
+            features.append(normalize_landmarks(np.asarray(records["landmarks"]), left))
+            labels.extend([label] * len(records))
+    if not features:
+        raise ValueError(f"No recorded samples found under {directory}/<label>/*.lmk")
+    return np.concatenate(features), labels
+
+
+class PoseClassifier:
+    kind = ""
+
+    def __init__(self):
+        self.labels: List[str] = []
+
+    def fit(self, features: np.ndarray, labels: Sequence[str]) -> "PoseClassifier":
+        raise NotImplementedError
+
+    def predict_features(self, features: np.ndarray) -> Tuple[List[str], np.ndarray]:
+        raise NotImplementedError
+
+    def predict(self, landmarks: np.ndarray,
+                left: Union[bool, np.ndarray] = False) -> Tuple[List[str], np.ndarray]:
+        return self.predict_features(normalize_landmarks(landmarks, left))
+
+    def calibrate(self, budget: float, repeats: int = 50) -> float:
+        return self.measure_cost(repeats)
+
+    def measure_cost(self, repeats: int = 50) -> float:
+        probe = np.zeros((1, FEATURE_SIZE), dtype=np.float32)
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            self.predict_features(probe)
+            timings.append(time.perf_counter() - start)
+        return float(np.median(timings))
+
+    def arrays(self) -> dict:
+        raise NotImplementedError
+
+    def save(self, path: str):
+        np.savez(path, kind=self.kind, labels=np.array(self.labels), **self.arrays())
+
+
+class KNNPoseClassifier(PoseClassifier):
+    kind = "knn"
+
+    def __init__(self, k: int = 5, max_distance: float = 0.6):
+        super().__init__()
+        self.k = k
+        self.max_distance = max_distance
+        self.templates = np.zeros((0, FEATURE_SIZE), dtype=np.float32)
+        self.template_labels = np.zeros(0, dtype=np.int32)
+        self._tree = None
+        self._norms = np.zeros(0, dtype=np.float32)
+
+    def fit(self, features: np.ndarray, labels: Sequence[str]) -> "KNNPoseClassifier":
+        self.labels = sorted(set(labels))
+        index = {label: i for i, label in enumerate(self.labels)}
+        self.templates = np.ascontiguousarray(features, dtype=np.float32)
+        self.template_labels = np.array([index[label] for label in labels], dtype=np.int32)
+        self._build_index()
+        return self
+
+    def _build_index(self):
+        try:
+            from scipy.spatial import cKDTree
+        except ImportError:
+            self._tree = None
+        else:
+            self._tree = cKDTree(self.templates)
+        self._norms = np.einsum("ij,ij->i", self.templates, self.templates)
+
+    def _neighbors(self, features: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        k = min(self.k, len(self.templates))
+        if self._tree is not None:
+            distances, indices = self._tree.query(features, k)
+            return distances.reshape(len(features), k), indices.reshape(len(features), k)
+        squared = self._norms[None, :] - 2.0 * features @ self.templates.T
+        indices = np.argpartition(squared, k - 1, axis=1)[:, :k]
+        squared = np.take_along_axis(squared, indices, axis=1) + np.einsum("ij,ij->i", features, features)[:, None]
+        return np.sqrt(np.maximum(squared, 0.0)), indices
+
+    def predict_features(self, features: np.ndarray) -> Tuple[List[str], np.ndarray]:
+        features = np.atleast_2d(np.asarray(features, dtype=np.float32))
+        distances, indices = self._neighbors(features)
+        weights = 1.0 / (distances + 1e-3)
+        votes = np.zeros((len(features), len(self.labels)), dtype=np.float64)
+        np.add.at(votes, (np.arange(len(features))[:, None], self.template_labels[indices]), weights)
+        best = votes.argmax(axis=1)
+        confidences = votes[np.arange(len(features)), best] / votes.sum(axis=1)
+        confidences[distances.min(axis=1) > self.max_distance] = 0.0
+        return [self.labels[i] for i in best], confidences
+
+    def calibrate(self, budget: float, repeats: int = 50) -> float:
+        cost = self.measure_cost(repeats)
+        while cost > budget and len(self.templates) > self.k * len(self.labels) * 2:
+            keep = np.concatenate([
+                np.flatnonzero(self.template_labels == label)[::2] for label in range(len(self.labels))
+            ])
+            self.templates = self.templates[keep]
+            self.template_labels = self.template_labels[keep]
+            self._build_index()
+            cost = self.measure_cost(repeats)
+        return cost
+
+    def arrays(self) -> dict:
+        return {"templates": self.templates, "template_labels": self.template_labels,
+                "k": self.k, "max_distance": self.max_distance}
+
+    @classmethod
+    def from_arrays(cls, labels: List[str], arrays) -> "KNNPoseClassifier":
+        classifier = cls(int(arrays["k"]), float(arrays["max_distance"]))
+        classifier.labels = labels
+        classifier.templates = np.ascontiguousarray(arrays["templates"], dtype=np.float32)
+        classifier.template_labels = arrays["template_labels"].astype(np.int32)
+        classifier._build_index()
+        return classifier
+
+
+class MLPPoseClassifier(PoseClassifier):
+    kind = "mlp"
+
+    def __init__(self, hidden: int = 32, epochs: int = 400, learning_rate: float = 0.01, seed: int = 0):
+        super().__init__()
+        self.hidden = hidden
+        self.epochs = epochs
+        self.learning_rate = learning_rate
+        self.seed = seed
+        self.mean = np.zeros(FEATURE_SIZE, dtype=np.float32)
+        self.std = np.ones(FEATURE_SIZE, dtype=np.float32)
+        self.w1 = self.b1 = self.w2 = self.b2 = np.zeros(0, dtype=np.float32)
+
+    def _forward(self, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        hidden = np.maximum(x @ self.w1 + self.b1, 0.0)
+        logits = hidden @ self.w2 + self.b2
+        logits -= logits.max(axis=1, keepdims=True)
+        probabilities = np.exp(logits)
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+        return hidden, probabilities
+
+    def fit(self, features: np.ndarray, labels: Sequence[str]) -> "MLPPoseClassifier":
+        rng = np.random.default_rng(self.seed)
+        self.labels = sorted(set(labels))
+        index = {label: i for i, label in enumerate(self.labels)}
+        targets = np.eye(len(self.labels), dtype=np.float32)[[index[label] for label in labels]]
+        self.mean = features.mean(axis=0).astype(np.float32)
+        self.std = (features.std(axis=0) + 1e-3).astype(np.float32)
+        x = ((features - self.mean) / self.std).astype(np.float32)
+        params = [
+            rng.normal(0.0, math.sqrt(2.0 / FEATURE_SIZE), (FEATURE_SIZE, self.hidden)).astype(np.float32),
+            np.zeros(self.hidden, dtype=np.float32),
+            rng.normal(0.0, math.sqrt(1.0 / self.hidden), (self.hidden, len(self.labels))).astype(np.float32),
+            np.zeros(len(self.labels), dtype=np.float32),
+        ]
+        moments = [np.zeros_like(p) for p in params]
+        velocities = [np.zeros_like(p) for p in params]
+        for step in range(1, self.epochs + 1):
+            self.w1, self.b1, self.w2, self.b2 = params
+            hidden, probabilities = self._forward(x)
+            d_logits = (probabilities - targets) / len(x)
+            d_hidden = (d_logits @ self.w2.T) * (hidden > 0)
+            gradients = [x.T @ d_hidden, d_hidden.sum(axis=0), hidden.T @ d_logits, d_logits.sum(axis=0)]
+            for p, g, m, v in zip(params, gradients, moments, velocities):
+                m[...] = 0.9 * m + 0.1 * g
+                v[...] = 0.999 * v + 0.001 * g * g
+                p -= self.learning_rate * (m / (1 - 0.9 ** step)) / (np.sqrt(v / (1 - 0.999 ** step)) + 1e-8)
+        self.w1, self.b1, self.w2, self.b2 = params
+        return self
+
+    def predict_features(self, features: np.ndarray) -> Tuple[List[str], np.ndarray]:
+        x = (np.atleast_2d(np.asarray(features, dtype=np.float32)) - self.mean) / self.std
+        _, probabilities = self._forward(x)
+        best = probabilities.argmax(axis=1)
+        return [self.labels[i] for i in best], probabilities[np.arange(len(x)), best]
+
+    def arrays(self) -> dict:
+        return {"mean": self.mean, "std": self.std, "w1": self.w1, "b1": self.b1, "w2": self.w2, "b2": self.b2}
+
+    @classmethod
+    def from_arrays(cls, labels: List[str], arrays) -> "MLPPoseClassifier":
+        classifier = cls(hidden=arrays["w1"].shape[1])
+        classifier.labels = labels
+        for name in ("mean", "std", "w1", "b1", "w2", "b2"):
+            setattr(classifier, name, arrays[name].astype(np.float32))
+        return classifier
+
+
+CLASSIFIERS = {"knn": KNNPoseClassifier, "mlp": MLPPoseClassifier}
+
+
+def load_pose_classifier(path: str) -> PoseClassifier:
+    with np.load(path) as arrays:
+        kind = str(arrays["kind"])
+        if kind not in CLASSIFIERS:
+            raise ValueError(f"{path}: unknown pose classifier kind '{kind}'")
+        return CLASSIFIERS[kind].from_arrays([str(label) for label in arrays["labels"]], arrays)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train a static pose classifier from recorded samples.")
+    parser.add_argument("samples", help="Directory with one sub-directory of .lmk recordings per pose label")
+    parser.add_argument("-o", "--output", default="poses.npz", help="Model file to write (default: poses.npz)")
+    parser.add_argument("--model", choices=sorted(CLASSIFIERS), default="knn")
+    parser.add_argument("--k", type=int, default=5, help="Neighbours per vote for --model knn")
+    parser.add_argument("--stride", type=int, default=1, help="Use every Nth recorded frame")
+    parser.add_argument("--budget-ms", type=float, default=0.5,
+                        help="Per-frame inference budget; k-NN templates are thinned to fit (default: 0.5)")
+    parser.add_argument("--holdout", type=float, default=0.2, help="Fraction of samples held out for accuracy")
+    args = parser.parse_args()
+
+    features, labels = load_samples(args.samples, args.stride)
+    order = np.random.default_rng(0).permutation(len(labels))
+    split = int(len(order) * (1.0 - args.holdout))
+    train, test = order[:split], order[split:]
+    classifier: PoseClassifier = KNNPoseClassifier(args.k) if args.model == "knn" else MLPPoseClassifier()
+    classifier.fit(features[train], [labels[i] for i in train])
+    cost = classifier.calibrate(args.budget_ms / 1000)
+    print(f"{len(labels)} samples, {len(classifier.labels)} poses: {', '.join(classifier.labels)}")
+    if len(test):
+        predicted, _ = classifier.predict_features(features[test])
+        accuracy = np.mean([p == labels[i] for p, i in zip(predicted, test)])
+        print(f"holdout accuracy {accuracy:.1%} on {len(test)} samples")
+    batch_start = time.perf_counter()
+    classifier.predict_features(features[:1024])
+    batch_cost = (time.perf_counter() - batch_start) / min(len(features), 1024)
+    print(f"inference {cost * 1e6:.0f} us/frame single, {batch_cost * 1e6:.1f} us/frame batched "
+          f"(budget {args.budget_ms * 1000:.0f} us)")
+    classifier.save(args.output)
+    print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+from collections import deque
+from typing import Deque, Dict, Optional
+import cv2
+import numpy as np
+
+from landmarks import INDEX_TIP, MIDDLE_TIP, PINKY_TIP, RING_TIP, THUMB_TIP, WRIST
+
+FLOW_POINTS = np.array([WRIST, THUMB_TIP, INDEX_TIP, MIDDLE_TIP, RING_TIP, PINKY_TIP])
+
+
+class LandmarkPredictor:
+    def __init__(self, interval: int = 2, max_drift: float = 0.03, max_error: float = 0.02,
+                 velocity_smoothing: float = 0.6, max_extrapolation: float = 0.2, frame_height: int = 480):
+        self.interval = max(int(interval), 1)
+        self.max_drift = max_drift
+        self.max_error = max_error
+        self.velocity_smoothing = velocity_smoothing
+        self.max_extrapolation = max_extrapolation
+        self.frame_height = frame_height
+        self.landmarks: Optional[np.ndarray] = None
+        self.velocity: Optional[np.ndarray] = None
+        self.timestamp = 0.0
+        self.since_inference = 0
+        self.last_error = 0.0
+        self.inferences = 0
+        self.predictions = 0
+        self.forced = 0
+        self.errors: Deque[float] = deque(maxlen=512)
+
+    @property
+    def tracking(self) -> bool:
+        return self.landmarks is not None
+
+    def drift(self, timestamp: float) -> float:
+        if self.velocity is None:
+            return 0.0
+        dt = min(timestamp - self.timestamp, self.max_extrapolation)
+        speed = np.sqrt((self.velocity[:, :2] ** 2).sum(axis=1)).max()
+        return float(speed * dt) / self.frame_height
+
+    def should_infer(self, timestamp: float) -> bool:
+        if self.landmarks is None or self.since_inference + 1 >= self.interval:
+            return True
+        if self.last_error > self.max_error or self.drift(timestamp) > self.max_drift:
+            self.forced += 1
+            return True
+        return False
+
+    def predict(self, timestamp: float) -> np.ndarray:
+        self.since_inference += 1
+        self.predictions += 1
+        if self.velocity is None:
+            return self.landmarks.copy()
+        dt = min(timestamp - self.timestamp, self.max_extrapolation)
+        return (self.landmarks + self.velocity * dt).astype(np.float32)
+
+    def update(self, landmarks: np.ndarray, timestamp: float):
+        self.inferences += 1
+        if self.landmarks is not None and timestamp > self.timestamp:
+            dt = min(timestamp - self.timestamp, self.max_extrapolation)
+            predicted = self.landmarks + self.velocity * dt if self.velocity is not None else self.landmarks
+            offsets = predicted[:, :2] - landmarks[:, :2]
+            self.last_error = float(np.sqrt((offsets ** 2).sum(axis=1)).max()) / self.frame_height
+            self.errors.append(self.last_error)
+            velocity = (landmarks - self.landmarks) / (timestamp - self.timestamp)
+            if self.velocity is None:
+                self.velocity = velocity
+            else:
+                self.velocity += self.velocity_smoothing * (velocity - self.velocity)
+        self.landmarks = landmarks.copy()
+        self.timestamp = timestamp
+        self.since_inference = 0
+
+    def reset(self):
+        self.landmarks = None
+        self.velocity = None
+        self.since_inference = 0
+        self.last_error = 0.0
+
+    def get_stats(self) -> Dict[str, float]:
+        frames = self.inferences + self.predictions
+        errors = np.array(self.errors) if self.errors else np.zeros(1)
+        return {
+            "frames": frames,
+            "inferences": self.inferences,
+            "predicted": self.predictions,
+            "forced": self.forced,
+            "inference_ratio": self.inferences / frames if frames else 1.0,
+            "error_mean": float(errors.mean()),
+            "error_p95": float(np.percentile(errors, 95)),
+        }
+
+
+class FlowRefiner:
+    def __init__(self, win_size: int = 21, max_level: int = 2, max_shift: float = 0.1):
+        self.lk_params = dict(winSize=(win_size, win_size), maxLevel=max_level,
+                              criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03))
+        self.max_shift = max_shift
+        self._previous: Optional[np.ndarray] = None
+        self._current: Optional[np.ndarray] = None
+        self._points: Optional[np.ndarray] = None
+        self._converted = False
+        self.tracked = 0
+        self.lost = 0
+
+    def _gray(self, frame) -> np.ndarray:
+        if not self._converted:
+            h, w = frame.shape[:2]
+            if self._current is None or self._current.shape != (h, w):
+                self._current = np.empty((h, w), dtype=np.uint8)
+            cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._current)
+            self._converted = True
+        return self._current
+
+    def refine(self, frame, landmarks: np.ndarray) -> int:
+        if self._previous is None or self._points is None:
+            return 0
+        gray = self._gray(frame)
+        if gray.shape != self._previous.shape:
+            return 0
+        points, status, _ = cv2.calcOpticalFlowPyrLK(self._previous, gray, self._points, None, **self.lk_params)
+        found = status.ravel() == 1
+        shifts = points.reshape(-1, 2) - self._points.reshape(-1, 2)
+        found &= np.sqrt((shifts ** 2).sum(axis=1)) <= self.max_shift * gray.shape[0]
+        self.tracked += int(found.sum())
+        self.lost += int((~found).sum())
+        if not found.any():
+            return 0
+        flow = points.reshape(-1, 2)[found]
+        landmarks[:, :2] += (flow - landmarks[FLOW_POINTS[found], :2]).mean(axis=0)
+        landmarks[FLOW_POINTS[found], :2] = flow
+        return int(found.sum())
+
+    def remember(self, frame, landmarks: np.ndarray):
+        gray = self._gray(frame)
+        self._previous, self._current = gray, self._previous
+        self._points = np.ascontiguousarray(landmarks[FLOW_POINTS, :2], dtype=np.float32).reshape(-1, 1, 2)
+        self._converted = False
+
+    def reset(self):
+        self._points = None
+        self._converted = False
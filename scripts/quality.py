@@ -0,0 +1,125 @@
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from metrics import LatencyHistogram
+
+
+class QualityLevel(NamedTuple):
+    name: str
+    model_complexity: int
+    inference_scale: float
+    smoothing_window: int
+    min_detection_confidence: float
+    min_tracking_confidence: float
+
+    def describe(self) -> str:
+        return (f"{self.name} (model {self.model_complexity}, {self.inference_scale:.0%} resolution, "
+                f"window {self.smoothing_window}, detect {self.min_detection_confidence:g} / "
+                f"track {self.min_tracking_confidence:g})")
+
+
+QUALITY_LEVELS = [
+    QualityLevel("full", 1, 1.0, 5, 0.7, 0.6),
+    QualityLevel("high", 1, 0.75, 5, 0.7, 0.5),
+    QualityLevel("balanced", 0, 0.75, 4, 0.6, 0.5),
+    QualityLevel("fast", 0, 0.5, 3, 0.6, 0.5),
+    QualityLevel("minimum", 0, 0.375, 2, 0.5, 0.4),
+]
+
+
+class QualityChange(NamedTuple):
+    timestamp: float
+    previous: str
+    level: str
+    p95_ms: float
+    reason: str
+
+
+class QualityController:
+    def __init__(self, budget_ms: float, levels: Sequence[QualityLevel] = QUALITY_LEVELS,
+                 start_level: int = 0, evaluation_frames: int = 60, settle_frames: int = 10,
+                 upgrade_headroom: float = 0.6, upgrade_patience: int = 3, max_patience: int = 48):
+        self.budget = budget_ms / 1000.0
+        self.levels = list(levels)
+        self.index = min(max(start_level, 0), len(self.levels) - 1)
+        self.evaluation_frames = evaluation_frames
+        self.settle_frames = settle_frames
+        self.upgrade_headroom = upgrade_headroom
+        self.upgrade_patience = upgrade_patience
+        self.max_patience = max_patience
+        self.patience = [upgrade_patience] * len(self.levels)
+        self.histogram = LatencyHistogram(evaluation_frames)
+        self.level_costs: Dict[int, float] = {}
+        self.changes: List[QualityChange] = []
+        self.frames_at_level = [0] * len(self.levels)
+        self._settling = settle_frames
+        self._good_windows = 0
+        self._upgraded_from: Optional[int] = None
+        self._started_at: Optional[float] = None
+
+    @property
+    def level(self) -> QualityLevel:
+        return self.levels[self.index]
+
+    def observe(self, seconds: float, timestamp: float) -> Optional[QualityLevel]:
+        if self._started_at is None:
+            self._started_at = timestamp
+        self.frames_at_level[self.index] += 1
+        if self._settling > 0:
+            self._settling -= 1
+            return None
+        self.histogram.observe(seconds)
+        if self.histogram.count < self.evaluation_frames:
+            return None
+        p95 = self.histogram.percentiles((95,))["p95"]
+        self.level_costs[self.index] = p95
+        self.histogram = LatencyHistogram(self.evaluation_frames)
+        if p95 > self.budget:
+            self._good_windows = 0
+            if self.index == len(self.levels) - 1:
+                return None
+            if self._upgraded_from == self.index + 1:
+                self.patience[self.index] = min(self.patience[self.index] * 2, self.max_patience)
+            return self._move(self.index + 1, timestamp, p95, "over budget")
+        if self._upgraded_from is not None:
+            self.patience[self.index] = max(self.patience[self.index] // 2, self.upgrade_patience)
+            self._upgraded_from = None
+        if self.index == 0:
+            return None
+        if p95 >= self.budget * self.upgrade_headroom:
+            self._good_windows = 0
+            return None
+        self._good_windows += 1
+        if self._good_windows < self.patience[self.index - 1]:
+            return None
+        self._upgraded_from = self.index
+        return self._move(self.index - 1, timestamp, p95, "headroom")
+
+    def _move(self, index: int, timestamp: float, p95: float, reason: str) -> QualityLevel:
+        self.changes.append(QualityChange(timestamp - self._started_at, self.level.name, self.levels[index].name,
+                                          p95 * 1000, reason))
+        self.index = index
+        self._settling = self.settle_frames
+        self._good_windows = 0
+        return self.level
+
+    def report(self) -> str:
+        frames = max(sum(self.frames_at_level), 1)
+        lines = [f"Adaptive quality: budget {self.budget * 1000:.1f} ms, ended at {self.level.describe()}"]
+        for i, level in enumerate(self.levels):
+            if not self.frames_at_level[i]:
+                continue
+            cost = f", p95 {self.level_costs[i] * 1000:.1f} ms" if i in self.level_costs else ""
+            lines.append(f"  {level.name:<10}{self.frames_at_level[i] / frames:>5.0%} of frames{cost}")
+        for change in self.changes:
+            lines.append(f"  {change.timestamp:10.2f}s  {change.previous} -> {change.level} "
+                         f"({change.reason}, p95 {change.p95_ms:.1f} ms)")
+        return "\n".join(lines)
+
+    def get_stats(self) -> Dict[str, object]:
+        return {
+            "level": self.level.name,
+            "budget_ms": self.budget * 1000,
+            "changes": len(self.changes),
+            "level_p95_ms": {self.levels[i].name: cost * 1000 for i, cost in self.level_costs.items()},
+            "frames_at_level": dict(zip((level.name for level in self.levels), self.frames_at_level)),
+        }
@@ -0,0 +1,530 @@
+import math
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+import numpy as np
+
+from gesture_rules import (ALL_MASKS, NUM_MASKS, TIME_EPSILON, GestureConfig, GestureRule, GestureRuleSet,
+                           build_rules, load_gesture_config, parse_mask)
+from hand_features import DEFAULT_FRAME_SIZE, extract_features
+from landmarks import (HandLandmarks, NUM_LANDMARKS, PALM_POINTS, THUMB_MCP, THUMB_TIP, WRIST, FINGER_MCPS,
+                       FINGER_PIPS, FINGERTIPS)
+from recording import HANDEDNESS_CODES, HANDEDNESS_LABELS
+
+NONE_CODE = 0
+RIGHT = HANDEDNESS_CODES["Right"]
+FINGER_BITS = np.array([2, 4, 8, 16])
+MIN_BATCH = 48
+
+PALM_ROW = 0
+TIP_OFFSET_ROWS = slice(1, 5)
+TIP_PIP_ROWS = slice(5, 9)
+PIP_MCP_ROWS = slice(9, 13)
+THUMB_ROW = 13
+WRIST_ROW = 14
+PINCH_ROW = TIP_OFFSET_ROWS.start
+
+
+def _build_feature_matrix() -> np.ndarray:
+    matrix = np.zeros((15, NUM_LANDMARKS), dtype=np.float32)
+    matrix[PALM_ROW, PALM_POINTS] = 1.0 / len(PALM_POINTS)
+    for row, (tip, pip, mcp) in enumerate(zip(FINGERTIPS[1:], FINGER_PIPS, FINGER_MCPS)):
+        matrix[TIP_OFFSET_ROWS.start + row, tip] += 1.0
+        matrix[TIP_OFFSET_ROWS.start + row, THUMB_TIP] -= 1.0
+        matrix[TIP_PIP_ROWS.start + row, tip] += 1.0
+        matrix[TIP_PIP_ROWS.start + row, pip] -= 1.0
+        matrix[PIP_MCP_ROWS.start + row, pip] += 1.0
+        matrix[PIP_MCP_ROWS.start + row, mcp] -= 1.0
+    matrix[THUMB_ROW, THUMB_TIP] = 1.0
+    matrix[THUMB_ROW, THUMB_MCP] = -1.0
+    matrix[WRIST_ROW, WRIST] = 1.0
+    return matrix
+
+
+FEATURE_MATRIX = _build_feature_matrix()
+
+
+class BatchFeatures(NamedTuple):
+    masks: np.ndarray
+    palm: np.ndarray
+    wrist: np.ndarray
+    pinch_distance: np.ndarray
+    timestamps: np.ndarray
+
+
+def extract_batch_features(landmarks: np.ndarray, handedness: np.ndarray, timestamps: np.ndarray,
+                           frame_heights: np.ndarray) -> BatchFeatures:
+    rows = np.tensordot(FEATURE_MATRIX, landmarks[:, :, :2], axes=(1, 1))
+    unit = 1.0 / frame_heights
+    thumb_dx = rows[THUMB_ROW, :, 0]
+    thumb = np.where(handedness == RIGHT, thumb_dx < 0, thumb_dx > 0)
+    extended = (rows[TIP_PIP_ROWS, :, 1] < 0) & (rows[PIP_MCP_ROWS, :, 1] < 0)
+    return BatchFeatures(
+        masks=thumb.astype(np.int64) | FINGER_BITS @ extended.astype(np.int64),
+        palm=rows[PALM_ROW] * unit[:, None],
+        wrist=rows[WRIST_ROW] * unit[:, None],
+        pinch_distance=np.hypot(rows[PINCH_ROW, :, 0], rows[PINCH_ROW, :, 1]) * unit,
+        timestamps=timestamps,
+    )
+
+
+class BankRule:
+    terminal = False
+
+    def __init__(self, priority: int = 0, masks: Optional[Sequence[Any]] = None):
+        self.priority = priority
+        self.mask_table = np.zeros(NUM_MASKS, dtype=bool)
+        self.mask_table[list(ALL_MASKS if masks is None else (parse_mask(m) for m in masks))] = True
+        self.codes: Dict[str, int] = {}
+
+    def gestures(self) -> Tuple[str, ...]:
+        raise NotImplementedError
+
+    def grow(self, capacity: int):
+        pass
+
+    def evaluate(self, slots: np.ndarray, features: BatchFeatures, rows: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def reset(self, slots: np.ndarray):
+        pass
+
+    def to_rule(self, slot: int, rule: GestureRule):
+        pass
+
+    def from_rule(self, slot: int, rule: GestureRule):
+        pass
+
+
+def _grown(array: np.ndarray, capacity: int, fill) -> np.ndarray:
+    grown = np.full((capacity,) + array.shape[1:], fill, dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+class PoseBankRule(BankRule):
+    terminal = True
+
+    def __init__(self, gesture: str, masks: Sequence[Any], priority: int = 0):
+        super().__init__(priority, masks)
+        self.gesture = gesture
+
+    def gestures(self) -> Tuple[str, ...]:
+        return (self.gesture,)
+
+    def evaluate(self, slots: np.ndarray, features: BatchFeatures, rows: np.ndarray) -> np.ndarray:
+        return np.full(len(slots), self.codes[self.gesture])
+
+
+class PinchBankRule(BankRule):
+    def __init__(self, gesture: str, threshold: float = 0.083, priority: int = 0,
+                 masks: Optional[Sequence[Any]] = None):
+        super().__init__(priority, masks)
+        self.gesture = gesture
+        self.threshold = threshold
+        self.was_pinching = np.zeros(0, dtype=bool)
+
+    def gestures(self) -> Tuple[str, ...]:
+        return (self.gesture,)
+
+    def grow(self, capacity: int):
+        self.was_pinching = _grown(self.was_pinching, capacity, False)
+
+    def evaluate(self, slots: np.ndarray, features: BatchFeatures, rows: np.ndarray) -> np.ndarray:
+        pinching = features.pinch_distance[rows] < self.threshold
+        fired = pinching & ~self.was_pinching[slots]
+        self.was_pinching[slots] = pinching
+        return np.where(fired, self.codes[self.gesture], NONE_CODE)
+
+    def reset(self, slots: np.ndarray):
+        self.was_pinching[slots] = False
+
+    def to_rule(self, slot: int, rule: GestureRule):
+        rule.was_pinching = bool(self.was_pinching[slot])
+
+    def from_rule(self, slot: int, rule: GestureRule):
+        self.was_pinching[slot] = rule.was_pinching
+
+
+class VerticalMotionBankRule(BankRule):
+    def __init__(self, up: str, down: str, distance: float = 0.05, priority: int = 0,
+                 masks: Optional[Sequence[Any]] = None):
+        super().__init__(priority, masks)
+        self.up = up
+        self.down = down
+        self.distance = distance
+        self.anchor_y = np.zeros(0)
+
+    def gestures(self) -> Tuple[str, ...]:
+        return (self.up, self.down)
+
+    def grow(self, capacity: int):
+        self.anchor_y = _grown(self.anchor_y, capacity, np.nan)
+
+    def evaluate(self, slots: np.ndarray, features: BatchFeatures, rows: np.ndarray) -> np.ndarray:
+        current_y = features.wrist[rows, 1]
+        anchor = self.anchor_y[slots]
+        fresh = np.isnan(anchor)
+        delta_y = current_y - anchor
+        up = ~fresh & (delta_y < -self.distance)
+        down = ~fresh & (delta_y > self.distance)
+        anchor = np.where(fresh, current_y, anchor - self.distance * up + self.distance * down)
+        self.anchor_y[slots] = anchor
+        return np.where(up, self.codes[self.up], np.where(down, self.codes[self.down], NONE_CODE))
+
+    def reset(self, slots: np.ndarray):
+        self.anchor_y[slots] = np.nan
+
+    def to_rule(self, slot: int, rule: GestureRule):
+        anchor = float(self.anchor_y[slot])
+        rule.anchor_y = None if math.isnan(anchor) else anchor
+
+    def from_rule(self, slot: int, rule: GestureRule):
+        self.anchor_y[slot] = np.nan if rule.anchor_y is None else rule.anchor_y
+
+
+class SwipeBankRule(BankRule):
+    def __init__(self, right: str, left: str, distance: float = 0.17, window: float = 0.3,
+                 min_duration: float = 0.12, priority: int = 0, masks: Optional[Sequence[Any]] = None,
+                 history: int = 64):
+        super().__init__(priority, masks)
+        self.right = right
+        self.left = left
+        self.distance = distance
+        self.window = window
+        self.min_duration = min_duration
+        self.times = np.zeros((0, history))
+        self.xs = np.zeros((0, history))
+        self.head = np.zeros(0, dtype=np.int64)
+
+    def gestures(self) -> Tuple[str, ...]:
+        return (self.right, self.left)
+
+    def grow(self, capacity: int):
+        self.times = _grown(self.times, capacity, -np.inf)
+        self.xs = _grown(self.xs, capacity, 0.0)
+        self.head = _grown(self.head, capacity, 0)
+
+    def evaluate(self, slots: np.ndarray, features: BatchFeatures, rows: np.ndarray) -> np.ndarray:
+        now = features.timestamps[rows]
+        x = features.palm[rows, 0]
+        head = self.head[slots]
+        self.times[slots, head] = now
+        self.xs[slots, head] = x
+        self.head[slots] = (head + 1) % self.times.shape[1]
+        times = self.times[slots]
+        in_window = now[:, None] - times <= self.window + TIME_EPSILON
+        oldest = np.where(in_window, times, np.inf).argmin(axis=1)
+        start = times[np.arange(len(slots)), oldest]
+        delta_x = x - self.xs[slots, oldest]
+        fired = (now - start >= self.min_duration - TIME_EPSILON) & (np.abs(delta_x) > self.distance)
+        self.reset(slots[fired])
+        return np.where(fired, np.where(delta_x > 0, self.codes[self.right], self.codes[self.left]), NONE_CODE)
+
+    def reset(self, slots: np.ndarray):
+        self.times[slots] = -np.inf
+
+    def to_rule(self, slot: int, rule: GestureRule):
+        order = np.argsort(self.times[slot], kind="stable")
+        samples = zip(self.times[slot, order].tolist(), self.xs[slot, order].tolist())
+        rule.history.clear()
+        rule.history.extend(sample for sample in samples if sample[0] != -math.inf)
+
+    def from_rule(self, slot: int, rule: GestureRule):
+        samples = list(rule.history)[-self.times.shape[1]:]
+        self.times[slot] = -np.inf
+        if samples:
+            self.times[slot, :len(samples)], self.xs[slot, :len(samples)] = zip(*samples)
+        self.head[slot] = len(samples) % self.times.shape[1]
+
+
+BANK_RULE_TYPES = {
+    "pose": PoseBankRule,
+    "pinch": PinchBankRule,
+    "vertical_motion": VerticalMotionBankRule,
+    "swipe": SwipeBankRule,
+}
+
+
+def build_bank_rules(config: GestureConfig) -> List[BankRule]:
+    rules = []
+    for spec in config.rules:
+        params = dict(spec)
+        rule_type = params.pop("type")
+        if rule_type not in BANK_RULE_TYPES:
+            raise ValueError(f"Gesture rule type '{rule_type}' is not supported by the recognizer bank, "
+                             f"expected one of {', '.join(BANK_RULE_TYPES)}")
+        rules.append(BANK_RULE_TYPES[rule_type](**params))
+    return sorted(rules, key=lambda rule: rule.priority)
+
+
+class RecognizerBank:
+    NONE = "none"
+
+    def __init__(self, config: Optional[GestureConfig] = None, capacity: int = 16,
+                 match_distance: float = 0.25, max_missing: float = 0.5,
+                 frame_size: Tuple[int, int] = DEFAULT_FRAME_SIZE, min_batch: int = MIN_BATCH):
+        self.config = config or load_gesture_config()
+        self.rules = build_bank_rules(self.config)
+        self.gesture_names = [self.NONE]
+        for rule in self.rules:
+            for gesture in rule.gestures():
+                if gesture not in self.gesture_names:
+                    self.gesture_names.append(gesture)
+            rule.codes = {gesture: self.gesture_names.index(gesture) for gesture in rule.gestures()}
+        self.resettable = [rule for rule in self.rules if not rule.terminal]
+        self.match_distance = match_distance
+        self.max_missing = max_missing
+        self.default_frame_height = float(frame_size[1])
+        self.frame_heights: Dict[int, float] = {}
+        self.capacity = 0
+        self.active = np.zeros(0, dtype=bool)
+        self.stream = np.zeros(0, dtype=np.int64)
+        self.hand_id = np.zeros(0, dtype=np.int64)
+        self.handedness = np.zeros(0, dtype=np.int8)
+        self.position = np.zeros((0, 2))
+        self.last_seen = np.zeros(0)
+        self.next_id = 0
+        self.min_batch = min_batch
+        self.batched = False
+        self.rule_sets: List[Optional[GestureRuleSet]] = []
+        self._grow(capacity)
+
+    def set_frame_size(self, stream: int, frame_size: Tuple[int, int]):
+        if frame_size[1] <= 0:
+            raise ValueError(f"Invalid frame size {frame_size}")
+        self.frame_heights[stream] = float(frame_size[1])
+
+    @property
+    def hands(self) -> int:
+        return int(self.active.sum())
+
+    def _grow(self, capacity: int):
+        self.active = _grown(self.active, capacity, False)
+        self.stream = _grown(self.stream, capacity, -1)
+        self.hand_id = _grown(self.hand_id, capacity, -1)
+        self.handedness = _grown(self.handedness, capacity, 0)
+        self.position = _grown(self.position, capacity, 0.0)
+        self.last_seen = _grown(self.last_seen, capacity, -np.inf)
+        for rule in self.rules:
+            rule.grow(capacity)
+        self.rule_sets.extend([None] * (capacity - self.capacity))
+        self.capacity = capacity
+
+    def _rule_set(self, slot: int) -> GestureRuleSet:
+        rule_set = self.rule_sets[slot]
+        if rule_set is None:
+            rule_set = self.rule_sets[slot] = build_rules(self.config)
+        return rule_set
+
+    def _use_batch(self, hands: int) -> bool:
+        # Hysteresis keeps a hand count near the threshold from copying state back and forth every tick.
+        batched = hands >= (self.min_batch * 3 // 4 if self.batched else self.min_batch)
+        if batched != self.batched:
+            for slot in np.flatnonzero(self.active).tolist():
+                for bank_rule, rule in zip(self.rules, self._rule_set(slot).rules):
+                    if batched:
+                        bank_rule.from_rule(slot, rule)
+                    else:
+                        bank_rule.to_rule(slot, rule)
+            self.batched = batched
+        return batched
+
+    def _reset_slots(self, slots: np.ndarray):
+        if len(slots):
+            for rule in self.resettable:
+                rule.reset(slots)
+
+    def _match(self, streams: np.ndarray, handedness: np.ndarray, palm: np.ndarray) -> np.ndarray:
+        slots = np.full(len(streams), -1, dtype=np.int64)
+        candidates = np.flatnonzero(self.active)
+        if len(candidates) and len(streams):
+            candidates = candidates[np.argsort(self.stream[candidates], kind="stable")]
+            first = np.searchsorted(self.stream[candidates], streams, side="left")
+            count = np.searchsorted(self.stream[candidates], streams, side="right") - first
+            width = int(count.max())
+            if width:
+                offsets = np.arange(width)
+                pairs = candidates[np.minimum(first[:, None] + offsets, len(candidates) - 1)]
+                distance = np.sqrt(((palm[:, None, :] - self.position[pairs]) ** 2).sum(axis=2))
+                known = (handedness[:, None] != 0) & (self.handedness[pairs] != 0)
+                valid = (offsets < count[:, None]) & ~(known & (handedness[:, None] != self.handedness[pairs]))
+                distance[~(valid & (distance <= self.match_distance))] = np.inf
+                self._assign(slots, pairs, distance)
+        new = np.flatnonzero(slots < 0)
+        if len(new):
+            free = np.flatnonzero(~self.active)
+            if len(free) < len(new):
+                self._grow(max(self.capacity * 2, self.capacity + len(new) - len(free)))
+                free = np.flatnonzero(~self.active)
+            slots[new] = free[:len(new)]
+            self.hand_id[slots[new]] = np.arange(self.next_id, self.next_id + len(new))
+            self.next_id += len(new)
+            self.active[slots[new]] = True
+            self._reset_slots(slots[new])
+        return slots
+
+    def _assign(self, slots: np.ndarray, pairs: np.ndarray, distance: np.ndarray):
+        rows = np.arange(len(pairs))
+        claimed = np.zeros(self.capacity, dtype=bool)
+        while True:
+            best = distance.argmin(axis=1)
+            best_distance = distance[rows, best]
+            open_rows = np.flatnonzero(np.isfinite(best_distance))
+            if not len(open_rows):
+                return
+            wanted = pairs[open_rows, best[open_rows]]
+            taken, index = np.unique(wanted, return_index=True)
+            if len(taken) == len(wanted):
+                slots[open_rows] = wanted
+                return
+            slot_best = np.full(self.capacity, np.inf)
+            np.minimum.at(slot_best, pairs, distance)
+            mutual = best_distance[open_rows] == slot_best[wanted]
+            taken, index = np.unique(wanted[mutual], return_index=True)
+            slots[open_rows[mutual][index]] = taken
+            distance[open_rows[mutual][index]] = np.inf
+            claimed[taken] = True
+            distance[claimed[pairs]] = np.inf
+
+    def recognize(self, streams: np.ndarray, landmarks: np.ndarray, handedness: np.ndarray,
+                  timestamps: np.ndarray, frame_streams: Optional[Iterable[int]] = None
+                  ) -> Tuple[np.ndarray, List[str]]:
+        if not self._use_batch(len(streams)):
+            hands = [(int(stream), HandLandmarks(points, HANDEDNESS_LABELS.get(int(code), ""), 1.0, float(timestamp)))
+                     for stream, points, code, timestamp in zip(streams, landmarks, handedness, timestamps)]
+            ids, gestures = self._recognize_each(hands, streams if frame_streams is None else frame_streams,
+                                                 max(timestamps) if len(timestamps) else None)
+            return np.array(ids, dtype=np.int64), gestures
+        streams = np.asarray(streams, dtype=np.int64)
+        handedness = np.asarray(handedness, dtype=np.int8)
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        unique, inverse = np.unique(streams, return_inverse=True)
+        heights = np.array([self.frame_heights.get(int(s), self.default_frame_height) for s in unique])
+        features = extract_batch_features(np.asarray(landmarks), handedness, timestamps,
+                                          heights[inverse] if len(unique) else np.zeros(0))
+        slots = self._match(streams, handedness, features.palm)
+        self.stream[slots] = streams
+        self.handedness[slots] = handedness
+        self.position[slots] = features.palm
+        self.last_seen[slots] = timestamps
+        self._expire(slots, unique if frame_streams is None else np.fromiter(frame_streams, dtype=np.int64),
+                     timestamps.max() if len(timestamps) else None)
+        codes = np.zeros(len(slots), dtype=np.int64)
+        pending = np.ones(len(slots), dtype=bool)
+        for rule in self.resettable:
+            stale = ~rule.mask_table[features.masks]
+            if stale.any():
+                rule.reset(slots[stale])
+        for rule in self.rules:
+            applies = rule.mask_table[features.masks]
+            rows = np.flatnonzero(pending & applies)
+            if len(rows):
+                fired = rule.evaluate(slots[rows], features, rows)
+                codes[rows] = fired
+                pending[rows[fired != NONE_CODE]] = False
+            if rule.terminal:
+                pending &= ~applies
+        return self.hand_id[slots], [self.gesture_names[code] for code in codes]
+
+    def _recognize_each(self, hands: Sequence[Tuple[int, HandLandmarks]], frame_streams: Iterable[int],
+                        now: Optional[float]) -> Tuple[List[int], List[str]]:
+        # Below min_batch the fixed cost of the vectorized pass outweighs its per-hand savings, so each slot
+        # runs an ordinary GestureRuleSet. Identity matching mirrors _match on the same slot arrays.
+        active = self.active.nonzero()[0].tolist()
+        slot_streams = self.stream.tolist()
+        candidates: Dict[int, List[int]] = {}
+        for slot in active:
+            candidates.setdefault(slot_streams[slot], []).append(slot)
+        slot_handedness = self.handedness.tolist()
+        slot_positions = self.position.tolist()
+        features = [extract_features(hand, self.frame_heights.get(stream, self.default_frame_height))
+                    for stream, hand in hands]
+        codes = [HANDEDNESS_CODES.get(hand.handedness, 0) for _, hand in hands]
+        pairs = []
+        for row, ((stream, _), code, feature) in enumerate(zip(hands, codes, features)):
+            x, y = feature.palm_center
+            for slot in candidates.get(stream, ()):
+                slot_code = slot_handedness[slot]
+                if code and slot_code and code != slot_code:
+                    continue
+                slot_x, slot_y = slot_positions[slot]
+                distance = math.hypot(x - slot_x, y - slot_y)
+                if distance <= self.match_distance:
+                    pairs.append((distance, row, slot))
+        slots = [-1] * len(hands)
+        claimed = set()
+        for _, row, slot in sorted(pairs):
+            if slots[row] < 0 and slot not in claimed:
+                slots[row] = slot
+                claimed.add(slot)
+        new = [row for row, slot in enumerate(slots) if slot < 0]
+        if new:
+            free = np.flatnonzero(~self.active)
+            if len(free) < len(new):
+                self._grow(max(self.capacity * 2, self.capacity + len(new) - len(free)))
+                free = np.flatnonzero(~self.active)
+            for row, slot in zip(new, free.tolist()):
+                slots[row] = slot
+                self.hand_id[slot] = self.next_id
+                self.next_id += 1
+                self.active[slot] = True
+                self._rule_set(slot).reset()
+        for slot, (stream, hand), code, feature in zip(slots, hands, codes, features):
+            self.stream[slot] = stream
+            self.handedness[slot] = code
+            self.position[slot] = feature.palm_center
+            self.last_seen[slot] = hand.timestamp
+        frame_streams = set(frame_streams)
+        seen = set(slots)
+        for slot in active:
+            if slot_streams[slot] in frame_streams and slot not in seen:
+                self._rule_set(slot).reset()
+                if now is not None and now - self.last_seen[slot] > self.max_missing:
+                    self.active[slot] = False
+                    self.hand_id[slot] = -1
+        ids = self.hand_id.tolist()
+        gestures = []
+        for slot, feature in zip(slots, features):
+            gesture = self._rule_set(slot).evaluate(feature)
+            gestures.append(self.NONE if gesture is None else gesture)
+        return [ids[slot] for slot in slots], gestures
+
+    def _expire(self, seen: np.ndarray, frame_streams: np.ndarray, now: Optional[float]):
+        if len(frame_streams) == 1:
+            absent = self.active & (self.stream == frame_streams[0])
+        else:
+            absent = self.active & np.isin(self.stream, frame_streams)
+        absent[seen] = False
+        absent_slots = np.flatnonzero(absent)
+        self._reset_slots(absent_slots)
+        if now is None:
+            return
+        expired = absent_slots[now - self.last_seen[absent_slots] > self.max_missing]
+        self.active[expired] = False
+        self.hand_id[expired] = -1
+
+    def recognize_hands(self, hands: Sequence[HandLandmarks], stream: int = 0,
+                        timestamp: Optional[float] = None) -> List[Tuple[int, str]]:
+        return self.recognize_frames({stream: hands}, timestamp)[stream]
+
+    def recognize_frames(self, frames: Dict[int, Sequence[HandLandmarks]],
+                         timestamp: Optional[float] = None) -> Dict[int, List[Tuple[int, str]]]:
+        hands = [(stream, hand) for stream, stream_hands in frames.items() for hand in stream_hands]
+        if not self._use_batch(len(hands)):
+            now = max(hand.timestamp for _, hand in hands) if hands else timestamp
+            ids, gestures = self._recognize_each(hands, frames.keys(), now)
+        elif hands:
+            hand_ids, gestures = self.recognize(
+                np.array([stream for stream, _ in hands]),
+                np.stack([hand.landmarks for _, hand in hands]),
+                np.array([HANDEDNESS_CODES.get(hand.handedness, 0) for _, hand in hands]),
+                np.array([hand.timestamp for _, hand in hands]),
+                frame_streams=frames.keys(),
+            )
+            ids = hand_ids.tolist()
+        else:
+            ids, gestures = [], []
+            self._expire(np.zeros(0, dtype=np.int64), np.fromiter(frames.keys(), dtype=np.int64), timestamp)
+        results: Dict[int, List[Tuple[int, str]]] = {stream: [] for stream in frames}
+        for (stream, _), hand_id, gesture in zip(hands, ids, gestures):
+            results[stream].append((hand_id, gesture))
+        return results
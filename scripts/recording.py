@@ -0,0 +1,133 @@
+import os
+import struct
+from typing import Iterator, Optional, Tuple
+import numpy as np
+
+from landmarks import HandLandmarks, NUM_LANDMARKS
+
+MAGIC = b"GLMK"
+VERSION = 1
+HEADER_FORMAT = "<4sHHH6x"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+HANDEDNESS_CODES = {"Left": 1, "Right": 2}
+HANDEDNESS_LABELS = {code: label for label, code in HANDEDNESS_CODES.items()}
+
+RECORD_DTYPE = np.dtype([
+    ("timestamp", "<f8"),
+    ("landmarks", "<f4", (NUM_LANDMARKS, 3)),
+    ("confidence", "<f4"),
+    ("present", "u1"),
+    ("handedness", "u1"),
+    ("reserved", "V2"),
+])
+
+
+class LandmarkRecorder:
+    def __init__(self, path: str, frame_size: Tuple[int, int] = (640, 480), buffer_frames: int = 256):
+        self.path = path
+        self.frame_size = frame_size
+        self.frames_written = 0
+        self._buffer = np.zeros(buffer_frames, dtype=RECORD_DTYPE)
+        self._pending = 0
+        self._file = open(path, "wb")
+        self._file.write(struct.pack(HEADER_FORMAT, MAGIC, VERSION, int(frame_size[0]), int(frame_size[1])))
+
+    def write(self, hand_data: Optional[HandLandmarks], timestamp: float):
+        record = self._buffer[self._pending]
+        record["timestamp"] = timestamp
+        if hand_data is None:
+            record["present"] = 0
+            record["handedness"] = 0
+            record["confidence"] = 0.0
+            record["landmarks"] = 0.0
+        else:
+            record["present"] = 1
+            record["handedness"] = HANDEDNESS_CODES.get(hand_data.handedness, 0)
+            record["confidence"] = hand_data.confidence
+            record["landmarks"] = hand_data.landmarks
+        self._pending += 1
+        self.frames_written += 1
+        if self._pending == len(self._buffer):
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            self._buffer[:self._pending].tofile(self._file)
+            self._pending = 0
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self) -> "LandmarkRecorder":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class LandmarkRecording:
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            header = f.read(HEADER_SIZE)
+        if len(header) < HEADER_SIZE:
+            raise ValueError(f"{path}: truncated header")
+        magic, version, width, height = struct.unpack(HEADER_FORMAT, header)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not a landmark recording")
+        if version != VERSION:
+            raise ValueError(f"{path}: unsupported recording version {version}")
+        self.frame_size = (width, height)
+        count = (os.path.getsize(path) - HEADER_SIZE) // RECORD_DTYPE.itemsize
+        if count:
+            self.records = np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER_SIZE, shape=(count,))
+        else:
+            self.records = np.zeros(0, dtype=RECORD_DTYPE)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return np.asarray(self.records["timestamp"])
+
+    @property
+    def landmarks(self) -> np.ndarray:
+        return np.asarray(self.records["landmarks"])
+
+    @property
+    def present(self) -> np.ndarray:
+        return self.records["present"].astype(bool)
+
+    def frame(self, index: int) -> Tuple[float, Optional[HandLandmarks]]:
+        record = self.records[index]
+        timestamp = float(record["timestamp"])
+        if not record["present"]:
+            return timestamp, None
+        return timestamp, HandLandmarks(
+            landmarks=np.asarray(record["landmarks"]),
+            handedness=HANDEDNESS_LABELS.get(int(record["handedness"]), "Unknown"),
+            confidence=float(record["confidence"]),
+            timestamp=timestamp,
+        )
+
+    def frames(self) -> Iterator[Tuple[float, Optional[HandLandmarks]]]:
+        timestamps = self.records["timestamp"].tolist()
+        present = self.records["present"].tolist()
+        handedness = self.records["handedness"].tolist()
+        confidence = self.records["confidence"].tolist()
+        landmarks = np.asarray(self.records["landmarks"])
+        for i, timestamp in enumerate(timestamps):
+            if not present[i]:
+                yield timestamp, None
+            else:
+                yield timestamp, HandLandmarks(
+                    landmarks=landmarks[i],
+                    handedness=HANDEDNESS_LABELS.get(handedness[i], "Unknown"),
+                    confidence=confidence[i],
+                    timestamp=timestamp,
+                )
@@ -0,0 +1,86 @@
+from typing import Dict, List, Optional, Tuple
+import cv2
+import numpy as np
+
+from landmarks import FINGERTIPS
+
+SKELETON_CHAINS = [
+    np.array([0, 1, 2, 3, 4]),
+    np.array([0, 5, 6, 7, 8]),
+    np.array([9, 10, 11, 12]),
+    np.array([13, 14, 15, 16]),
+    np.array([17, 18, 19, 20]),
+    np.array([5, 9, 13, 17, 0]),
+]
+JOINT_RADII = np.where(np.isin(np.arange(21), FINGERTIPS), 8, 5)
+BONES = np.array([(chain[i], chain[i + 1]) for chain in SKELETON_CHAINS for i in range(len(chain) - 1)])
+
+
+def draw_hand_skeleton(frame, landmarks: np.ndarray, color: Tuple[int, int, int] = (0, 255, 0)):
+    points = np.rint(landmarks[:, :2]).astype(np.int32)
+    cv2.polylines(frame, points[BONES], False, color, 2)
+    for (x, y), radius in zip(points.tolist(), JOINT_RADII.tolist()):
+        cv2.circle(frame, (x, y), radius, color, -1)
+        cv2.circle(frame, (x, y), radius, (255, 255, 255), 1)
+
+
+class StaticText:
+    def __init__(self, text: str, scale: float, color: Tuple[int, int, int], thickness: int):
+        (width, height), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, scale, thickness)
+        self.offset = (thickness, height + thickness)
+        coverage = np.zeros((height + baseline + 2 * thickness, width + 2 * thickness), dtype=np.uint8)
+        cv2.putText(coverage, text, self.offset, cv2.FONT_HERSHEY_SIMPLEX, scale, 255, thickness)
+        self.alpha = coverage.astype(np.float32) / 255.0
+        self.inverse_alpha = 1.0 - self.alpha
+        self.patch = np.empty(coverage.shape + (3,), dtype=np.uint8)
+        self.patch[...] = color
+
+    def draw(self, frame, origin: Tuple[int, int]):
+        x, y = origin[0] - self.offset[0], origin[1] - self.offset[1]
+        h, w = self.patch.shape[:2]
+        if x < 0 or y < 0 or y + h > frame.shape[0] or x + w > frame.shape[1]:
+            return
+        region = frame[y:y + h, x:x + w]
+        region[...] = cv2.blendLinear(self.patch, region, self.alpha, self.inverse_alpha)
+
+
+class OverlayRenderer:
+    def __init__(self, colors: Dict[str, Tuple[int, int, int]], title: str, footer: str,
+                 top_height: int = 71, bottom_height: int = 60, alpha: float = 0.7):
+        self.colors = colors
+        self.top_height = top_height
+        self.bottom_height = bottom_height
+        self.alpha = alpha
+        self.title = StaticText(title, 0.8, colors["text"], 2)
+        self.footer = StaticText(footer, 0.5, colors["text"], 1)
+        self._frame_shape: Optional[Tuple[int, ...]] = None
+        self._tints: List[np.ndarray] = []
+
+    def _ensure_cache(self, frame):
+        if frame.shape == self._frame_shape:
+            return
+        self._frame_shape = frame.shape
+        tint = np.array(self.colors["background"], dtype=np.float32) * self.alpha
+        w = frame.shape[1]
+        self._tints = [
+            np.empty((height, w, 3), dtype=np.uint8)
+            for height in (self.top_height, self.bottom_height)
+        ]
+        for band in self._tints:
+            band[...] = np.rint(tint).astype(np.uint8)
+
+    def _shade(self, region, tint):
+        cv2.addWeighted(region, 1.0 - self.alpha, tint, 1.0, 0, dst=region)
+
+    def draw_top_band(self, frame):
+        self._ensure_cache(frame)
+        self._shade(frame[:self.top_height], self._tints[0])
+        self.title.draw(frame, (10, 30))
+
+    def draw_bottom_band(self, frame):
+        self._ensure_cache(frame)
+        self._shade(frame[frame.shape[0] - self.bottom_height:], self._tints[1])
+
+    def draw_footer(self, frame):
+        h, w = frame.shape[:2]
+        self.footer.draw(frame, (w - 180, h - 10))
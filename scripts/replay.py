@@ -0,0 +1,243 @@
+import argparse
+import json
+import sys
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+import numpy as np
+
+from gesture_recognition import GestureRecognizer
+from gesture_rules import load_gesture_config
+from hand_features import DEFAULT_FRAME_SIZE
+from landmarks import HandLandmarks
+from prediction import LandmarkPredictor
+from recording import LandmarkRecording
+from synthetic_hands import GESTURE_DEMO, generate_session
+from utils import GestureCooldown
+
+SYNTHETIC_FPS = 60.0
+
+
+class GestureEvent(NamedTuple):
+    frame_index: int
+    timestamp: float
+    gesture: str
+
+
+class ReplayResult(NamedTuple):
+    events: List[GestureEvent]
+    frames: int
+    elapsed: float
+
+    @property
+    def fps(self) -> float:
+        return self.frames / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class ReplaySource(NamedTuple):
+    name: str
+    frames: Callable[[], Iterable[Tuple[float, Optional[HandLandmarks]]]]
+    frame_size: Tuple[int, int]
+    origin: float
+
+
+def replay_frames(frames: Iterable[Tuple[float, Optional[HandLandmarks]]],
+                  recognizer: Optional[GestureRecognizer] = None,
+                  cooldown: Optional[GestureCooldown] = None) -> ReplayResult:
+    recognizer = recognizer or GestureRecognizer()
+    cooldown = cooldown or GestureCooldown()
+    events = []
+    count = 0
+    start = time.perf_counter()
+    for index, (timestamp, hand_data) in enumerate(frames):
+        gesture = recognizer.recognize(hand_data)
+        if gesture != GestureRecognizer.NONE and cooldown.can_trigger(gesture, now=timestamp):
+            cooldown.trigger(gesture, now=timestamp)
+            events.append(GestureEvent(index, timestamp, gesture))
+        count += 1
+    return ReplayResult(events, count, time.perf_counter() - start)
+
+
+def replay_recording(path: str,
+                     recognizer: Optional[GestureRecognizer] = None,
+                     cooldown: Optional[GestureCooldown] = None) -> ReplayResult:
+    return replay_frames(LandmarkRecording(path).frames(), recognizer, cooldown)
+
+
+def decimate(frames: Iterable[Tuple[float, Optional[HandLandmarks]]],
+             fps: float) -> Iterator[Tuple[float, Optional[HandLandmarks]]]:
+    interval = 1.0 / fps
+    next_time: Optional[float] = None
+    for timestamp, hand_data in frames:
+        if next_time is not None and timestamp < next_time - interval * 0.25:
+            continue
+        next_time = timestamp + interval if next_time is None else max(next_time + interval, timestamp)
+        yield timestamp, hand_data
+
+
+class DecimatedInference:
+    def __init__(self, predictor: LandmarkPredictor):
+        self.predictor = predictor
+        self.errors: List[float] = []
+        self.worst_errors: List[float] = []
+        self.phantom = 0
+        self._handedness = "Unknown"
+        self._confidence = 0.0
+
+    def frames(self, frames: Iterable[Tuple[float, Optional[HandLandmarks]]]
+               ) -> Iterator[Tuple[float, Optional[HandLandmarks]]]:
+        for timestamp, hand_data in frames:
+            if self.predictor.tracking and not self.predictor.should_infer(timestamp):
+                landmarks = self.predictor.predict(timestamp)
+                if hand_data is None:
+                    self.phantom += 1
+                else:
+                    distances = np.sqrt(((landmarks[:, :2] - hand_data.landmarks[:, :2]) ** 2).sum(axis=1))
+                    self.errors.append(float(distances.mean()) / self.predictor.frame_height)
+                    self.worst_errors.append(float(distances.max()) / self.predictor.frame_height)
+                yield timestamp, HandLandmarks(landmarks, self._handedness, self._confidence, timestamp)
+                continue
+            if hand_data is None:
+                self.predictor.reset()
+            else:
+                self.predictor.update(hand_data.landmarks, timestamp)
+                self._handedness, self._confidence = hand_data.handedness, hand_data.confidence
+            yield timestamp, hand_data
+
+    def summary(self) -> Dict[str, float]:
+        stats = self.predictor.get_stats()
+        errors = np.array(self.errors) if self.errors else np.zeros(1)
+        worst = np.array(self.worst_errors) if self.worst_errors else np.zeros(1)
+        return {
+            "inference_ratio": stats["inference_ratio"],
+            "predicted": stats["predicted"],
+            "forced": stats["forced"],
+            "phantom": self.phantom,
+            "error_mean": float(errors.mean()),
+            "error_p95": float(np.percentile(errors, 95)),
+            "worst_landmark_p95": float(np.percentile(worst, 95)),
+        }
+
+
+def event_skew(reference: List[GestureEvent], events: List[GestureEvent]) -> Optional[float]:
+    if [e.gesture for e in events] != [e.gesture for e in reference]:
+        return None
+    return max((abs(a.timestamp - b.timestamp) for a, b in zip(reference, events)), default=0.0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay landmark recordings through the gesture recognizer.")
+    parser.add_argument("recordings", nargs="*", help="Files written with main.py --record")
+    parser.add_argument("--synthetic", action="store_true",
+                        help=f"Also replay a built-in synthetic session covering every default gesture "
+                             f"({SYNTHETIC_FPS:g} fps)")
+    parser.add_argument("--fps", type=float, nargs="+",
+                        help="Decimate each source to these frame rates and check that the recognized "
+                             "gesture sequence is identical at every rate (exit code 1 if not)")
+    parser.add_argument("--inference-interval", type=int, nargs="+", metavar="N",
+                        help="Simulate running the hand model on every Nth frame with landmark prediction in "
+                             "between, and report the landmark error and gesture changes it causes")
+    parser.add_argument("--gestures", metavar="PATH", help="Gesture config (default: gestures.json)")
+    parser.add_argument("--swipe-distance", type=float,
+                        help="Override the swipe distance (fraction of frame height)")
+    parser.add_argument("--pinch-threshold", type=float,
+                        help="Override the pinch threshold (fraction of frame height)")
+    parser.add_argument("--volume-distance", type=float,
+                        help="Override the vertical motion step (fraction of frame height)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+    if not args.recordings and not args.synthetic:
+        parser.error("give at least one recording or --synthetic")
+
+    config = load_gesture_config(args.gestures)
+    sources = []
+    for path in args.recordings:
+        recording = LandmarkRecording(path)
+        origin = float(recording.timestamps[0]) if len(recording) else 0.0
+        sources.append(ReplaySource(path, recording.frames, recording.frame_size, origin))
+    if args.synthetic:
+        sources.append(ReplaySource("synthetic", lambda: generate_session(GESTURE_DEMO, fps=SYNTHETIC_FPS),
+                                    DEFAULT_FRAME_SIZE, 0.0))
+    rates: List[Optional[float]] = list(args.fps) if args.fps else [None]
+
+    def make_recognizer(source: ReplaySource) -> GestureRecognizer:
+        return GestureRecognizer(
+            swipe_distance=args.swipe_distance,
+            pinch_threshold=args.pinch_threshold,
+            volume_distance=args.volume_distance,
+            config=config,
+            frame_size=source.frame_size
+        )
+
+    results: Dict[str, Dict[Optional[float], ReplayResult]] = {}
+    decimated: Dict[str, Dict[int, Tuple[ReplayResult, Dict[str, float]]]] = {}
+    consistent = True
+    for source in sources:
+        results[source.name] = {}
+        for rate in rates:
+            frames = source.frames() if rate is None else decimate(source.frames(), rate)
+            results[source.name][rate] = replay_frames(frames, make_recognizer(source),
+                                                       GestureCooldown(config=config))
+        decimated[source.name] = {}
+        native = results[source.name].get(None)
+        if args.inference_interval and native is None:
+            native = replay_frames(source.frames(), make_recognizer(source), GestureCooldown(config=config))
+        for interval in args.inference_interval or []:
+            simulation = DecimatedInference(LandmarkPredictor(interval, frame_height=source.frame_size[1]))
+            result = replay_frames(simulation.frames(source.frames()), make_recognizer(source),
+                                   GestureCooldown(config=config))
+            decimated[source.name][interval] = (result, simulation.summary())
+        by_rate = results[source.name]
+        reference = by_rate[rates[-1]].events
+        skews = {rate: event_skew(reference, result.events) for rate, result in by_rate.items()}
+        consistent = consistent and all(skew is not None for skew in skews.values())
+        if args.json:
+            continue
+        print(f"{source.name}:")
+        for rate, result in by_rate.items():
+            label = "  " if rate is None else f"  {rate:g} fps: "
+            print(f"{label}{result.frames} frames in {result.elapsed * 1000:.1f} ms "
+                  f"({result.fps:,.0f} frames/sec), {len(result.events)} gestures")
+            if rate is None:
+                for event in result.events:
+                    print(f"  {event.timestamp - source.origin:8.3f}s  frame {event.frame_index:6d}  "
+                          f"{event.gesture}")
+            else:
+                print(f"    {' '.join(event.gesture for event in result.events) or '(none)'}")
+        if args.fps:
+            if all(skew is not None for skew in skews.values()):
+                print(f"  same gesture sequence at {', '.join(f'{rate:g}' for rate in rates)} fps "
+                      f"(max event time skew {max(skews.values()) * 1000:.0f} ms)")
+            else:
+                mismatched = [f"{rate:g}" for rate, skew in skews.items() if skew is None]
+                print(f"  MISMATCH at {', '.join(mismatched)} fps versus {rates[-1]:g} fps")
+        for interval, (result, summary) in decimated[source.name].items():
+            skew = event_skew(native.events, result.events)
+            match = "same gestures" if skew is not None else \
+                f"DIFFERENT gestures: {' '.join(event.gesture for event in result.events) or '(none)'}"
+            print(f"  inference every {interval} frames: model ran on {summary['inference_ratio']:.0%} of frames "
+                  f"({summary['forced']} forced), landmark error mean {summary['error_mean']:.2%} / "
+                  f"p95 {summary['error_p95']:.2%} of frame height (worst landmark p95 "
+                  f"{summary['worst_landmark_p95']:.2%}), {summary['phantom']} frames past hand loss, "
+                  f"{match}" + (f" (max skew {skew * 1000:.0f} ms)" if skew else ""))
+    if args.json:
+        print(json.dumps({
+            name: {
+                ("native" if rate is None else f"{rate:g}"): {
+                    "frames": result.frames,
+                    "elapsed": result.elapsed,
+                    "fps": result.fps,
+                    "events": [event._asdict() for event in result.events],
+                }
+                for rate, result in by_rate.items()
+            } | {
+                f"interval_{interval}": dict(summary, events=[event._asdict() for event in result.events])
+                for interval, (result, summary) in decimated[name].items()
+            }
+            for name, by_rate in results.items()
+        }, indent=2))
+    if not consistent:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
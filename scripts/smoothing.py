@@ -0,0 +1,136 @@
+import math
+from typing import Dict, Optional, Type
+import numpy as np
+
+
+class LandmarkSmoother:
+    def update(self, points: np.ndarray, timestamp: float) -> np.ndarray:
+        raise NotImplementedError
+
+    def reset(self):
+        pass
+
+
+class PassthroughSmoother(LandmarkSmoother):
+    def update(self, points: np.ndarray, timestamp: float) -> np.ndarray:
+        return points
+
+
+class MovingAverageSmoother(LandmarkSmoother):
+    def __init__(self, window: int = 5):
+        self.window = window
+        self._buffer: Optional[np.ndarray] = None
+        self._sum: Optional[np.ndarray] = None
+        self._index = 0
+        self._count = 0
+
+    def update(self, points: np.ndarray, timestamp: float) -> np.ndarray:
+        if self._buffer is None or self._buffer.shape[1:] != points.shape:
+            self._buffer = np.zeros((self.window,) + points.shape, dtype=np.float64)
+            self._sum = np.zeros(points.shape, dtype=np.float64)
+        slot = self._buffer[self._index]
+        if self._count == self.window:
+            self._sum -= slot
+        else:
+            self._count += 1
+        slot[...] = points
+        self._sum += slot
+        self._index = (self._index + 1) % self.window
+        return (self._sum / self._count).astype(points.dtype)
+
+    def reset(self):
+        self._index = 0
+        self._count = 0
+        if self._sum is not None:
+            self._sum.fill(0.0)
+
+
+class OneEuroSmoother(LandmarkSmoother):
+    def __init__(self, min_cutoff: float = 1.0, beta: float = 0.02, d_cutoff: float = 1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self._value: Optional[np.ndarray] = None
+        self._derivative: Optional[np.ndarray] = None
+        self._last_time: Optional[float] = None
+
+    @staticmethod
+    def _alpha(cutoff, dt: float):
+        tau = 1.0 / (2.0 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def update(self, points: np.ndarray, timestamp: float) -> np.ndarray:
+        if self._value is None or self._value.shape != points.shape:
+            self._value = points.astype(np.float64)
+            self._derivative = np.zeros(points.shape, dtype=np.float64)
+            self._last_time = timestamp
+            return points
+        dt = timestamp - self._last_time
+        if dt <= 0:
+            return self._value.astype(points.dtype)
+        self._last_time = timestamp
+        derivative = (points - self._value) / dt
+        self._derivative += self._alpha(self.d_cutoff, dt) * (derivative - self._derivative)
+        cutoff = self.min_cutoff + self.beta * np.abs(self._derivative)
+        self._value += self._alpha(cutoff, dt) * (points - self._value)
+        return self._value.astype(points.dtype)
+
+    def reset(self):
+        self._value = None
+        self._derivative = None
+        self._last_time = None
+
+
+class KalmanSmoother(LandmarkSmoother):
+    def __init__(self, process_noise: float = 1e5, measurement_noise: float = 4.0):
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        self._position: Optional[np.ndarray] = None
+        self._velocity: Optional[np.ndarray] = None
+        self._covariance = np.zeros((2, 2))
+        self._last_time: Optional[float] = None
+
+    def update(self, points: np.ndarray, timestamp: float) -> np.ndarray:
+        if self._position is None or self._position.shape != points.shape:
+            self._position = points.astype(np.float64)
+            self._velocity = np.zeros(points.shape, dtype=np.float64)
+            self._covariance = np.array([[self.measurement_noise, 0.0], [0.0, 1e4]])
+            self._last_time = timestamp
+            return points
+        dt = timestamp - self._last_time
+        if dt <= 0:
+            return self._position.astype(points.dtype)
+        self._last_time = timestamp
+        # Every coordinate shares dt and noise levels, so one 2x2 covariance serves all of them.
+        transition = np.array([[1.0, dt], [0.0, 1.0]])
+        q = self.process_noise
+        noise = q * np.array([[dt ** 4 / 4, dt ** 3 / 2], [dt ** 3 / 2, dt ** 2]])
+        p = transition @ self._covariance @ transition.T + noise
+        innovation_variance = p[0, 0] + self.measurement_noise
+        gain_position = p[0, 0] / innovation_variance
+        gain_velocity = p[1, 0] / innovation_variance
+        predicted = self._position + self._velocity * dt
+        residual = points - predicted
+        self._position = predicted + gain_position * residual
+        self._velocity += gain_velocity * residual
+        self._covariance = p - np.outer((gain_position, gain_velocity), p[0])
+        return self._position.astype(points.dtype)
+
+    def reset(self):
+        self._position = None
+        self._velocity = None
+        self._last_time = None
+
+
+SMOOTHERS: Dict[str, Type[LandmarkSmoother]] = {
+    "none": PassthroughSmoother,
+    "moving_average": MovingAverageSmoother,
+    "one_euro": OneEuroSmoother,
+    "kalman": KalmanSmoother,
+}
+
+
+def create_smoother(name: str, **params) -> LandmarkSmoother:
+    if name not in SMOOTHERS:
+        raise ValueError(f"Unknown smoother '{name}', expected one of {', '.join(SMOOTHERS)}")
+    return SMOOTHERS[name](**params)
@@ -0,0 +1,237 @@
+import argparse
+import multiprocessing as mp
+import os
+import queue
+import time
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set
+
+from dispatcher import ActionDispatcher
+from gesture_rules import load_gesture_config
+from media_controls import BACKENDS, MediaController, create_backend
+from utils import GestureCooldown
+
+
+class GestureMessage(NamedTuple):
+    stream_id: int
+    gesture: str
+    captured_at: float
+
+
+class StatsMessage(NamedTuple):
+    stream_id: int
+    stats: Dict[str, float]
+
+
+class WorkerSpec(NamedTuple):
+    stream_id: int
+    source: str
+    cores: List[int]
+    gesture_config: Optional[str] = None
+
+
+def run_worker(spec: WorkerSpec, events, stop_event, stats_interval: float = 1.0):
+    if spec.cores and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, spec.cores)
+    from frame_sources import open_source
+    from gesture_recognition import GestureRecognizer
+    from gesture_rules import load_gesture_config
+    from hand_tracker import HandTracker
+    from pipeline import FramePipeline
+
+    source = open_source(spec.source)
+    if not source.is_open():
+        raise SystemExit(f"stream {spec.stream_id}: could not open source {spec.source!r}")
+    tracker = HandTracker(max_hands=1, min_detection_confidence=0.7, min_tracking_confidence=0.6, mirror=True)
+    config = load_gesture_config(spec.gesture_config)
+    recognizer = GestureRecognizer(config=config)
+    if source.frame_size[1] > 0:
+        recognizer.set_frame_size(source.frame_size)
+    cooldown = GestureCooldown(config=config)
+
+    def capture():
+        ret, frame = source.read()
+        return frame if ret else None
+
+    def infer(packet):
+        hand_data = tracker.process_frame(packet.frame, packet.timestamp)
+        gesture = recognizer.recognize(hand_data)
+        if gesture != GestureRecognizer.NONE and cooldown.can_trigger(gesture, now=packet.timestamp):
+            cooldown.trigger(gesture, now=packet.timestamp)
+            events.put(GestureMessage(spec.stream_id, gesture, packet.timestamp))
+        return packet.frame_id
+
+    pipeline = FramePipeline(capture, infer, timestamp_fn=lambda: source.timestamp)
+    pipeline.start()
+    window_start = time.monotonic()
+    window_frames = 0
+    window_captured = window_dropped = 0
+    try:
+        while pipeline.running and not stop_event.is_set():
+            if pipeline.get_result(timeout=0.1) is not None:
+                window_frames += 1
+            now = time.monotonic()
+            if now - window_start >= stats_interval:
+                stats = pipeline.get_stats()
+                captured = stats["captured"] - window_captured
+                dropped = stats["inference_dropped"] - window_dropped
+                stats["fps"] = window_frames / (now - window_start)
+                stats["drop_rate"] = dropped / max(captured, 1)
+                events.put(StatsMessage(spec.stream_id, stats))
+                window_start, window_frames = now, 0
+                window_captured, window_dropped = stats["captured"], stats["inference_dropped"]
+    finally:
+        pipeline.stop()
+        source.release()
+        tracker.release()
+    if pipeline.error is not None:
+        raise pipeline.error
+    if source.live and not stop_event.is_set():
+        raise SystemExit(f"stream {spec.stream_id}: lost source {spec.source!r}")
+
+
+def assign_cores(count: int) -> List[List[int]]:
+    if hasattr(os, "sched_getaffinity"):
+        available = sorted(os.sched_getaffinity(0))
+    else:
+        available = list(range(os.cpu_count() or 1))
+    if count >= len(available):
+        return [[available[i % len(available)]] for i in range(count)]
+    per_worker = len(available) // count
+    return [available[i * per_worker:(i + 1) * per_worker] for i in range(count)]
+
+
+class StreamSupervisor:
+    def __init__(self, sources: Sequence[str], dispatcher: ActionDispatcher,
+                 restart_backoff: float = 1.0, max_backoff: float = 30.0, verbose: bool = True,
+                 gesture_config: Optional[str] = None):
+        self.context = mp.get_context("spawn")
+        self.events = self.context.Queue()
+        self.stop_event = self.context.Event()
+        self.dispatcher = dispatcher
+        self.cooldown = GestureCooldown(config=load_gesture_config(gesture_config))
+        self.restart_backoff = restart_backoff
+        self.max_backoff = max_backoff
+        self.verbose = verbose
+        self.specs = [WorkerSpec(i, source, cores, gesture_config)
+                      for i, (source, cores) in enumerate(zip(sources, assign_cores(len(sources))))]
+        self.processes: Dict[int, mp.Process] = {}
+        self.restarts: Dict[int, int] = {spec.stream_id: 0 for spec in self.specs}
+        self.failures: Dict[int, int] = {spec.stream_id: 0 for spec in self.specs}
+        self.next_start: Dict[int, float] = {spec.stream_id: 0.0 for spec in self.specs}
+        self.started_at: Dict[int, float] = {}
+        self.finished: Set[int] = set()
+        self.stream_stats: Dict[int, Dict[str, float]] = {}
+        self.gestures_routed = 0
+        self.gestures_suppressed = 0
+
+    def _start(self, spec: WorkerSpec):
+        process = self.context.Process(target=run_worker, args=(spec, self.events, self.stop_event),
+                                       name=f"stream-{spec.stream_id}", daemon=True)
+        process.start()
+        self.processes[spec.stream_id] = process
+        self.started_at[spec.stream_id] = time.monotonic()
+
+    def _check_workers(self, now: float):
+        for spec in self.specs:
+            process = self.processes.get(spec.stream_id)
+            if spec.stream_id in self.finished or (process is not None and process.is_alive()):
+                continue
+            if process is not None and process.exitcode == 0:
+                process.join()
+                del self.processes[spec.stream_id]
+                self.finished.add(spec.stream_id)
+                if self.verbose:
+                    print(f"[Supervisor] stream {spec.stream_id} ({spec.source}) finished")
+            elif process is not None:
+                process.join()
+                self.restarts[spec.stream_id] += 1
+                if now - self.started_at[spec.stream_id] > self.max_backoff:
+                    self.failures[spec.stream_id] = 0
+                backoff = min(self.restart_backoff * 2 ** self.failures[spec.stream_id], self.max_backoff)
+                self.failures[spec.stream_id] += 1
+                self.next_start[spec.stream_id] = now + backoff
+                del self.processes[spec.stream_id]
+                if self.verbose:
+                    print(f"[Supervisor] stream {spec.stream_id} ({spec.source}) exited with code "
+                          f"{process.exitcode}, restarting in {backoff:.1f}s")
+            elif now >= self.next_start[spec.stream_id]:
+                self._start(spec)
+
+    def _handle(self, message):
+        if isinstance(message, GestureMessage):
+            if not self.cooldown.can_trigger(message.gesture):
+                self.gestures_suppressed += 1
+                return
+            if self.dispatcher.submit(message.gesture, captured_at=message.captured_at):
+                self.cooldown.trigger(message.gesture)
+                self.gestures_routed += 1
+        elif isinstance(message, StatsMessage):
+            self.stream_stats[message.stream_id] = message.stats
+
+    def report(self) -> str:
+        lines = []
+        for spec in self.specs:
+            stats = self.stream_stats.get(spec.stream_id)
+            alive = spec.stream_id in self.processes and self.processes[spec.stream_id].is_alive()
+            state = "up" if alive else "done" if spec.stream_id in self.finished else "down"
+            if stats is None:
+                lines.append(f"  stream {spec.stream_id} [{state}] {spec.source}: no stats yet")
+                continue
+            lines.append(f"  stream {spec.stream_id} [{state}] {spec.source}: {stats['fps']:.1f} fps, "
+                         f"drop rate {stats['drop_rate']:.0%}, restarts {self.restarts[spec.stream_id]}, "
+                         f"cores {spec.cores}")
+        lines.append(f"  gestures routed {self.gestures_routed}, suppressed {self.gestures_suppressed}")
+        return "\n".join(lines)
+
+    def run(self, stats_interval: float = 5.0, duration: Optional[float] = None):
+        start = last_report = time.monotonic()
+        try:
+            while duration is None or time.monotonic() - start < duration:
+                now = time.monotonic()
+                self._check_workers(now)
+                try:
+                    self._handle(self.events.get(timeout=0.1))
+                except queue.Empty:
+                    if len(self.finished) == len(self.specs):
+                        break
+                if self.verbose and now - last_report >= stats_interval:
+                    last_report = now
+                    print("[Supervisor]\n" + self.report())
+        finally:
+            self.stop()
+
+    def stop(self, timeout: float = 3.0):
+        self.stop_event.set()
+        for process in self.processes.values():
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        self.processes.clear()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run one gesture tracker process per camera source.")
+    parser.add_argument("--source", action="append", required=True,
+                        help="Webcam index, video file, image directory or 'synthetic'; repeat for each stream")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="pyautogui",
+                        help="Media key backend (default: pyautogui)")
+    parser.add_argument("--stats-interval", type=float, default=5.0)
+    parser.add_argument("--gestures", metavar="PATH", help="Gesture config (default: gestures.json)")
+    args = parser.parse_args()
+
+    config = load_gesture_config(args.gestures)
+    dispatcher = ActionDispatcher(MediaController(verbose=True, backend=create_backend(args.backend),
+                                                  config=config))
+    supervisor = StreamSupervisor(args.source, dispatcher, gesture_config=args.gestures)
+    print(f"Supervising {len(args.source)} streams, press Ctrl+C to quit")
+    try:
+        supervisor.run(args.stats_interval)
+    except KeyboardInterrupt:
+        print("\nExiting...")
+    finally:
+        dispatcher.close()
+        print(supervisor.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+from typing import Iterator, List, NamedTuple, Optional, Sequence, Tuple
+import numpy as np
+
+from landmarks import HandLandmarks, NUM_LANDMARKS
+
+POSE_MASKS = {
+    "fist": 0b00000,
+    "open_palm": 0b11111,
+    "volume": 0b00111,
+    "point": 0b00010,
+    "peace": 0b00110,
+    "relaxed": 0b01110,
+}
+
+FINGER_BASES = [(-20.0, -30.0), (-20.0, -70.0), (0.0, -75.0), (18.0, -70.0), (34.0, -62.0)]
+FINGER_LENGTHS = [0.9, 1.0, 1.1, 1.0, 0.8]
+EXTENDED_OFFSETS = np.array([[0.0, 0.0], [0.0, -30.0], [0.0, -48.0], [0.0, -65.0]])
+FOLDED_OFFSETS = np.array([[0.0, 0.0], [0.0, -18.0], [4.0, -8.0], [6.0, -2.0]])
+THUMB_EXTENDED_OFFSETS = np.array([[0.0, 0.0], [-15.0, -15.0], [-28.0, -30.0], [-40.0, -43.0]])
+THUMB_FOLDED_OFFSETS = np.array([[0.0, 0.0], [-15.0, -15.0], [-5.0, -22.0], [8.0, -25.0]])
+PINCH_MEET = 0.25
+
+
+class Segment(NamedTuple):
+    duration: float
+    pose: Optional[str]
+    start: Tuple[float, float]
+    end: Tuple[float, float]
+    pinch: bool = False
+
+
+GESTURE_DEMO = [
+    Segment(0.6, "volume", (200, 300), (200, 300)),
+    Segment(0.4, "volume", (200, 300), (440, 300)),
+    Segment(1.0, "volume", (440, 300), (440, 300)),
+    Segment(0.4, "volume", (440, 300), (200, 300)),
+    Segment(1.0, "volume", (200, 300), (200, 300)),
+    Segment(0.4, "volume", (200, 300), (200, 300), pinch=True),
+    Segment(0.6, "volume", (200, 300), (200, 300)),
+    Segment(0.5, None, (0, 0), (0, 0)),
+    Segment(2.0, "volume", (320, 380), (320, 272)),
+    Segment(0.5, "volume", (320, 272), (320, 272)),
+    Segment(2.0, "volume", (320, 272), (320, 392)),
+    Segment(0.5, "volume", (320, 392), (320, 300)),
+    Segment(0.6, "open_palm", (320, 300), (320, 300)),
+    Segment(0.6, "fist", (320, 300), (320, 300)),
+    Segment(0.5, None, (0, 0), (0, 0)),
+]
+
+
+def make_hand(mask: int, center: Tuple[float, float] = (320.0, 360.0), scale: float = 1.0,
+              angle: float = 0.0, pinch: bool = False, handedness: str = "Right") -> np.ndarray:
+    points = np.zeros((NUM_LANDMARKS, 3), dtype=np.float32)
+    for finger in range(5):
+        extended = bool(mask >> finger & 1)
+        if finger == 0:
+            offsets = THUMB_EXTENDED_OFFSETS if extended else THUMB_FOLDED_OFFSETS
+        else:
+            offsets = EXTENDED_OFFSETS if extended else FOLDED_OFFSETS
+        base = np.array(FINGER_BASES[finger])
+        start = 1 + finger * 4
+        points[start:start + 4, :2] = base + offsets * FINGER_LENGTHS[finger]
+    if pinch:
+        meet = points[4, :2] + (points[8, :2] - points[4, :2]) * PINCH_MEET
+        points[[3, 7], :2] += (meet - points[[4, 8], :2]) * 0.5
+        points[4, :2] = meet + (-4.0, 3.0)
+        points[8, :2] = meet + (4.0, -3.0)
+    points[:, 2] = -0.02 * np.arange(NUM_LANDMARKS) / NUM_LANDMARKS
+    if handedness != "Right":
+        points[:, 0] = -points[:, 0]
+    if angle:
+        c, s = np.cos(angle), np.sin(angle)
+        points[:, :2] = points[:, :2] @ np.array([[c, s], [-s, c]], dtype=np.float32)
+    points[:, :2] *= scale
+    points[:, :2] += center
+    return points
+
+
+def generate_session(segments: Sequence[Segment], fps: float = 30.0, noise: float = 0.0,
+                     handedness: str = "Right", seed: int = 0,
+                     ) -> Iterator[Tuple[float, Optional[HandLandmarks]]]:
+    rng = np.random.default_rng(seed)
+    t = 0.0
+    frame_interval = 1.0 / fps
+    for segment in segments:
+        segment_end = t + segment.duration
+        start = np.array(segment.start, dtype=np.float32)
+        end = np.array(segment.end, dtype=np.float32)
+        while t < segment_end - 1e-9:
+            if segment.pose is None:
+                yield t, None
+            else:
+                progress = 1.0 - (segment_end - t) / segment.duration
+                center = start + (end - start) * progress
+                points = make_hand(POSE_MASKS[segment.pose], center, pinch=segment.pinch,
+                                   handedness=handedness)
+                if noise:
+                    points[:, :2] += rng.normal(0.0, noise, (NUM_LANDMARKS, 2)).astype(np.float32)
+                yield t, HandLandmarks(points, handedness, 0.95, t)
+            t += frame_interval
+
+
+def random_hands(count: int, seed: int = 0, noise: float = 2.0, fps: float = 30.0) -> List[HandLandmarks]:
+    rng = np.random.default_rng(seed)
+    poses = list(POSE_MASKS.values())
+    hands = []
+    for frame in range(count):
+        center = rng.uniform((120, 200), (520, 420))
+        points = make_hand(poses[rng.integers(len(poses))], center, scale=rng.uniform(0.8, 1.2),
+                           pinch=rng.random() < 0.2)
+        points[:, :2] += rng.normal(0.0, noise, (NUM_LANDMARKS, 2)).astype(np.float32)
+        hands.append(HandLandmarks(points, "Right", 0.95, frame / fps))
+    return hands
@@ -0,0 +1,42 @@
+from typing import Iterator, List, Optional, Tuple
+
+import pytest
+
+from gesture_recognition import GestureRecognizer
+from hand_features import DEFAULT_FRAME_SIZE
+from landmarks import HandLandmarks
+from replay import SYNTHETIC_FPS, decimate, replay_frames
+from synthetic_hands import GESTURE_DEMO, generate_session
+
+EXPECTED_DEMO = (["swipe_right", "swipe_left", "pinch"] + ["volume_up"] * 4 + ["volume_down"] * 4
+                 + ["volume_up", "open_palm", "pinch", "fist"])
+
+
+def scaled_session(frame_size: Tuple[int, int]) -> Iterator[Tuple[float, Optional[HandLandmarks]]]:
+    scale = frame_size[1] / DEFAULT_FRAME_SIZE[1]
+    for timestamp, hand in generate_session(GESTURE_DEMO, fps=SYNTHETIC_FPS):
+        if hand is not None:
+            hand = hand._replace(landmarks=hand.landmarks * scale)
+        yield timestamp, hand
+
+
+def demo_gestures(fps: Optional[float] = None, frame_size: Tuple[int, int] = DEFAULT_FRAME_SIZE) -> List[str]:
+    frames = scaled_session(frame_size)
+    if fps is not None:
+        frames = decimate(frames, fps)
+    result = replay_frames(frames, GestureRecognizer(frame_size=frame_size))
+    return [event.gesture for event in result.events]
+
+
+def test_demo_session_recognizes_every_gesture():
+    assert demo_gestures() == EXPECTED_DEMO
+
+
+@pytest.mark.parametrize("fps", [10.0, 15.0, 30.0])
+def test_gesture_sequence_is_frame_rate_independent(fps):
+    assert demo_gestures(fps) == demo_gestures()
+
+
+@pytest.mark.parametrize("frame_size", [(320, 240), (1280, 960)])
+def test_gesture_sequence_is_resolution_independent(frame_size):
+    assert demo_gestures(frame_size=frame_size) == demo_gestures()
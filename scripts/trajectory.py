@@ -0,0 +1,158 @@
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+DEFAULT_LENGTH = 16
+DEFAULT_BAND = 2
+CIRCLE_PHASES = 8
+SWIPE_BULGES = (0.0, 0.2, -0.2, 0.4, -0.4)
+
+
+def resample_path(points: np.ndarray, length: int = DEFAULT_LENGTH) -> Optional[np.ndarray]:
+    points = np.asarray(points, dtype=np.float64)
+    steps = np.hypot(*np.diff(points, axis=0).T)
+    arc = np.concatenate(([0.0], np.cumsum(steps)))
+    if arc[-1] <= 0:
+        return None
+    targets = np.linspace(0.0, arc[-1], length)
+    return np.stack([np.interp(targets, arc, points[:, 0]), np.interp(targets, arc, points[:, 1])], axis=1)
+
+
+def normalize_trajectory(points: np.ndarray, length: int = DEFAULT_LENGTH) -> Optional[np.ndarray]:
+    path = resample_path(points, length)
+    if path is None:
+        return None
+    path -= path.mean(axis=0)
+    extent = np.ptp(path, axis=0).max()
+    return path / (extent / 2.0)
+
+
+def envelope(path: np.ndarray, band: int) -> Tuple[np.ndarray, np.ndarray]:
+    n = len(path)
+    windows = [path[max(0, i - band):i + band + 1] for i in range(n)]
+    return np.array([w.min(axis=0) for w in windows]), np.array([w.max(axis=0) for w in windows])
+
+
+def dtw_distance(query: Sequence[Tuple[float, float]], template: Sequence[Tuple[float, float]],
+                 band: int = DEFAULT_BAND, best: float = math.inf,
+                 remaining: Optional[Sequence[float]] = None) -> float:
+    n = len(query)
+    inf = math.inf
+    previous = [0.0] + [inf] * n
+    for i in range(1, n + 1):
+        qx, qy = query[i - 1]
+        current = [inf] * (n + 1)
+        row_min = inf
+        for j in range(max(1, i - band), min(n, i + band) + 1):
+            tx, ty = template[j - 1]
+            left = current[j - 1]
+            diagonal = previous[j - 1]
+            up = previous[j]
+            step = left if left < diagonal else diagonal
+            if up < step:
+                step = up
+            value = step + (qx - tx) * (qx - tx) + (qy - ty) * (qy - ty)
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min + (remaining[i - 1] if remaining is not None else 0.0) >= best:
+            return inf
+        previous = current
+    return previous[n]
+
+
+def builtin_templates(length: int = DEFAULT_LENGTH) -> List[Tuple[str, np.ndarray]]:
+    t = np.linspace(0.0, 1.0, length)
+    templates = []
+    for bulge in SWIPE_BULGES:
+        arc = np.stack([t, 4.0 * bulge * t * (1.0 - t)], axis=1)
+        templates.append(("swipe_right", arc))
+        templates.append(("swipe_left", arc[::-1].copy()))
+        templates.append(("swipe_down", arc[:, ::-1].copy()))
+        templates.append(("swipe_up", arc[::-1, ::-1].copy()))
+    for phase in np.linspace(0.0, 2 * np.pi, CIRCLE_PHASES, endpoint=False):
+        angles = phase + np.linspace(0.0, 2 * np.pi, length)
+        circle = np.stack([np.cos(angles), np.sin(angles)], axis=1)
+        templates.append(("circle_cw", circle))
+        templates.append(("circle_ccw", circle[::-1].copy()))
+    return templates
+
+
+class TrajectoryMatcher:
+    def __init__(self, templates: Optional[Sequence[Tuple[str, np.ndarray]]] = None,
+                 length: int = DEFAULT_LENGTH, band: int = DEFAULT_BAND):
+        self.length = length
+        self.band = band
+        self.names: List[str] = []
+        self.paths: List[List[Tuple[float, float]]] = []
+        self._lower = np.zeros((0, length, 2))
+        self._upper = np.zeros((0, length, 2))
+        self.queries = 0
+        self.lb_pruned = 0
+        self.abandoned = 0
+        self.full_dtw = 0
+        for name, points in templates or ():
+            self.add(name, points)
+
+    def add(self, name: str, points: np.ndarray):
+        path = normalize_trajectory(points, self.length)
+        if path is None:
+            raise ValueError(f"Trajectory template '{name}' has zero length")
+        lower, upper = envelope(path, self.band)
+        self.names.append(name)
+        self.paths.append([tuple(p) for p in path.tolist()])
+        self._lower = np.concatenate([self._lower, lower[None]])
+        self._upper = np.concatenate([self._upper, upper[None]])
+
+    def lower_bounds(self, query: np.ndarray) -> np.ndarray:
+        excess = np.maximum(query - self._upper, 0.0) + np.maximum(self._lower - query, 0.0)
+        return np.einsum("tid,tid->ti", excess, excess)
+
+    def match(self, points: np.ndarray, max_distance: float = math.inf,
+              pruning: bool = True) -> Tuple[Optional[str], float]:
+        query = normalize_trajectory(points, self.length)
+        if query is None or not self.names:
+            return None, math.inf
+        self.queries += 1
+        query_points = [tuple(p) for p in query.tolist()]
+        best = max_distance * self.length
+        best_index = -1
+        if pruning:
+            contributions = self.lower_bounds(query)
+            remaining = np.cumsum(contributions[:, ::-1], axis=1)[:, ::-1]
+            bounds = remaining[:, 0]
+            remaining = np.concatenate([remaining[:, 1:], np.zeros((len(bounds), 1))], axis=1)
+            order = np.argsort(bounds).tolist()
+            bounds = bounds.tolist()
+        else:
+            bounds = [0.0] * len(self.names)
+            remaining = None
+            order = range(len(self.names))
+        for rank, index in enumerate(order):
+            if bounds[index] >= best:
+                self.lb_pruned += len(self.names) - rank
+                break
+            if remaining is None:
+                distance = dtw_distance(query_points, self.paths[index], self.band)
+            else:
+                distance = dtw_distance(query_points, self.paths[index], self.band, best, remaining[index].tolist())
+            if distance == math.inf:
+                self.abandoned += 1
+                continue
+            self.full_dtw += 1
+            if distance < best:
+                best = distance
+                best_index = index
+        if best_index < 0:
+            return None, math.inf
+        return self.names[best_index], best / self.length
+
+    def get_stats(self) -> Dict[str, float]:
+        considered = max(self.queries * len(self.names), 1)
+        return {
+            "queries": self.queries,
+            "templates": len(self.names),
+            "lb_pruned_rate": self.lb_pruned / considered,
+            "abandoned_rate": self.abandoned / considered,
+            "full_dtw_rate": self.full_dtw / considered,
+        }
@@ -1,49 +1,31 @@
+import math
 import time
 from collections import deque
 from typing import Tuple, Optional
 import numpy as np
 
-
-class MovingAverageFilter:
-    def __init__(self, window_size: int = 5):
-        self.window_size = window_size
-        self.x_history = deque(maxlen=window_size)
-        self.y_history = deque(maxlen=window_size)
-    
-    def update(self, x: float, y: float) -> Tuple[float, float]:
-        self.x_history.append(x)
-        self.y_history.append(y)
-        smoothed_x = sum(self.x_history) / len(self.x_history)
-        smoothed_y = sum(self.y_history) / len(self.y_history)
-        return smoothed_x, smoothed_y
-    
-    def reset(self):
-        self.x_history.clear()
-        self.y_history.clear()
+from gesture_rules import GestureConfig, load_gesture_config
 
 
 class GestureCooldown:
-    def __init__(self, default_cooldown: float = 0.8):
-        self.default_cooldown = default_cooldown
+    def __init__(self, default_cooldown: Optional[float] = None, config: Optional[GestureConfig] = None):
+        config = config or load_gesture_config()
+        self.default_cooldown = config.default_cooldown if default_cooldown is None else default_cooldown
         self.last_trigger_times = {}
         self.cooldowns = {
-            "swipe_right": 1.0,
-            "swipe_left": 1.0,
-            "pinch": 0.8,
-            "volume_up": 0.3,
-            "volume_down": 0.3,
-            "fist": 1.0,
-            "open_palm": 1.0,
+            gesture: binding.cooldown
+            for gesture, binding in config.bindings.items()
+            if binding.cooldown is not None
         }
     
-    def can_trigger(self, gesture: str) -> bool:
-        current_time = time.time()
-        last_time = self.last_trigger_times.get(gesture, 0)
+    def can_trigger(self, gesture: str, now: Optional[float] = None) -> bool:
+        current_time = time.monotonic() if now is None else now
+        last_time = self.last_trigger_times.get(gesture, -math.inf)
         cooldown = self.cooldowns.get(gesture, self.default_cooldown)
         return (current_time - last_time) >= cooldown
     
-    def trigger(self, gesture: str):
-        self.last_trigger_times[gesture] = time.time()
+    def trigger(self, gesture: str, now: Optional[float] = None):
+        self.last_trigger_times[gesture] = time.monotonic() if now is None else now
     
     def reset(self, gesture: Optional[str] = None):
         if gesture:
@@ -52,14 +34,23 @@ class GestureCooldown:
             self.last_trigger_times.clear()
 
 
+def configure_camera(cap, width: int = 640, height: int = 480, fps: int = 30):
+    import cv2
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    cap.set(cv2.CAP_PROP_FPS, fps)
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+
 class FPSCounter:
     def __init__(self, avg_frames: int = 30):
         self.avg_frames = avg_frames
         self.frame_times = deque(maxlen=avg_frames)
-        self.last_time = time.time()
+        self.last_time = time.monotonic()
     
     def update(self) -> float:
-        current_time = time.time()
+        current_time = time.monotonic()
         delta = current_time - self.last_time
         self.last_time = current_time
         if delta > 0: